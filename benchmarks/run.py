@@ -0,0 +1,196 @@
+"""Time the tracker's hot paths on synthetic datasets and compare runs against a baseline.
+
+    PYTHONPATH=. python -m benchmarks.run --sizes 1000 100000 --output results.json
+    PYTHONPATH=. python -m benchmarks.run --baseline results.json --max-regression 1.25
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.api_client import _build_all
+from src.exporters import EXPORTERS, export
+from src.filters import (
+    apply_filters, filter_by_date_range, filter_by_launchpad, filter_by_rocket, filter_by_success,
+    filter_completed, filter_upcoming
+)
+from src.frame import LaunchFrame
+from src.models import Launch, Rocket, Launchpad
+from src.serializers import SERIALIZERS, get_serializer
+from src.statistics import (
+    aggregate_launches, calculate_launch_frequency, calculate_success_rate_by_rocket,
+    count_launches_by_site, get_launch_statistics
+)
+
+from .synthetic import generate_dataset
+
+Case = Tuple[str, Callable[[], Any]]
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def _consume(records: Any) -> None:
+    for _ in records:
+        pass
+
+
+def cases(size: int, workdir: Path, seed: int = 0) -> Iterator[Case]:
+    """Yield (name, fn) pairs; everything outside fn is setup and is not measured"""
+    launch_data, rocket_data, launchpad_data = generate_dataset(size, seed)
+    launches = list(_build_all(Launch, launch_data))
+    rockets = list(_build_all(Rocket, rocket_data))
+    launchpads = list(_build_all(Launchpad, launchpad_data))
+    frame = LaunchFrame.from_launches(launches)
+    indexed = LaunchFrame.from_launches(launches, indexed=True)
+    records = [launch.to_dict() for launch in launches]
+
+    rocket_id, launchpad_id = rockets[0].id, launchpads[0].id
+    start, end = launches[len(launches) // 4].utc_date, launches[len(launches) // 2].utc_date
+    filters = {'rocket_id': rocket_id, 'success': True, 'start_date': start, 'end_date': end}
+
+    yield "model_construction", lambda: list(_build_all(Launch, launch_data))
+    yield "frame_construction", lambda: LaunchFrame.from_launches(launches)
+    yield "index_construction", lambda: LaunchFrame.from_launches(launches, indexed=True)
+
+    for name in sorted(SERIALIZERS):
+        serializer = get_serializer(name)
+        path = workdir / f"launches.{name}"
+        yield f"cache_save/{name}", lambda serializer=serializer, path=path: serializer.dump(path, records)
+        if not path.exists():
+            serializer.dump(path, records)
+        yield f"cache_load/{name}", lambda serializer=serializer, path=path: _consume(serializer.load(path, Launch))
+
+    yield "filter_by_rocket", lambda: filter_by_rocket(launches, rocket_id)
+    yield "filter_by_success", lambda: filter_by_success(launches, True)
+    yield "filter_by_launchpad", lambda: filter_by_launchpad(launches, launchpad_id)
+    yield "filter_by_date_range", lambda: filter_by_date_range(launches, start, end)
+    yield "filter_upcoming", lambda: filter_upcoming(launches)
+    yield "filter_completed", lambda: filter_completed(launches)
+    yield "apply_filters/list", lambda: apply_filters(launches, **filters)
+    yield "apply_filters/frame", lambda: apply_filters(frame, **filters)
+    yield "apply_filters/indexed", lambda: apply_filters(indexed, **filters)
+
+    yield "aggregate_launches/list", lambda: aggregate_launches(launches)
+    yield "aggregate_launches/frame", lambda: aggregate_launches(frame)
+    yield "get_launch_statistics", lambda: get_launch_statistics(launches)
+    yield "calculate_success_rate_by_rocket", lambda: calculate_success_rate_by_rocket(launches, rockets)
+    yield "count_launches_by_site", lambda: count_launches_by_site(launches, launchpads)
+    yield "calculate_launch_frequency", lambda: calculate_launch_frequency(launches)
+
+    for name in sorted(EXPORTERS):
+        try:
+            EXPORTERS[name]()
+        except RuntimeError:
+            # Optional dependency (pyarrow) not installed
+            continue
+        path = workdir / f"export{EXPORTERS[name].suffix}"
+        yield f"export/{name}", lambda name=name, path=path: export(
+            (launch.to_dict() for launch in launches), name, path
+        )
+
+
+def measure(fn: Callable[[], Any], repeat: int = 3) -> Dict[str, float]:
+    """Median and best wall time over repeat runs, then peak Python heap in one traced run.
+
+    Memory is traced separately because tracemalloc slows the measured code down.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times.sort()
+    return {'seconds': times[len(times) // 2], 'min_seconds': times[0], 'peak_bytes': peak}
+
+
+def run(sizes: List[int], repeat: int = 3, seed: int = 0, only: Optional[str] = None,
+        progress: Callable[[str], None] = lambda line: None) -> Dict[str, Any]:
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            for name, fn in cases(size, Path(workdir), seed):
+                if only and only not in name:
+                    continue
+                result = dict(name=name, size=size, **measure(fn, repeat))
+                progress(f"{name:<36} {size:>9} {result['seconds'] * 1000:>10.2f} ms "
+                         f"{result['peak_bytes'] / 2 ** 20:>9.2f} MiB")
+                results.append(result)
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pair up results measured in both runs, with current/baseline ratios for time and memory"""
+    previous = {(result['name'], result['size']): result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = previous.get((result['name'], result['size']))
+        if before is None:
+            continue
+        rows.append({
+            'name': result['name'],
+            'size': result['size'],
+            'time_ratio': result['seconds'] / before['seconds'] if before['seconds'] else float('inf'),
+            'memory_ratio': result['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else 1.0,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SpaceX Launch Tracker benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Numbers of synthetic launches to benchmark (up to 10^6)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic dataset")
+    parser.add_argument("--only", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results previously written with --output")
+    parser.add_argument("--max-regression", type=float,
+                        help="Exit with status 1 if any benchmark is this many times slower than the baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.seed, args.only, progress=print)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    if not args.baseline:
+        return 0
+    rows = compare(results, json.loads(Path(args.baseline).read_text()))
+    regressed = False
+    print(f"\n{'benchmark':<36} {'size':>9} {'time':>8} {'memory':>8}")
+    for row in rows:
+        slower = args.max_regression is not None and row['time_ratio'] > args.max_regression
+        regressed = regressed or slower
+        print(f"{row['name']:<36} {row['size']:>9} {row['time_ratio']:>7.2f}x {row['memory_ratio']:>7.2f}x"
+              f"{'  REGRESSED' if slower else ''}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
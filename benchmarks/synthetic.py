@@ -0,0 +1,144 @@
+import calendar
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+FIRST_LAUNCH = datetime(2006, 3, 24, tzinfo=timezone.utc)
+DAYS = 365 * 20
+PRECISIONS = ('hour', 'hour', 'hour', 'day', 'month', 'quarter')
+TIMEZONES = (('America/New_York', -5), ('America/Los_Angeles', -8), ('Pacific/Kwajalein', 12))
+
+
+def _object_id(generator: random.Random) -> str:
+    return f"{generator.getrandbits(96):024x}"
+
+
+def generate_rockets(count: int = 4, seed: int = 0) -> List[Dict[str, Any]]:
+    generator = random.Random(seed)
+    return [{
+        'id': _object_id(generator),
+        'name': f"Falcon {number}",
+        'type': 'rocket',
+        'active': number > 0,
+        'stages': 2,
+        'boosters': 2 if number == count - 1 else 0,
+        'cost_per_launch': generator.randrange(5, 150) * 1000000,
+        'success_rate_pct': generator.randrange(40, 100),
+        'first_flight': (FIRST_LAUNCH + timedelta(days=700 * number)).date().isoformat(),
+        'country': 'United States',
+        'company': 'SpaceX',
+        'height': {'meters': round(generator.uniform(20, 120), 1), 'feet': 0},
+        'diameter': {'meters': 3.7, 'feet': 12},
+        'mass': {'kg': generator.randrange(30000, 1500000), 'lb': 0},
+        'payload_weights': [{'id': 'leo', 'name': 'Low Earth Orbit', 'kg': generator.randrange(400, 63800)}],
+        'first_stage': {'reusable': number > 1, 'engines': 9, 'burn_time_sec': 162},
+        'second_stage': {'reusable': False, 'engines': 1, 'burn_time_sec': 397},
+        'engines': {'number': 9, 'type': 'merlin', 'version': '1D+'},
+        'landing_legs': {'number': 4, 'material': 'carbon fiber'},
+        'flickr_images': [f"https://farm1.staticflickr.com/{generator.randrange(10 ** 9)}.jpg"
+                          for _ in range(3)],
+        'wikipedia': f"https://en.wikipedia.org/wiki/Falcon_{number}",
+        'description': "Two-stage rocket designed and manufactured by SpaceX. " * 4,
+    } for number in range(count)]
+
+
+def generate_launchpads(count: int = 6, seed: int = 0) -> List[Dict[str, Any]]:
+    generator = random.Random(seed + 1)
+    launchpads = []
+    for number in range(count):
+        attempts = generator.randrange(0, 200)
+        zone, _ = TIMEZONES[number % len(TIMEZONES)]
+        launchpads.append({
+            'id': _object_id(generator),
+            'name': f"LC {number}",
+            'full_name': f"Launch Complex {number}",
+            'status': generator.choice(('active', 'active', 'retired', 'under construction')),
+            'locality': 'Cape Canaveral',
+            'region': 'Florida',
+            'timezone': zone,
+            'latitude': generator.uniform(-90, 90),
+            'longitude': generator.uniform(-180, 180),
+            'launch_attempts': attempts,
+            'launch_successes': generator.randrange(0, attempts + 1),
+            'rockets': [],
+            'launches': [],
+            'details': "Historic launch complex refurbished for commercial launches. " * 2,
+        })
+    return launchpads
+
+
+def generate_launches(count: int, rockets: List[Dict[str, Any]], launchpads: List[Dict[str, Any]],
+                      seed: int = 0) -> List[Dict[str, Any]]:
+    """Launch documents shaped like the v4 API's, sorted by date like the real collection.
+
+    About 10% are upcoming, and a few completed launches have no recorded outcome.
+    """
+    generator = random.Random(seed + 2)
+    now = FIRST_LAUNCH + timedelta(days=DAYS * 0.9)
+    rocket_ids = [rocket['id'] for rocket in rockets]
+    launchpad_ids = [launchpad['id'] for launchpad in launchpads]
+    offsets = sorted(generator.randrange(DAYS * 86400) for _ in range(count))
+
+    launches = []
+    for number, offset in enumerate(offsets, start=1):
+        when = FIRST_LAUNCH + timedelta(seconds=offset)
+        upcoming = when > now
+        success = None if upcoming or generator.random() < 0.02 else generator.random() < 0.93
+        _, hours = TIMEZONES[generator.randrange(len(TIMEZONES))]
+        local = when.astimezone(timezone(timedelta(hours=hours)))
+        launches.append({
+            'id': _object_id(generator),
+            'flight_number': number,
+            'name': f"Mission {number}",
+            'date_utc': when.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'date_unix': calendar.timegm(when.timetuple()),
+            'date_local': local.isoformat(),
+            'date_precision': generator.choice(PRECISIONS),
+            'static_fire_date_utc': None,
+            'static_fire_date_unix': None,
+            'tbd': upcoming and generator.random() < 0.5,
+            'net': False,
+            'window': generator.choice((0, 0, 3600, None)),
+            'rocket': generator.choice(rocket_ids),
+            'success': success,
+            'failures': [] if success is not False else [
+                {'time': generator.randrange(30, 600), 'altitude': None, 'reason': 'engine failure'}
+            ],
+            'upcoming': upcoming,
+            'details': None if generator.random() < 0.5 else f"Mission {number} delivers its payload to orbit.",
+            'fairings': {'reused': False, 'recovery_attempt': generator.random() < 0.5, 'ships': []},
+            'crew': [],
+            'ships': [_object_id(generator) for _ in range(generator.randrange(3))],
+            'capsules': [],
+            'payloads': [_object_id(generator)],
+            'launchpad': generator.choice(launchpad_ids),
+            'cores': [{
+                'core': _object_id(generator),
+                'flight': generator.randrange(1, 15),
+                'gridfins': True,
+                'legs': True,
+                'reused': generator.random() < 0.6,
+                'landing_attempt': generator.random() < 0.8,
+                'landing_success': None if upcoming else generator.random() < 0.9,
+                'landing_type': 'ASDS',
+                'landpad': None,
+            }],
+            'links': {
+                'patch': {'small': f"https://images2.imgbox.com/{number}/small.png",
+                          'large': f"https://images2.imgbox.com/{number}/large.png"},
+                'reddit': {'campaign': None, 'launch': None, 'media': None, 'recovery': None},
+                'flickr': {'small': [], 'original': []},
+                'webcast': f"https://youtu.be/{number:011d}",
+                'wikipedia': None,
+            },
+            'auto_update': True,
+        })
+    return launches
+
+
+def generate_dataset(launch_count: int, seed: int = 0) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]],
+                                                                 List[Dict[str, Any]]]:
+    """Deterministic launches, rockets and launchpads payloads for a given size and seed"""
+    rockets = generate_rockets(seed=seed)
+    launchpads = generate_launchpads(seed=seed)
+    return generate_launches(launch_count, rockets, launchpads, seed), rockets, launchpads
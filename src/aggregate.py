@@ -0,0 +1,182 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .models import Launch, Rocket, Launchpad
+from .util import launch_day
+
+
+# What one launch adds to an aggregate: (True,) for upcoming launches, otherwise
+# (False, success, rocket, launchpad, year, month)
+Contribution = Tuple[Any, ...]
+
+
+def _bump(counts: Dict[Any, int], key: Any, delta: int) -> None:
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        # A key whose launches are all gone disappears, as it would from a recount
+        counts.pop(key, None)
+
+
+def contribution(upcoming: Any, success: Any, rocket: str, launchpad: str,
+                 date_unix: Any, date_utc: Any) -> Contribution:
+    if upcoming:
+        return (True,)
+    launch_date, month_year = launch_day(date_unix, date_utc)
+    return (False, success, rocket, launchpad, launch_date.year, month_year)
+
+
+def contributions(launches: Sequence) -> Dict[str, Contribution]:
+    """Contribution of every launch by id, read column by column when the sequence supports it"""
+    if not len(launches):
+        return {}
+    if hasattr(launches, 'column'):
+        field = launches.column
+    else:
+        field = lambda name: [getattr(launch, name) for launch in launches]
+    columns = [field(name) for name in ('upcoming', 'success', 'rocket', 'launchpad', 'date_unix', 'date_utc')]
+    return dict(zip(field('id'), (contribution(*values) for values in zip(*columns))))
+
+
+def _merge_counts(left: Dict[Any, int], right: Dict[Any, int]) -> Dict[Any, int]:
+    merged = dict(left)
+    for key, count in right.items():
+        merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+@dataclass
+class LaunchAggregate:
+    """Every statistic the tracker reports, gathered in a single pass.
+
+    Aggregates of consecutive chunks can be merged with merge() or +, and the
+    result is identical to aggregating the concatenated launches, including
+    the order of the per-rocket, per-site and frequency keys.
+    """
+    total_launches: int = 0
+    successful_launches: int = 0
+    failed_launches: int = 0
+    upcoming_launches: int = 0
+    # Completed launches with a known outcome, per rocket id
+    rocket_totals: Dict[str, int] = field(default_factory=dict)
+    rocket_successes: Dict[str, int] = field(default_factory=dict)
+    # Completed launches per launchpad id
+    site_counts: Dict[str, int] = field(default_factory=dict)
+    yearly: Dict[int, int] = field(default_factory=dict)
+    monthly: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_launches(cls, launches: Iterable[Launch]) -> "LaunchAggregate":
+        aggregate = cls()
+        for launch in launches:
+            aggregate.add(launch)
+        return aggregate
+
+    def add(self, launch: Launch) -> None:
+        if launch.upcoming:
+            self.upcoming_launches += 1
+            return
+
+        self.total_launches += 1
+        self.site_counts[launch.launchpad] = self.site_counts.get(launch.launchpad, 0) + 1
+
+        if launch.success is not None:
+            self.rocket_totals[launch.rocket] = self.rocket_totals.get(launch.rocket, 0) + 1
+        if launch.success:
+            self.successful_launches += 1
+            self.rocket_successes[launch.rocket] = self.rocket_successes.get(launch.rocket, 0) + 1
+        elif launch.success is False:
+            self.failed_launches += 1
+
+        launch_date, month_year = launch_day(launch.date_unix, launch.date_utc)
+        self.yearly[launch_date.year] = self.yearly.get(launch_date.year, 0) + 1
+        self.monthly[month_year] = self.monthly.get(month_year, 0) + 1
+
+    def merge(self, other: "LaunchAggregate") -> "LaunchAggregate":
+        return LaunchAggregate(
+            total_launches=self.total_launches + other.total_launches,
+            successful_launches=self.successful_launches + other.successful_launches,
+            failed_launches=self.failed_launches + other.failed_launches,
+            upcoming_launches=self.upcoming_launches + other.upcoming_launches,
+            rocket_totals=_merge_counts(self.rocket_totals, other.rocket_totals),
+            rocket_successes=_merge_counts(self.rocket_successes, other.rocket_successes),
+            site_counts=_merge_counts(self.site_counts, other.site_counts),
+            yearly=_merge_counts(self.yearly, other.yearly),
+            monthly=_merge_counts(self.monthly, other.monthly),
+        )
+
+    __add__ = merge
+
+    def apply(self, contribution: Contribution, sign: int = 1) -> None:
+        """Add a launch's contribution, or take it back out with sign=-1"""
+        if contribution[0]:
+            self.upcoming_launches += sign
+            return
+
+        _, success, rocket, launchpad, year, month_year = contribution
+        self.total_launches += sign
+        _bump(self.site_counts, launchpad, sign)
+        if success is not None:
+            _bump(self.rocket_totals, rocket, sign)
+        if success:
+            self.successful_launches += sign
+            _bump(self.rocket_successes, rocket, sign)
+        elif success is False:
+            self.failed_launches += sign
+        _bump(self.yearly, year, sign)
+        _bump(self.monthly, month_year, sign)
+
+    def update(self, before: Dict[str, Contribution], after: Dict[str, Contribution]) -> None:
+        """Move the aggregate from one set of launches to another, touching only launches that changed"""
+        for id, old in before.items():
+            if after.get(id) != old:
+                self.apply(old, -1)
+        for id, new in after.items():
+            if before.get(id) != new:
+                self.apply(new)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Counts are stored as pairs so integer years and key order survive JSON
+        return {name: list(value.items()) if isinstance(value, dict) else value
+                for name, value in vars(self).items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LaunchAggregate":
+        return cls(**{name: dict(map(tuple, value)) if isinstance(value, list) else value
+                      for name, value in data.items()})
+
+    def statistics(self) -> Dict[str, Any]:
+        success_rate = (self.successful_launches / self.total_launches * 100) if self.total_launches > 0 else 0
+
+        return {
+            'total_launches': self.total_launches,
+            'successful_launches': self.successful_launches,
+            'failed_launches': self.failed_launches,
+            'upcoming_launches': self.upcoming_launches,
+            'success_rate': success_rate
+        }
+
+    def success_rate_by_rocket(self, rockets: List[Rocket]) -> Dict[str, Dict[str, Any]]:
+        rocket_id_to_name = {rocket.id: rocket.name for rocket in rockets}
+        result = {}
+
+        for rocket_id, total in self.rocket_totals.items():
+            successful = self.rocket_successes.get(rocket_id, 0)
+            result[rocket_id_to_name.get(rocket_id, rocket_id)] = {
+                'success_rate': (successful / total) * 100 if total > 0 else 0,
+                'total_launches': total,
+                'successful_launches': successful
+            }
+
+        return result
+
+    def launches_by_site(self, launchpads: List[Launchpad]) -> Dict[str, int]:
+        launchpad_id_to_name = {launchpad.id: launchpad.name for launchpad in launchpads}
+        return {launchpad_id_to_name.get(id, id): count for id, count in self.site_counts.items()}
+
+    def launch_frequency(self) -> Dict[str, Dict[str, int]]:
+        return {
+            'monthly': dict(self.monthly),
+            'yearly': dict(self.yearly)
+        }
@@ -1,76 +1,259 @@
 import requests
-from typing import List, Dict, Any, Optional
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Dict, Any, Optional
 
 from .models import Launch, Rocket, Launchpad
 from .logger import setup_logger
+from .metrics import METRICS
+from .streaming import iter_json_array
+from .transport import CircuitOpenError, Transport, TransportConfig
 
 logger = setup_logger("main", level=10)
 
 
+@dataclass
+class Validators:
+    """HTTP cache validators returned with a response"""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def from_headers(cls, headers: Any) -> Optional["Validators"]:
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return None
+        return cls(etag=etag, last_modified=last_modified)
+
+    def request_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class NotModified(Exception):
+    """Raised when the server answers a conditional request with 304"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        super().__init__(f"{endpoint} not modified")
+
+
+class APIError(Exception):
+    """Raised when a request fails after retries, or is refused by the circuit breaker"""
+
+
+def _endpoint_label(endpoint: str) -> str:
+    # Collapse document ids so by-id requests share one label
+    collection, _, rest = endpoint.partition('/')
+    return f"{collection}/:id" if rest and rest != "query" else endpoint
+
+
+def _count_bytes(chunks: Iterable[bytes], endpoint: str) -> Iterator[bytes]:
+    received = 0
+    try:
+        for chunk in chunks:
+            received += len(chunk)
+            yield chunk
+    finally:
+        METRICS.inc("http_response_bytes_total", received, endpoint=endpoint)
+
+
+def _build_all(model: type, documents: Iterable[Dict[str, Any]]) -> Iterator[Any]:
+    """Yield model instances built from API documents, timing only the construction"""
+    clock = METRICS.clock
+    elapsed, count = 0.0, 0
+    try:
+        for document in documents:
+            start = clock()
+            fields = {k: v for k, v in document.items()
+                          if k in model.__annotations__}
+            item = model(**fields)
+            elapsed += clock() - start
+            count += 1
+            yield item
+    finally:
+        if count:
+            METRICS.observe("model_build_seconds", elapsed, model=model.__name__)
+            METRICS.inc("models_built_total", count, model=model.__name__)
+
+
 class SpaceXAPIClient:
     BASE_URL = "https://api.spacexdata.com/v4"
+    QUERY_PAGE_SIZE = 100
+    STREAM_CHUNK_SIZE = 64 * 1024
     
-    def __init__(self):
+    def __init__(self, config: Optional[TransportConfig] = None):
         logger.info("Checking the logger")
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'SpaceXLaunchTracker/1.0'
         })
+        self.transport = Transport(self.session, config)
+        # Validators per endpoint; when present, requests for that endpoint are conditional
+        self.validators: Dict[str, Validators] = {}
+    
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None,
+                      payload: Optional[Dict] = None) -> Any:
+        label = _endpoint_label(endpoint)
+        with METRICS.timer("http_request_seconds", endpoint=label):
+            return self._send_request(endpoint, label, params, payload)
+    
+    def _record_response(self, label: str, response: Any) -> None:
+        METRICS.inc("http_responses_total", endpoint=label, status=response.status_code)
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+    def _send_request(self, endpoint: str, label: str, params: Optional[Dict],
+                      payload: Optional[Dict]) -> Any:
         url = f"{self.BASE_URL}/{endpoint}"
         
+        if payload is not None:
+            # Query endpoints are POSTs and never conditional
+            try:
+                response = self.transport.post(url, payload)
+                self._record_response(label, response)
+                response.raise_for_status()
+                METRICS.inc("http_response_bytes_total", len(response.content), endpoint=label)
+                return response.json()
+            except (requests.exceptions.RequestException, CircuitOpenError) as e:
+                METRICS.inc("http_errors_total", endpoint=label, error=type(e).__name__)
+                logger.error(f"Error while making API request: {e}")
+                return None
+        
+        validators = self.validators.get(endpoint)
+        
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.transport.get(url, params=params,
+                                          headers=validators.request_headers() if validators else None)
+            self._record_response(label, response)
+            if validators and response.status_code == 304:
+                raise NotModified(endpoint)
             response.raise_for_status()
+            METRICS.inc("http_response_bytes_total", len(response.content), endpoint=label)
+            response_validators = Validators.from_headers(response.headers)
+            if response_validators:
+                self.validators[endpoint] = response_validators
+            else:
+                self.validators.pop(endpoint, None)
             return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error("Error while making API request")
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
+            METRICS.inc("http_errors_total", endpoint=label, error=type(e).__name__)
+            logger.error(f"Error while making API request: {e}")
+    
+    def _stream_request(self, endpoint: str) -> Iterator[Any]:
+        """Yield the items of a JSON array response while it downloads.
+
+        Validators are only recorded once the whole body has been read, so an
+        interrupted download never marks a partial copy as current.
+        """
+        url = f"{self.BASE_URL}/{endpoint}"
+        label = _endpoint_label(endpoint)
+        validators = self.validators.get(endpoint)
+        
+        try:
+            # Only the wait for the response headers; the body is read as the caller consumes it
+            with METRICS.timer("http_request_seconds", endpoint=label):
+                response = self.transport.get(url, headers=validators.request_headers() if validators else None,
+                                              stream=True)
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
+            METRICS.inc("http_errors_total", endpoint=label, error=type(e).__name__)
+            logger.error(f"Error while making API request: {e}")
+            raise APIError(f"Failed to fetch {endpoint}") from e
+        
+        with closing(response):
+            self._record_response(label, response)
+            if validators and response.status_code == 304:
+                raise NotModified(endpoint)
+            try:
+                response.raise_for_status()
+                yield from iter_json_array(_count_bytes(response.iter_content(self.STREAM_CHUNK_SIZE), label))
+            except (requests.exceptions.RequestException, ValueError) as e:
+                METRICS.inc("http_errors_total", endpoint=label, error=type(e).__name__)
+                if isinstance(e, ValueError):
+                    METRICS.inc("parse_failures_total", kind="json")
+                logger.error(f"Error while streaming API response: {e}")
+                raise APIError(f"Failed to fetch {endpoint}") from e
+            
+            response_validators = Validators.from_headers(response.headers)
+            if response_validators:
+                self.validators[endpoint] = response_validators
+            else:
+                self.validators.pop(endpoint, None)
+    
+    def _fetch(self, endpoint: str) -> Any:
+        data = self._make_request(endpoint)
+        if data is None:
+            raise APIError(f"Failed to fetch {endpoint}")
+        return data
     
     def get_all_launches(self) -> List[Launch]:
-        data = self._make_request("launches")
-        launches = []
-        for launch_data in data:
-            fields = {k: v for k, v in launch_data.items() 
-                          if k in Launch.__annotations__}
+        return list(_build_all(Launch, self._fetch("launches")))
+    
+    def stream_launches(self) -> Iterator[Launch]:
+        """Yield every launch as it is parsed from the response, without holding the full payload"""
+        return _build_all(Launch, self._stream_request("launches"))
+    
+    def query_launches(self, query: Dict[str, Any], page_size: Optional[int] = None) -> Iterator[List[Launch]]:
+        """Yield launches matching a v4 query one page at a time.
+
+        The next page is only requested once the caller has consumed the current
+        one, so at most a single page is held in memory.
+        """
+        return self._query_pages("launches", Launch, query, page_size)
+    
+    def get_by_ids(self, collection: str, model: type, ids: List[str]) -> List[Any]:
+        """Fetch every listed document of a collection with a single $in query"""
+        if not ids:
+            return []
+        return [item for page in self._query_pages(collection, model, {"_id": {"$in": list(ids)}},
+                                                   max(len(ids), self.QUERY_PAGE_SIZE))
+                for item in page]
+    
+    def _query_pages(self, collection: str, model: type, query: Dict[str, Any],
+                     page_size: Optional[int] = None) -> Iterator[List[Any]]:
+        page = 1
+        while page:
+            data = self._make_request(f"{collection}/query", payload={
+                "query": query,
+                "options": {
+                    "page": page,
+                    "limit": page_size or self.QUERY_PAGE_SIZE,
+                    "sort": {"flight_number": "asc"} if collection == "launches" else {"_id": "asc"},
+                    "pagination": True,
+                },
+            })
+            if data is None:
+                raise APIError(f"Failed to fetch page {page} of {collection}/query")
+            
+            yield list(_build_all(model, data.get("docs", [])))
             
-            launches.append(Launch(**fields))
-        return launches
+            page = data.get("nextPage") if data.get("hasNextPage") else None
     
     def get_launch_by_id(self, launch_id: str) -> Launch:
-        data = self._make_request(f"launches/{launch_id}")
+        data = self._fetch(f"launches/{launch_id}")
          
         fields = {k: v for k, v in data.items() 
                       if k in Launch.__annotations__}
         return Launch(**fields)
     
     def get_all_rockets(self) -> List[Rocket]:
-        data = self._make_request("rockets")
-        rockets = []
-        for rocket_data in data:
-            fields = {k: v for k, v in rocket_data.items() 
-                          if k in Rocket.__annotations__}
-            rockets.append(Rocket(**fields))
-        return rockets
+        return list(_build_all(Rocket, self._fetch("rockets")))
     
     def get_rocket_by_id(self, rocket_id: str) -> Rocket:
-        data = self._make_request(f"rockets/{rocket_id}")
+        data = self._fetch(f"rockets/{rocket_id}")
         fields = {k: v for k, v in data.items() 
                       if k in Rocket.__annotations__}
         
         return Rocket(**fields)
     
     def get_all_launchpads(self) -> List[Launchpad]:
-        data = self._make_request("launchpads")
-        launchpads = []
-        for launchpad_data in data:
-            fields = {k: v for k, v in launchpad_data.items() 
-                          if k in Launchpad.__annotations__}
-            launchpads.append(Launchpad(**fields))
-        return launchpads
+        return list(_build_all(Launchpad, self._fetch("launchpads")))
     
     def get_launchpad_by_id(self, launchpad_id: str) -> Launchpad:
-        data = self._make_request(f"launchpads/{launchpad_id}")
+        data = self._fetch(f"launchpads/{launchpad_id}")
         
         fields = {k: v for k, v in data.items() 
                       if k in Launchpad.__annotations__}
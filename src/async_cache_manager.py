@@ -0,0 +1,161 @@
+import asyncio
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .aggregate import LaunchAggregate
+from .api_client import APIError, NotModified
+from .async_client import AsyncSpaceXAPIClient
+from .cache_manager import CacheLoadError, CacheManager, CachePolicy
+from .logger import setup_logger
+from .models import Launch, Rocket, Launchpad
+from .serializers import CacheSerializer
+from .transport import TransportConfig
+
+logger = setup_logger("main", level=10)
+
+
+class AsyncCacheManager:
+    """asyncio counterpart of CacheManager over the same cache directory and policies.
+
+    The API is called through an AsyncSpaceXAPIClient, so the three
+    collections and by-id batches download concurrently. Reading, writing
+    and decoding cache files runs on the loop's default executor, which keeps
+    large cache reads from blocking the event loop. Files, locks, validators,
+    statistics and query results are shared with CacheManager instances and
+    other processes using the directory. Incremental launch syncs are only
+    available through CacheManager.
+    """
+    FETCHERS = {"launches": "get_all_launches", "rockets": "get_all_rockets", "launchpads": "get_all_launchpads"}
+
+    def __init__(self, cache_dir: str = ".cache", serializer: Optional[CacheSerializer] = None,
+                 transport: Optional[TransportConfig] = None,
+                 policies: Optional[Dict[str, CachePolicy]] = None,
+                 max_cache_bytes: Optional[int] = CacheManager.MAX_CACHE_BYTES, concurrency: int = 8):
+        self.cache = CacheManager(cache_dir, serializer, transport, policies, max_cache_bytes)
+        self.api_client = AsyncSpaceXAPIClient(transport, concurrency)
+        self._refreshing: Dict[str, "asyncio.Future[Sequence]"] = {}
+        self._revalidating: Set["asyncio.Future[Any]"] = set()
+
+    async def __aenter__(self) -> "AsyncCacheManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.wait_for_revalidation()
+        await self.api_client.close()
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, partial(fn, *args))
+
+    async def _get_collection(self, endpoint: str, force_refresh: bool) -> Sequence:
+        """Serve an endpoint following its policy, deciding exactly like CacheManager._get_collection"""
+        cached, revalidate = await self._run(self.cache._serve_cached, endpoint, force_refresh)
+        if cached is None:
+            return await self._refresh(endpoint)
+        if revalidate:
+            self._revalidate_in_background(endpoint)
+        return cached
+
+    async def _refresh(self, endpoint: str) -> Sequence:
+        """Refresh an endpoint once for every caller waiting on it in this process"""
+        future = self._refreshing.get(endpoint)
+        if future is None:
+            future = asyncio.ensure_future(self._locked_refresh(endpoint))
+            self._refreshing[endpoint] = future
+            future.add_done_callback(lambda _: self._refreshing.pop(endpoint, None))
+        return await asyncio.shield(future)
+
+    def _revalidate_in_background(self, endpoint: str) -> None:
+        if endpoint in self._refreshing:
+            return
+        logger.info(f"Serving stale {endpoint} while refreshing it in the background")
+        task = asyncio.ensure_future(self._revalidate(endpoint))
+        self._revalidating.add(task)
+        task.add_done_callback(self._revalidating.discard)
+
+    async def _revalidate(self, endpoint: str) -> None:
+        try:
+            await self._refresh(endpoint)
+        except Exception as e:
+            logger.error(f"Background refresh of {endpoint} failed: {e}")
+
+    async def wait_for_revalidation(self) -> None:
+        """Wait for the background refreshes started so far"""
+        if self._revalidating:
+            await asyncio.gather(*self._revalidating)
+
+    async def _locked_refresh(self, endpoint: str) -> Sequence:
+        """Refresh holding the endpoint's file lock, as CacheManager._locked_refresh does"""
+        cached, lock = await self._run(self.cache._begin_refresh, endpoint)
+        if lock is None:
+            return cached
+        try:
+            return await self._refresh_collection(endpoint)
+        finally:
+            await self._run(lock.release)
+
+    async def _refresh_collection(self, endpoint: str) -> Sequence:
+        cache, client = self.cache, self.api_client
+        fetch = getattr(client, self.FETCHERS[endpoint])
+
+        # Revalidate the stored copy instead of downloading it again when possible
+        await self._run(cache._prepare_validators, client.validators, endpoint)
+        try:
+            try:
+                items = await fetch()
+            except NotModified:
+                cached = await self._run(cache._serve_not_modified, endpoint)
+                if cached:
+                    return cached
+                client.validators.pop(endpoint, None)
+                items = await fetch()
+        except APIError as e:
+            return await self._run(cache._serve_after_failure, endpoint, e)
+        return await self._run(cache._store_collection, endpoint, items, partial(client.validators.get, endpoint))
+
+    async def get_launches(self, force_refresh: bool = False) -> Sequence[Launch]:
+        return await self._get_collection("launches", force_refresh)
+
+    async def get_rockets(self, force_refresh: bool = False) -> Sequence[Rocket]:
+        return await self._get_collection("rockets", force_refresh)
+
+    async def get_launchpads(self, force_refresh: bool = False) -> Sequence[Launchpad]:
+        return await self._get_collection("launchpads", force_refresh)
+
+    async def get_all(self, force_refresh: bool = False) -> Tuple[Sequence[Launch], Sequence[Rocket],
+                                                                  Sequence[Launchpad]]:
+        """Load launches, rockets and launchpads concurrently, raising CacheLoadError for any that failed"""
+        endpoints = ("launches", "rockets", "launchpads")
+        results = await asyncio.gather(*(self._get_collection(endpoint, force_refresh) for endpoint in endpoints),
+                                       return_exceptions=True)
+        errors: Dict[str, Exception] = {}
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error loading {endpoint}: {result}")
+                errors[endpoint] = result
+        if errors:
+            raise CacheLoadError(errors)
+        launches, rockets, launchpads = results
+        return launches, rockets, launchpads
+
+    async def _get_by_ids(self, endpoint: str, model: type, ids: List[str]) -> Dict[str, Any]:
+        """Resolve ids from memory, then the cache file, then concurrent batched API queries"""
+        ids = list(dict.fromkeys(ids))
+        found, missing = await self._run(self.cache._find_known, endpoint, model, ids)
+        fetched = await self.api_client.get_by_ids(endpoint, model, missing) if missing else []
+        return self.cache._add_fetched(endpoint, ids, found, fetched)
+
+    async def get_launches_by_ids(self, ids: Iterable[str]) -> Dict[str, Launch]:
+        return await self._get_by_ids("launches", Launch, list(ids))
+
+    async def get_rockets_by_ids(self, ids: Iterable[str]) -> Dict[str, Rocket]:
+        return await self._get_by_ids("rockets", Rocket, list(ids))
+
+    async def get_launchpads_by_ids(self, ids: Iterable[str]) -> Dict[str, Launchpad]:
+        return await self._get_by_ids("launchpads", Launchpad, list(ids))
+
+    async def get_launch_aggregate(self) -> Optional[LaunchAggregate]:
+        """Statistics of every cached launch, as CacheManager.get_launch_aggregate"""
+        return await self._run(self.cache.get_launch_aggregate)
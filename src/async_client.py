@@ -0,0 +1,166 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .api_client import APIError, NotModified, Validators, _build_all, _endpoint_label
+from .logger import setup_logger
+from .metrics import METRICS
+from .models import Launch, Rocket, Launchpad
+from .transport import AsyncTransport, CircuitOpenError, TransportConfig
+
+logger = setup_logger("main", level=10)
+
+
+class AsyncSpaceXAPIClient:
+    """asyncio counterpart of SpaceXAPIClient, returning the same models.
+
+    Every request goes through one pooled aiohttp session, and at most
+    concurrency of them are in flight at a time, so callers can gather
+    independent fetches freely. Use it as an async context manager, or call
+    close(), to release the session. Requires aiohttp.
+    """
+    BASE_URL = "https://api.spacexdata.com/v4"
+    QUERY_PAGE_SIZE = 100
+    # Ids per $in query when resolving many documents; batches are sent concurrently
+    ID_BATCH_SIZE = 100
+
+    def __init__(self, config: Optional[TransportConfig] = None, concurrency: int = 8):
+        self.transport = AsyncTransport(config, headers={'User-Agent': 'SpaceXLaunchTracker/1.0'})
+        self.concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Validators per endpoint; when present, requests for that endpoint are conditional
+        self.validators: Dict[str, Validators] = {}
+
+    async def __aenter__(self) -> "AsyncSpaceXAPIClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.transport.close()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it belongs to the loop the client is used in
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _make_request(self, endpoint: str, params: Optional[Dict] = None,
+                            payload: Optional[Dict] = None) -> Any:
+        label = _endpoint_label(endpoint)
+        async with self.semaphore:
+            with METRICS.timer("http_request_seconds", endpoint=label):
+                return await self._send_request(endpoint, label, params, payload)
+
+    async def _send_request(self, endpoint: str, label: str, params: Optional[Dict],
+                            payload: Optional[Dict]) -> Any:
+        import aiohttp
+
+        url = f"{self.BASE_URL}/{endpoint}"
+        validators = None if payload is not None else self.validators.get(endpoint)
+        try:
+            if payload is not None:
+                # Query endpoints are POSTs and never conditional
+                response = await self.transport.post(url, payload)
+            else:
+                response = await self.transport.get(url, params=params,
+                                                    headers=validators.request_headers() if validators else None)
+            METRICS.inc("http_responses_total", endpoint=label, status=response.status)
+            if validators and response.status == 304:
+                raise NotModified(endpoint)
+            if response.status >= 400:
+                # Named like the requests exception the sync client records
+                METRICS.inc("http_errors_total", endpoint=label, error="HTTPError")
+                logger.error(f"Error while making API request: HTTP {response.status} for url: {url}")
+                return None
+            METRICS.inc("http_response_bytes_total", len(response.content), endpoint=label)
+            data = json.loads(response.content)
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError, ValueError) as e:
+            METRICS.inc("http_errors_total", endpoint=label, error=type(e).__name__)
+            if isinstance(e, ValueError):
+                METRICS.inc("parse_failures_total", kind="json")
+            logger.error(f"Error while making API request: {e}")
+            return None
+
+        if payload is None:
+            response_validators = Validators.from_headers(response.headers)
+            if response_validators:
+                self.validators[endpoint] = response_validators
+            else:
+                self.validators.pop(endpoint, None)
+        return data
+
+    async def _fetch(self, endpoint: str) -> Any:
+        data = await self._make_request(endpoint)
+        if data is None:
+            raise APIError(f"Failed to fetch {endpoint}")
+        return data
+
+    async def _fetch_one(self, endpoint: str, model: type) -> Any:
+        return next(_build_all(model, [await self._fetch(endpoint)]))
+
+    async def get_all_launches(self) -> List[Launch]:
+        return list(_build_all(Launch, await self._fetch("launches")))
+
+    async def get_all_rockets(self) -> List[Rocket]:
+        return list(_build_all(Rocket, await self._fetch("rockets")))
+
+    async def get_all_launchpads(self) -> List[Launchpad]:
+        return list(_build_all(Launchpad, await self._fetch("launchpads")))
+
+    async def get_all(self) -> Tuple[List[Launch], List[Rocket], List[Launchpad]]:
+        """Fetch launches, rockets and launchpads concurrently"""
+        launches, rockets, launchpads = await asyncio.gather(
+            self.get_all_launches(), self.get_all_rockets(), self.get_all_launchpads()
+        )
+        return launches, rockets, launchpads
+
+    async def get_launch_by_id(self, launch_id: str) -> Launch:
+        return await self._fetch_one(f"launches/{launch_id}", Launch)
+
+    async def get_rocket_by_id(self, rocket_id: str) -> Rocket:
+        return await self._fetch_one(f"rockets/{rocket_id}", Rocket)
+
+    async def get_launchpad_by_id(self, launchpad_id: str) -> Launchpad:
+        return await self._fetch_one(f"launchpads/{launchpad_id}", Launchpad)
+
+    async def query_launches(self, query: Dict[str, Any],
+                             page_size: Optional[int] = None) -> AsyncIterator[List[Launch]]:
+        """Yield launches matching a v4 query one page at a time, requesting each page on demand"""
+        async for page in self._query_pages("launches", Launch, query, page_size):
+            yield page
+
+    async def get_by_ids(self, collection: str, model: type, ids: List[str]) -> List[Any]:
+        """Fetch every listed document of a collection, in concurrent $in queries of ID_BATCH_SIZE ids"""
+        ids = list(ids)
+        batches = [ids[start:start + self.ID_BATCH_SIZE] for start in range(0, len(ids), self.ID_BATCH_SIZE)]
+
+        async def fetch(batch: List[str]) -> List[Any]:
+            return [item async for page in self._query_pages(collection, model, {"_id": {"$in": batch}},
+                                                             max(len(batch), self.QUERY_PAGE_SIZE))
+                    for item in page]
+
+        results = await asyncio.gather(*(fetch(batch) for batch in batches))
+        return [item for batch in results for item in batch]
+
+    async def _query_pages(self, collection: str, model: type, query: Dict[str, Any],
+                           page_size: Optional[int] = None) -> AsyncIterator[List[Any]]:
+        page = 1
+        while page:
+            data = await self._make_request(f"{collection}/query", payload={
+                "query": query,
+                "options": {
+                    "page": page,
+                    "limit": page_size or self.QUERY_PAGE_SIZE,
+                    "sort": {"flight_number": "asc"} if collection == "launches" else {"_id": "asc"},
+                    "pagination": True,
+                },
+            })
+            if data is None:
+                raise APIError(f"Failed to fetch page {page} of {collection}/query")
+
+            yield list(_build_all(model, data.get("docs", [])))
+
+            page = data.get("nextPage") if data.get("hasNextPage") else None
@@ -1,32 +1,169 @@
 import json
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Dict, Any, Optional, Sequence, Tuple
 from pathlib import Path
 
-from .api_client import SpaceXAPIClient
+from .aggregate import LaunchAggregate, contributions
 from .models import Launch, Rocket, Launchpad
+from .locking import FileLock, write_atomic
 from .logger import setup_logger
+from .lru import LRUCache
+from .metrics import METRICS
+from .query_cache import QueryCache
+from .serializers import CacheSerializer, ColumnarSerializer, LazyRecords, SQLiteRecords
+
+if TYPE_CHECKING:
+    from .api_client import SpaceXAPIClient, Validators
+    from .transport import TransportConfig
 
 logger = setup_logger("main", level=10)
 
 
+class CacheLoadError(Exception):
+    """Raised by a bulk load when one or more endpoints could not be fetched"""
+
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        details = ", ".join(f"{endpoint}: {error!r}" for endpoint, error in errors.items())
+        super().__init__(f"Failed to load {details}")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long one endpoint's cache is trusted, in seconds"""
+    # Served without contacting the API
+    ttl: float
+    # Served as is for this long after ttl while a background refresh runs
+    stale_ttl: float = 0.0
+    # After a failed fetch, how long to serve what is cached (or fail) instead of retrying
+    negative_ttl: float = 60.0
+
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+def _on_first(items: Iterable[Any], callback: Callable[[], None]) -> Iterator[Any]:
+    """Pass items through, calling callback just before the first one"""
+    iterator = iter(items)
+    for item in iterator:
+        callback()
+        yield item
+        break
+    yield from iterator
+
+
 class CacheManager:
-    def __init__(self, cache_dir: str = ".cache"):
-        self.api_client = SpaceXAPIClient()
+    # Launches, rockets and launchpads are independent, so one worker each is enough
+    MAX_WORKERS = 3
+    # Longest wait for another process to finish refreshing an endpoint with no previous copy
+    LOCK_TIMEOUT = 120.0
+    # Bounds of the in-memory cache answering by-id lookups, per endpoint
+    LOOKUP_CACHE_SIZE = 1024
+    LOOKUP_CACHE_TTL = 3600.0
+    # Incremental syncs download the whole collection again at this interval
+    FULL_SYNC_INTERVAL = 7 * DAY
+    # Filtered rows and statistics memoized per launches version, across runs
+    QUERY_CACHE_SIZE = 128
+    # Least recently refreshed endpoints are evicted once the cache directory grows past this
+    MAX_CACHE_BYTES = 1 << 30
+    MODELS = {"launches": Launch, "rockets": Rocket, "launchpads": Launchpad}
+    FETCHERS = {"launches": "stream_launches", "rockets": "get_all_rockets", "launchpads": "get_all_launchpads"}
+    # Upcoming launches change hourly, rockets and launchpads hardly ever
+    POLICIES = {
+        "launches": CachePolicy(ttl=HOUR, stale_ttl=7 * DAY),
+        "rockets": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+        "launchpads": CachePolicy(ttl=7 * DAY, stale_ttl=30 * DAY),
+    }
+
+    def __init__(self, cache_dir: str = ".cache", serializer: Optional[CacheSerializer] = None,
+                 transport: Optional["TransportConfig"] = None,
+                 policies: Optional[Dict[str, CachePolicy]] = None,
+                 max_cache_bytes: Optional[int] = MAX_CACHE_BYTES):
+        self._api_client: Optional["SpaceXAPIClient"] = None
+        self.transport = transport
+        self._api_client_lock = threading.Lock()
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.serializer = serializer or ColumnarSerializer()
+        self.policies = dict(self.POLICIES, **(policies or {}))
+        self.max_cache_bytes = max_cache_bytes
+        self._lookups: Dict[str, LRUCache] = {
+            endpoint: LRUCache(self.LOOKUP_CACHE_SIZE, self.LOOKUP_CACHE_TTL)
+            for endpoint in self.MODELS
+        }
+        self.queries = QueryCache(self.QUERY_CACHE_SIZE, self.cache_dir / "launches.queries.json")
+        self._revalidating: Dict[str, threading.Thread] = {}
+        self._revalidating_lock = threading.Lock()
+    
+    @property
+    def api_client(self) -> "SpaceXAPIClient":
+        # The HTTP stack is only imported and built once a fetch actually needs it
+        with self._api_client_lock:
+            if self._api_client is None:
+                from .api_client import SpaceXAPIClient
+                self._api_client = SpaceXAPIClient(self.transport)
+            return self._api_client
+    
+    @api_client.setter
+    def api_client(self, api_client: "SpaceXAPIClient") -> None:
+        self._api_client = api_client
     
     def _get_cache_path(self, endpoint: str) -> Path:
-        return self.cache_dir / f"{endpoint.replace('/', '_')}.json"
+        return self.cache_dir / f"{endpoint.replace('/', '_')}{self.serializer.suffix}"
     
-    def _is_cache_valid(self, cache_path: Path, max_age_hours: int = 24) -> bool:
-        if not cache_path.exists():
-            return False
-        
-        cache_time = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        return datetime.now() - cache_time < timedelta(hours=max_age_hours)
+    def _get_validators_path(self, endpoint: str) -> Path:
+        return self.cache_dir / f"{endpoint.replace('/', '_')}.meta.json"
+    
+    def _get_sync_state_path(self, endpoint: str) -> Path:
+        return self.cache_dir / f"{endpoint.replace('/', '_')}.sync.json"
+    
+    def _get_lock_path(self, endpoint: str) -> Path:
+        return self.cache_dir / f"{endpoint.replace('/', '_')}.lock"
+    
+    def _get_aggregate_path(self) -> Path:
+        return self.cache_dir / "launches.stats.json"
+    
+    def _get_failure_path(self, endpoint: str) -> Path:
+        return self.cache_dir / f"{endpoint.replace('/', '_')}.failed.json"
+    
+    def _age(self, path: Path) -> Optional[float]:
+        try:
+            return time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+    
+    def _is_fresh(self, endpoint: str) -> bool:
+        age = self._age(self._get_cache_path(endpoint))
+        return age is not None and age < self.policies[endpoint].ttl
+    
+    def _is_servable(self, endpoint: str) -> bool:
+        """Whether the cached copy may be served without waiting for the API"""
+        policy = self.policies[endpoint]
+        age = self._age(self._get_cache_path(endpoint))
+        return age is not None and age < policy.ttl + policy.stale_ttl
+    
+    def _recent_failure(self, endpoint: str) -> Optional[str]:
+        failure_path = self._get_failure_path(endpoint)
+        age = self._age(failure_path)
+        if age is None or age >= self.policies[endpoint].negative_ttl:
+            return None
+        data = self._load_from_cache(failure_path)
+        return data.get('error', 'unknown error') if data else 'unknown error'
+    
+    def _record_failure(self, endpoint: str, error: Exception) -> None:
+        # Kept on disk so every process sharing the cache backs off, not just this one
+        self._save_to_cache(self._get_failure_path(endpoint), {'error': str(error)})
+    
+    def _clear_failure(self, endpoint: str) -> None:
+        failure_path = self._get_failure_path(endpoint)
+        if failure_path.exists():
+            failure_path.unlink()
     
     def _load_from_cache(self, cache_path: Path) -> Any:
         try:
@@ -38,54 +175,501 @@ class CacheManager:
     
     def _save_to_cache(self, cache_path: Path, data: Any) -> None:
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(data, f, default=str, indent=2)
+            write_atomic(cache_path, json.dumps(data, default=str, indent=2))
         except IOError as e:
            logger.error("Error saving cache data")
     
-    def get_launches(self, force_refresh: bool) -> List[Launch]:
-        cache_path = self._get_cache_path("launches")
+    def _load_validators(self, endpoint: str) -> Optional["Validators"]:
+        validators_path = self._get_validators_path(endpoint)
+        if not validators_path.exists():
+            return None
+        data = self._load_from_cache(validators_path)
+        from .api_client import Validators
+        return Validators(**data) if data else None
+    
+    def _save_validators(self, endpoint: str, validators: Optional["Validators"]) -> None:
+        validators_path = self._get_validators_path(endpoint)
+        if validators:
+            self._save_to_cache(validators_path, validators.__dict__)
+        elif validators_path.exists():
+            validators_path.unlink()
+    
+    def _renew(self, cache_path: Path) -> None:
+        """Mark a cache entry as fresh again without rewriting it"""
+        os.utime(cache_path)
+    
+    def _write_collection(self, cache_path: Path, items: Iterable[Any]) -> int:
+        """Write items to the cache as they arrive; the old file stays in place until all are written"""
+        with self.serializer.writer(cache_path) as writer:
+            for item in items:
+                writer.write(item.to_dict())
+        return writer.count
+    
+    def _get_collection(self, endpoint: str, force_refresh: bool,
+                        refresh: Optional[Callable[[], Sequence]] = None) -> Sequence:
+        """Return a collection from the cache, refreshing it according to the endpoint's policy.
+
+        Fresh copies are served as is. Stale copies inside the policy's stale
+        window are served immediately while a background thread refreshes them.
+        Anything older waits for the refresh, unless the last fetch failed
+        within negative_ttl, in which case whatever is cached is served.
+        """
+        refresh = refresh or partial(self._refresh_collection, endpoint)
+        cached, revalidate = self._serve_cached(endpoint, force_refresh)
+        if cached is None:
+            return self._locked_refresh(endpoint, refresh)
+        if revalidate:
+            self._revalidate_in_background(endpoint, refresh)
+        return cached
+    
+    def _serve_cached(self, endpoint: str, force_refresh: bool) -> Tuple[Optional[Sequence], bool]:
+        """Decide from the cache alone whether a request for endpoint can be served without refreshing.
+
+        Returns the cached copy to serve and whether it should be revalidated
+        in the background, or (None, False) when the caller has to refresh
+        first. Shared with AsyncCacheManager, which runs it off the event loop.
+        """
+        cache_path = self._get_cache_path(endpoint)
         
-        if not force_refresh and self._is_cache_valid(cache_path):
-            cached_data = self._load_from_cache(cache_path)
-            if cached_data:
-                return [Launch(**launch) for launch in cached_data]
+        if not force_refresh and self._is_servable(endpoint):
+            cached = self._load_collection(endpoint)
+            if cached:
+                fresh = self._is_fresh(endpoint)
+                METRICS.inc("cache_requests_total", endpoint=endpoint, result="hit" if fresh else "stale")
+                return cached, not fresh
         
-        launches = self.api_client.get_all_launches()
+        failure = None if force_refresh else self._recent_failure(endpoint)
+        if failure:
+            METRICS.inc("cache_requests_total", endpoint=endpoint, result="negative")
+            cached = self._load_collection(endpoint) if cache_path.exists() else None
+            if cached:
+                logger.warning(f"Serving stale {endpoint}, the last refresh failed: {failure}")
+                return cached, False
+            from .api_client import APIError
+            raise APIError(f"Not retrying {endpoint} yet, the last refresh failed: {failure}")
         
-        launches_dict = [launch.__dict__ for launch in launches]
-        self._save_to_cache(cache_path, launches_dict)
+        METRICS.inc("cache_requests_total", endpoint=endpoint,
+                    result="refresh" if force_refresh else "miss")
+        return None, False
+    
+    def _load_collection(self, endpoint: str) -> Sequence:
+        with METRICS.timer("cache_load_seconds", endpoint=endpoint):
+            return self.serializer.load(self._get_cache_path(endpoint), self.MODELS[endpoint])
+    
+    def _revalidate_in_background(self, endpoint: str, refresh: Callable[[], Sequence]) -> None:
+        with self._revalidating_lock:
+            if endpoint in self._revalidating:
+                return
+            # Not a daemon, so a short CLI run still finishes the refresh after printing its results
+            thread = threading.Thread(target=self._revalidate, args=(endpoint, refresh),
+                                      name=f"revalidate-{endpoint}")
+            self._revalidating[endpoint] = thread
+        logger.info(f"Serving stale {endpoint} while refreshing it in the background")
+        thread.start()
+    
+    def _revalidate(self, endpoint: str, refresh: Callable[[], Sequence]) -> None:
+        try:
+            self._locked_refresh(endpoint, refresh)
+        except Exception as e:
+            logger.error(f"Background refresh of {endpoint} failed: {e}")
+        finally:
+            with self._revalidating_lock:
+                self._revalidating.pop(endpoint, None)
+    
+    def wait_for_revalidation(self, timeout: Optional[float] = None) -> None:
+        """Block until background refreshes started so far have finished"""
+        with self._revalidating_lock:
+            threads = list(self._revalidating.values())
+        for thread in threads:
+            thread.join(timeout)
+    
+    def _locked_refresh(self, endpoint: str, refresh: Callable[[], Sequence]) -> Sequence:
+        """Run refresh holding the endpoint's lock, so concurrent processes refresh it only once"""
+        cached, lock = self._begin_refresh(endpoint)
+        if lock is None:
+            return cached
+        try:
+            return refresh()
+        finally:
+            lock.release()
+    
+    def _begin_refresh(self, endpoint: str) -> Tuple[Optional[Sequence], Optional[FileLock]]:
+        """Take the endpoint's refresh lock, unless another process makes fetching unnecessary.
+
+        A process that finds the lock taken serves the previous snapshot when
+        there is one, and otherwise waits for the refresh and reads its result.
+        Returns that result, or the held lock for the caller to fetch under
+        and release.
+        """
+        cache_path = self._get_cache_path(endpoint)
+        requested_at = time.time()
+        lock = FileLock(self._get_lock_path(endpoint))
         
-        return launches
+        if not lock.acquire(blocking=False):
+            cached = self._load_collection(endpoint) if cache_path.exists() else None
+            if cached:
+                logger.info(f"{endpoint} is being refreshed by another process, serving the previous copy")
+                return cached, None
+            logger.info(f"Waiting for another process to refresh {endpoint}")
+            if not lock.acquire(timeout=self.LOCK_TIMEOUT):
+                logger.warning(f"Timed out waiting for the {endpoint} lock, refreshing without it")
+        
+        try:
+            if cache_path.exists() and cache_path.stat().st_mtime >= requested_at:
+                cached = self._load_collection(endpoint)
+                if cached:
+                    lock.release()
+                    return cached, None
+        except BaseException:
+            lock.release()
+            raise
+        return None, lock
     
-    def get_rockets(self, force_refresh: bool) -> List[Rocket]:
-        cache_path = self._get_cache_path("rockets")
+    def _prepare_validators(self, validators: Dict[str, "Validators"], endpoint: str) -> None:
+        """Set a client's validators so the next fetch revalidates the cached copy, if it still exists"""
+        stored = self._load_validators(endpoint) if self._get_cache_path(endpoint).exists() else None
+        if stored:
+            validators[endpoint] = stored
+        else:
+            validators.pop(endpoint, None)
+    
+    def _refresh_collection(self, endpoint: str) -> Sequence:
+        from .api_client import APIError, NotModified
         
-        if not force_refresh and self._is_cache_valid(cache_path):
-            cached_data = self._load_from_cache(cache_path)
-            if cached_data:
-                return [Rocket(**rocket) for rocket in cached_data]
+        client = self.api_client
+        fetch = getattr(client, self.FETCHERS[endpoint])
+        validators_after = lambda: client.validators.get(endpoint)
         
-        rockets = self.api_client.get_all_rockets()
+        # Revalidate the stored copy instead of downloading it again when possible
+        self._prepare_validators(client.validators, endpoint)
         
-        rockets_dict = [rocket.__dict__ for rocket in rockets]
-        self._save_to_cache(cache_path, rockets_dict)
+        try:
+            try:
+                return self._store_collection(endpoint, fetch(), validators_after)
+            except NotModified:
+                cached = self._serve_not_modified(endpoint)
+                if cached:
+                    return cached
+                client.validators.pop(endpoint, None)
+                return self._store_collection(endpoint, fetch(), validators_after)
+        except APIError as e:
+            return self._serve_after_failure(endpoint, e)
+    
+    def _serve_not_modified(self, endpoint: str) -> Optional[Sequence]:
+        """The cached copy after the API confirmed it is current, or None if it cannot be read"""
+        cache_path = self._get_cache_path(endpoint)
+        cached = self.serializer.load(cache_path, self.MODELS[endpoint])
+        if cached:
+            logger.info(f"{endpoint} not modified, renewing cache")
+            self._renew(cache_path)
+            self._clear_failure(endpoint)
+        return cached
+    
+    def _serve_after_failure(self, endpoint: str, error: Exception) -> Sequence:
+        self._record_failure(endpoint, error)
+        # A stale copy is more useful than no data while the upstream is failing
+        cache_path = self._get_cache_path(endpoint)
+        cached = self.serializer.load(cache_path, self.MODELS[endpoint]) if cache_path.exists() else None
+        if not cached:
+            raise error
+        logger.warning(f"Serving stale {endpoint} from cache, the API is unavailable")
+        return cached
+    
+    def _store_collection(self, endpoint: str, items: Iterable[Any],
+                          validators: Callable[[], Optional["Validators"]]) -> Sequence:
+        """Replace an endpoint's cache with fetched items and bring everything derived from it up to date.
+
+        validators is called once every item has been written, since a
+        streamed response only knows them after its body has been read.
+        """
+        cache_path = self._get_cache_path(endpoint)
+        baseline: List[Any] = []
+        if endpoint == "launches":
+            # Read what the old file contributes to the statistics once the new one is sure to replace it
+            items = _on_first(items, lambda: baseline.append(self._aggregate_baseline()))
         
-        return rockets
+        count = self._write_collection(cache_path, items)
+        self._save_validators(endpoint, validators())
+        self._clear_failure(endpoint)
+        self._lookups[endpoint].clear()
+        if endpoint == "launches":
+            self._update_aggregate(baseline[0] if baseline else None)
+            self.queries.clear()
+        self._evict(keep=endpoint)
+        logger.info(f"Cached {count} {endpoint}")
+        
+        items = self.serializer.load(cache_path, self.MODELS[endpoint])
+        if items is None:
+            raise IOError(f"Could not read back the {endpoint} cache")
+        return items
     
-    def get_launchpads(self, force_refresh: bool) -> List[Launchpad]:
-        cache_path = self._get_cache_path("launchpads")
+    def _load_aggregate(self, version: Optional[str] = None) -> Optional[LaunchAggregate]:
+        """The persisted statistics of the given launches version, by default the cached one"""
+        aggregate_path = self._get_aggregate_path()
+        data = self._load_from_cache(aggregate_path) if aggregate_path.exists() else None
+        version = version or self.serializer.version(self._get_cache_path("launches"))
+        if not data or version is None or data.get('version') != version:
+            return None
+        return LaunchAggregate.from_dict(data['aggregate'])
+    
+    def _aggregate_baseline(self) -> Optional[Tuple[LaunchAggregate, Dict[str, Any]]]:
+        cache_path = self._get_cache_path("launches")
+        if not cache_path.exists():
+            # First fetch: nothing to start from, and loading would report a missing file as corrupt
+            return None
+        launches = self.serializer.load(cache_path, Launch)
+        version = self.data_version(launches)
+        aggregate = self._load_aggregate(version) if version else None
+        return (aggregate, contributions(launches)) if aggregate is not None else None
+    
+    def _update_aggregate(self, baseline: Optional[Tuple[LaunchAggregate, Dict[str, Any]]]) -> None:
+        """Bring the persisted statistics up to date with the launches cache.
+
+        With a baseline (the previous aggregate and launch contributions), only
+        launches that were added, changed or removed are applied; otherwise the
+        aggregate is rebuilt from every cached launch.
+        """
+        launches = self.serializer.load(self._get_cache_path("launches"), Launch)
+        version = self.data_version(launches)
+        if version is None:
+            return
+        aggregate, before = baseline or (LaunchAggregate(), {})
+        aggregate.update(before, contributions(launches))
+        self._save_to_cache(self._get_aggregate_path(), {'version': version, 'aggregate': aggregate.to_dict()})
+    
+    def data_version(self, launches: Sequence) -> Optional[str]:
+        """Identifies the cached launches a sequence was loaded from, or None if it is not from the cache.
+
+        Results derived from the sequence are stored under this version, so
+        they never get attached to a newer file a refresh wrote meanwhile.
+        """
+        return getattr(launches, 'version', None)
+    
+    def get_launch_aggregate(self) -> Optional[LaunchAggregate]:
+        """Statistics of every cached launch, read without scanning the launches when they are up to date"""
+        aggregate = self._load_aggregate()
+        if aggregate is None:
+            self._update_aggregate(None)
+            aggregate = self._load_aggregate()
+        return aggregate
+    
+    def _evict(self, keep: str) -> None:
+        """Delete the least recently refreshed endpoints until the cache directory fits max_cache_bytes"""
+        if self.max_cache_bytes is None:
+            return
         
-        if not force_refresh and self._is_cache_valid(cache_path):
-            cached_data = self._load_from_cache(cache_path)
-            if cached_data:
-                return [Launchpad(**launchpad) for launchpad in cached_data]
+        groups: Dict[str, List[Tuple[Path, os.stat_result]]] = {}
+        for path in self.cache_dir.iterdir():
+            # Lock files must outlive their holders, and temporary files belong to running writes
+            if path.suffix in ('.lock', '.tmp'):
+                continue
+            try:
+                groups.setdefault(path.name.split('.', 1)[0], []).append((path, path.stat()))
+            except FileNotFoundError:
+                continue
         
-        launchpads = self.api_client.get_all_launchpads()
+        total = sum(stat.st_size for files in groups.values() for _, stat in files)
+        by_age = sorted(groups, key=lambda key: max(stat.st_mtime for _, stat in groups[key]))
+        for key in by_age:
+            if total <= self.max_cache_bytes:
+                break
+            if key == keep.replace('/', '_'):
+                continue
+            for path, stat in groups[key]:
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= stat.st_size
+            logger.info(f"Evicted {key} to keep the cache under {self.max_cache_bytes} bytes")
+    
+    def _find_cached(self, endpoint: str, model: type, ids: List[str]) -> List[Any]:
+        cache_path = self._get_cache_path(endpoint)
+        if not self._is_servable(endpoint):
+            return []
+        records = self.serializer.load(cache_path, model)
+        if not records:
+            return []
+        if isinstance(records, (LazyRecords, SQLiteRecords)):
+            return records.by_ids(ids)
+        wanted = set(ids)
+        return [record for record in records if record.id in wanted]
+    
+    def _get_by_ids(self, endpoint: str, model: type, ids: List[str]) -> Dict[str, Any]:
+        """Resolve ids from memory, then the cache file, then one batched API query"""
+        ids = list(dict.fromkeys(ids))
+        found, missing = self._find_known(endpoint, model, ids)
+        fetched = self.api_client.get_by_ids(endpoint, model, missing) if missing else []
+        return self._add_fetched(endpoint, ids, found, fetched)
+    
+    def _find_known(self, endpoint: str, model: type, ids: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """The documents among ids found in memory or the cache file, and the ids left for the API"""
+        lookup = self._lookups[endpoint]
+        found = lookup.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            loaded = {item.id: item for item in self._find_cached(endpoint, model, missing)}
+            lookup.put_many(loaded)
+            found.update(loaded)
+            missing = [id for id in missing if id not in loaded]
+        if missing:
+            logger.info(f"Fetching {len(missing)} {endpoint} by id")
+        return found, missing
+    
+    def _add_fetched(self, endpoint: str, ids: List[str], found: Dict[str, Any],
+                     fetched: Iterable[Any]) -> Dict[str, Any]:
+        loaded = {item.id: item for item in fetched}
+        self._lookups[endpoint].put_many(loaded)
+        found.update(loaded)
+        # Unknown ids are left out
+        return {id: found[id] for id in ids if id in found}
+    
+    def get_launches_by_ids(self, ids: Iterable[str]) -> Dict[str, Launch]:
+        return self._get_by_ids("launches", Launch, list(ids))
+    
+    def get_rockets_by_ids(self, ids: Iterable[str]) -> Dict[str, Rocket]:
+        return self._get_by_ids("rockets", Rocket, list(ids))
+    
+    def get_launchpads_by_ids(self, ids: Iterable[str]) -> Dict[str, Launchpad]:
+        return self._get_by_ids("launchpads", Launchpad, list(ids))
+    
+    def _high_water_mark(self, launches: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        date_unix = flight_number = 0
+        for launch in launches:
+            if not launch.get('upcoming'):
+                # Past launches without a date or number cannot move the mark
+                date_unix = max(date_unix, launch.get('date_unix') or 0)
+                flight_number = max(flight_number, launch.get('flight_number') or 0)
+        return {'date_unix': date_unix, 'flight_number': flight_number}
+    
+    def _delta_query(self, high_water_mark: Dict[str, int]) -> Dict[str, Any]:
+        # Launches that were upcoming at the last sync keep a date_unix at or
+        # above the mark once they fly, so they are picked up by the date clause
+        return {"$or": [
+            {"upcoming": True},
+            {"date_unix": {"$gte": high_water_mark['date_unix']}},
+            {"flight_number": {"$gt": high_water_mark['flight_number']}},
+        ]}
+    
+    def _sync_launches(self, force_refresh: bool) -> List[Launch]:
+        """Refresh launches by merging only upcoming and recently changed ones into the cache"""
+        return self._get_collection("launches", force_refresh, self._merge_launches)
+    
+    def _merge_launches(self) -> Sequence:
+        cache_path = self._get_cache_path("launches")
+        sync_state_path = self._get_sync_state_path("launches")
+        
+        high_water_mark = self._load_from_cache(sync_state_path) if sync_state_path.exists() else None
+        # The delta never revisits older launches, so upstream corrections to them arrive with a full snapshot
+        full_sync_due = not high_water_mark or \
+            time.time() - high_water_mark.get('full_sync_at', 0) >= self.FULL_SYNC_INTERVAL
+        cached_data = self.serializer.load_records(cache_path) \
+            if not full_sync_due and cache_path.exists() else None
+        
+        if not cached_data:
+            # No baseline to merge into, or time for a full snapshot; start tracking from it
+            synced_at = time.time()
+            launches = self._refresh_collection("launches")
+            if not self._get_failure_path("launches").exists():
+                self._save_to_cache(sync_state_path, dict(
+                    self._high_water_mark(launch.to_dict() for launch in launches), full_sync_at=synced_at
+                ))
+            return launches
+        
+        from .api_client import APIError
+        
+        positions = {launch['id']: index for index, launch in enumerate(cached_data)}
+        seen = set()
+        try:
+            for page in self.api_client.query_launches(self._delta_query(high_water_mark)):
+                for launch in page:
+                    seen.add(launch.id)
+                    if launch.id in positions:
+                        cached_data[positions[launch.id]] = launch.to_dict()
+                    else:
+                        positions[launch.id] = len(cached_data)
+                        cached_data.append(launch.to_dict())
+        except APIError as e:
+            # Drop the partial merge and keep serving the last complete sync
+            self._record_failure("launches", e)
+            logger.warning("Serving stale launches from cache, the API is unavailable")
+            return self.serializer.load(cache_path, Launch)
         
-        launchpads_dict = [launchpad.__dict__ for launchpad in launchpads]
-        self._save_to_cache(cache_path, launchpads_dict)
+        # Every launch still upcoming is part of the delta, so cached upcoming
+        # launches that did not come back were removed upstream
+        cached_data = [launch for launch in cached_data
+                       if launch['id'] in seen or not launch.get('upcoming')]
+        logger.info(f"Synced {len(seen)} changed launches into {len(cached_data)} cached")
         
-        return launchpads
+        baseline = self._aggregate_baseline()
+        # Unlike dump(), a failed write raises here, before anything derived from the cache moves on
+        with self.serializer.writer(cache_path) as writer:
+            for launch in cached_data:
+                writer.write(launch)
+        self._clear_failure("launches")
+        self._lookups["launches"].clear()
+        self._update_aggregate(baseline)
+        self.queries.clear()
+        self._evict(keep="launches")
+        # The merged file no longer matches the full collection's validators
+        self._save_validators("launches", None)
+        self._save_to_cache(sync_state_path, dict(self._high_water_mark(cached_data),
+                                                  full_sync_at=high_water_mark['full_sync_at']))
+        
+        launches = self.serializer.load(cache_path, Launch)
+        if launches is None:
+            raise IOError("Could not read back the launches cache")
+        return launches
+    
+    def get_launches(self, force_refresh: bool, incremental: bool = False) -> List[Launch]:
+        if incremental:
+            return self._sync_launches(force_refresh)
+        return self._get_collection("launches", force_refresh)
+    
+    def get_rockets(self, force_refresh: bool) -> List[Rocket]:
+        return self._get_collection("rockets", force_refresh)
+    
+    def get_launchpads(self, force_refresh: bool) -> List[Launchpad]:
+        return self._get_collection("launchpads", force_refresh)
+    
+    def get_all(self, force_refresh: bool = False, max_workers: Optional[int] = None,
+                incremental: bool = False) -> Tuple[List[Launch], List[Rocket], List[Launchpad]]:
+        """Load launches, rockets and launchpads concurrently.
+
+        Each collection is loaded on its own worker thread so a cold or forced
+        refresh costs roughly the slowest request instead of the sum of all three.
+        Failures are collected per endpoint and raised together as CacheLoadError.
+        """
+        loaders = {
+            "launches": partial(self.get_launches, incremental=incremental),
+            "rockets": self.get_rockets,
+            "launchpads": self.get_launchpads,
+        }
+        workers = max(1, min(max_workers or self.MAX_WORKERS, len(loaders)))
+
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+
+        def collect(endpoint: str, load: Callable[[], Any]) -> None:
+            try:
+                results[endpoint] = load()
+            except Exception as e:
+                logger.error(f"Error loading {endpoint}: {e}")
+                errors[endpoint] = e
+
+        if not force_refresh and all(self._is_servable(endpoint) for endpoint in loaders):
+            # Warm start: every load is a local read, which is not worth a thread pool
+            for endpoint, loader in loaders.items():
+                collect(endpoint, partial(loader, force_refresh))
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {endpoint: executor.submit(loader, force_refresh)
+                           for endpoint, loader in loaders.items()}
+                for endpoint, future in futures.items():
+                    collect(endpoint, future.result)
 
+        if errors:
+            raise CacheLoadError(errors)
 
+        return results["launches"], results["rockets"], results["launchpads"]
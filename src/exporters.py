@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+import sys
+from contextlib import ExitStack, contextmanager
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union, get_args, get_origin
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class Exporter:
+    """Writes records to a binary stream one at a time"""
+    name = ""
+    suffix = ""
+    # Text formats are written through a UTF-8 wrapper and compressed as a byte stream
+    text = True
+
+    def __init__(self, compression: Optional[str] = None, model: Optional[type] = None):
+        self.compression = compression
+        # The dataclass the records come from, if known, so typed formats can fix their schema up front
+        self.model = model
+
+    def write(self, stream: IO, records: Iterable[Dict[str, Any]]) -> int:
+        raise NotImplementedError
+
+
+class JSONExporter(Exporter):
+    """A single indented JSON array, as the original export wrote it"""
+    name = "json"
+    suffix = ".json"
+
+    def write(self, stream: IO, records: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        stream.write("[")
+        for record in records:
+            stream.write(",\n" if count else "\n")
+            stream.write("  " + json.dumps(record, indent=2, default=str).replace("\n", "\n  "))
+            count += 1
+        stream.write("\n]" if count else "]")
+        return count
+
+
+class NDJSONExporter(Exporter):
+    """One compact JSON document per line"""
+    name = "ndjson"
+    suffix = ".ndjson"
+
+    def write(self, stream: IO, records: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for record in records:
+            stream.write(json.dumps(record, default=str, separators=(',', ':')))
+            stream.write("\n")
+            count += 1
+        return count
+
+
+class CSVExporter(Exporter):
+    """One row per record, with nested values written as JSON instead of Python reprs"""
+    name = "csv"
+    suffix = ".csv"
+
+    def write(self, stream: IO, records: Iterable[Dict[str, Any]]) -> int:
+        writer = csv.writer(stream)
+        header: Optional[List[str]] = None
+        count = 0
+        for record in records:
+            if header is None:
+                header = list(record)
+                writer.writerow(header)
+            writer.writerow([_cell(record.get(name)) for name in header])
+            count += 1
+        return count
+
+
+class ParquetExporter(Exporter):
+    """Apache Parquet for analytics tools, written in bounded row groups (requires pyarrow)"""
+    name = "parquet"
+    suffix = ".parquet"
+    text = False
+    ROW_GROUP_SIZE = 10000
+
+    def __init__(self, compression: Optional[str] = None, model: Optional[type] = None):
+        super().__init__(compression, model)
+        # Fail before the output file is created
+        _require("pyarrow", "Parquet export")
+
+    def write(self, stream: IO, records: Iterable[Dict[str, Any]]) -> int:
+        """Write records with the model's field types, or else the types found in the first row group.
+
+        Nested values, and any value in a column typed as text, are written as
+        JSON text.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        schema = _arrow_schema(pa, self.model) if self.model else None
+        # Columns holding JSON text
+        untyped: set = set()
+        batch: List[Dict[str, Any]] = []
+        count = 0
+
+        def cell(name: str, value: Any) -> Any:
+            if value is None:
+                return None
+            if isinstance(value, (dict, list)) or (name in untyped and not isinstance(value, str)):
+                return json.dumps(value, default=str)
+            return value
+
+        def flush():
+            nonlocal writer, schema
+            if schema is None:
+                # Columns with no values in the first row group cannot be typed, so they hold JSON text
+                inferred = pa.Table.from_pylist([{name: cell(name, value) for name, value in record.items()}
+                                                 for record in batch]).schema
+                schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                    for field in inferred])
+            if writer is None:
+                untyped.update(field.name for field in schema if pa.types.is_string(field.type))
+                writer = pq.ParquetWriter(stream, schema, compression=self.compression or 'snappy')
+            rows = [{name: cell(name, value) for name, value in record.items()} for record in batch]
+            try:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise RuntimeError(f"Records {count - len(batch) + 1}-{count} do not match the Parquet schema: {e}")
+            batch.clear()
+
+        try:
+            for record in records:
+                batch.append(record)
+                count += 1
+                if len(batch) >= self.ROW_GROUP_SIZE:
+                    flush()
+            if batch:
+                flush()
+        finally:
+            # Also on failure, so the writer never outlives the stream it writes to
+            if writer is not None:
+                writer.close()
+        return count
+
+
+def _arrow_type(pa: Any, annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        # Optional[X] is X, and columns are nullable anyway
+        types = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = types[0] if len(types) == 1 else Any
+    scalars = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+    # Lists, dicts and anything else are written as JSON text
+    return scalars.get(annotation, pa.string())
+
+
+def _arrow_schema(pa: Any, model: type) -> Any:
+    return pa.schema([(field.name, _arrow_type(pa, field.type)) for field in fields(model)])
+
+
+EXPORTERS = {
+    exporter.name: exporter
+    for exporter in (JSONExporter, NDJSONExporter, CSVExporter, ParquetExporter)
+}
+
+
+def _require(module: str, feature: str) -> Any:
+    import importlib
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise RuntimeError(f"{feature} requires {module} (pip install {module})")
+
+
+def _compressor(compression: Optional[str]) -> Optional[Callable[[IO], IO]]:
+    if compression is None:
+        return None
+    if compression == "gzip":
+        import gzip
+        return lambda raw: gzip.GzipFile(fileobj=raw, mode='wb')
+    if compression == "zstd":
+        zstandard = _require("zstandard", "zstd compression")
+        return lambda raw: zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str, separators=(',', ':'))
+    return value
+
+
+def default_path(format: str, compression: Optional[str] = None) -> Path:
+    suffix = EXPORTERS[format].suffix
+    if compression and EXPORTERS[format].text:
+        suffix += COMPRESSION_SUFFIXES[compression]
+    return Path(f"spacex_launches_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}")
+
+
+@contextmanager
+def open_output(path: Optional[Path], compression: Optional[str] = None, text: bool = True) -> Iterator[IO]:
+    """Open a file, or stdout for None, optionally compressed, as a text or binary stream"""
+    compressor = _compressor(compression)
+    with ExitStack() as stack:
+        if path is None:
+            raw: IO = sys.stdout.buffer
+            stack.callback(raw.flush)
+        else:
+            raw = stack.enter_context(open(path, 'wb'))
+        if compressor:
+            raw = stack.enter_context(compressor(raw))
+
+        if not text:
+            yield raw
+            return
+
+        wrapper = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        try:
+            yield wrapper
+            wrapper.flush()
+        finally:
+            # Leave the underlying stream to the exit stack (stdout must stay open)
+            wrapper.detach()
+
+
+def export(records: Iterable[Dict[str, Any]], format: str, path: Optional[Path] = None,
+           compression: Optional[str] = None, model: Optional[type] = None) -> int:
+    """Stream records to path (stdout when None) and return how many were written.
+
+    model is the dataclass the records were converted from, if any. A failed
+    export removes the partly written file.
+    """
+    exporter = EXPORTERS[format](compression, model)
+    try:
+        # Binary formats like Parquet compress their own pages instead of the whole file
+        with open_output(path, compression if exporter.text else None, exporter.text) as stream:
+            return exporter.write(stream, records)
+    except BaseException:
+        if path is not None and path.exists():
+            path.unlink()
+        raise
@@ -0,0 +1,115 @@
+from datetime import datetime, date
+from itertools import islice
+from typing import List, Dict, Any, Optional, Sequence
+
+from .frame import LaunchFrame
+from .metrics import METRICS
+from .models import Launch
+from .serializers import LazyRecords, SQLiteRecords
+from .util import launch_timestamp, unix_bounds
+
+def filter_by_date_range(launches: List[Launch], start_date: date, end_date: date) -> List[Launch]:
+    start, end = unix_bounds(start_date, end_date)
+    return [launch for launch in launches
+            if start <= launch_timestamp(launch.date_unix, launch.date_utc) < end]
+
+
+def filter_by_rocket(launches: List[Launch], rocket_id: str) -> List[Launch]:
+    return [launch for launch in launches if launch.rocket == rocket_id]
+
+
+def filter_by_success(launches: List[Launch], success: bool) -> List[Launch]:
+    return [launch for launch in launches if launch.success == success and not launch.upcoming]
+
+
+def filter_by_launchpad(launches: List[Launch], launchpad_id: str) -> List[Launch]:
+    return [launch for launch in launches if launch.launchpad == launchpad_id]
+
+
+def filter_upcoming(launches: List[Launch]) -> List[Launch]:
+    return [launch for launch in launches if launch.upcoming]
+
+
+def filter_completed(launches: List[Launch]) -> List[Launch]:
+    return [launch for launch in launches if not launch.upcoming]
+
+def build_filters(rocket_id: Optional[str] = None, success: Optional[str] = None,
+                  launchpad_id: Optional[str] = None, upcoming: bool = False,
+                  start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, Any]:
+    """Turn CLI or query-string filter values into apply_filters keyword arguments"""
+    filter_args = {}
+    if rocket_id:
+        filter_args['rocket_id'] = rocket_id
+    if success:
+        filter_args['success'] = success.lower() == "true"
+    if launchpad_id:
+        filter_args['launchpad_id'] = launchpad_id
+    if upcoming:
+        filter_args['upcoming'] = True
+    if start_date and end_date:
+        filter_args['start_date'] = datetime.strptime(start_date, "%Y-%m-%d").date()
+        filter_args['end_date'] = datetime.strptime(end_date, "%Y-%m-%d").date()
+    return filter_args
+
+@METRICS.timed("filter_seconds")
+def apply_filters(launches: List[Launch], **filters) -> List[Launch]:
+    if isinstance(launches, SQLiteRecords):
+        return launches.query(**filters)
+    if isinstance(launches, LaunchFrame):
+        return launches.filter(**filters)
+    
+    # Filter lazily loaded launches through row views so only the survivors
+    # are materialized as Launch objects
+    lazy = isinstance(launches, LazyRecords)
+    filtered_launches = launches.views() if lazy else launches
+    if 'start_date' in filters and 'end_date' in filters:
+        filtered_launches = filter_by_date_range(
+            filtered_launches, filters['start_date'], filters['end_date']
+        )
+    if 'rocket_id' in filters:
+        filtered_launches = filter_by_rocket(
+            filtered_launches, filters['rocket_id']
+        )
+    if 'success' in filters:
+        filtered_launches = filter_by_success(
+            filtered_launches, filters['success']
+        )
+    if 'launchpad_id' in filters:
+        filtered_launches = filter_by_launchpad(
+            filtered_launches, filters['launchpad_id']
+        )
+
+    if 'upcoming' in filters and filters['upcoming']:
+        filtered_launches = filter_upcoming(filtered_launches)
+    return launches.materialize(filtered_launches) if lazy else filtered_launches
+
+def page_launches(launches: Sequence[Launch], sort: Optional[str] = None, descending: bool = False,
+                  offset: int = 0, limit: Optional[int] = None) -> Sequence[Launch]:
+    """Order launches by date or flight number and keep one page of them.
+
+    Frames order and slice their columns and columnar records decode only
+    the rows on the page, so launches outside it are never materialized.
+    """
+    stop = None if limit is None else offset + limit
+    if not sort and offset == 0 and stop is None:
+        return launches
+    if isinstance(launches, LaunchFrame):
+        if sort:
+            launches = launches.order_by(sort, descending, stop)
+        if offset == 0 and (stop is None or stop >= len(launches)):
+            return launches
+        end = len(launches) if stop is None else min(stop, len(launches))
+        return launches.subset(range(min(offset, end), end))
+    if sort:
+        key = {
+            'date': lambda launch: launch_timestamp(launch.date_unix, launch.date_utc),
+            'flight': lambda launch: launch.flight_number or 0,
+        }[sort]
+        launches = sorted(launches, key=key)
+        if descending:
+            launches.reverse()
+        return launches[offset:stop]
+    if isinstance(launches, LazyRecords):
+        end = len(launches) if stop is None else min(stop, len(launches))
+        return launches.take(range(min(offset, end), end))
+    return list(islice(launches, offset, stop))
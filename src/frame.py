@@ -0,0 +1,364 @@
+import heapq
+import operator
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Sequence
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .aggregate import LaunchAggregate
+from .models import Launch
+from .util import launch_day, launch_timestamp, unix_bounds
+
+# Tri-state encoding for Launch.success
+SUCCESS_UNKNOWN, SUCCESS_FALSE, SUCCESS_TRUE = 2, 0, 1
+
+# Fields launches can be ordered by, and the columns holding them
+ORDER_COLUMNS = {'date': 'timestamp', 'flight': 'flight'}
+
+
+class _Codes:
+    """Dictionary encoding of a string field shared by a frame and its subsets"""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+
+    def encode(self, values: List[Any]) -> Any:
+        codes = self.codes
+        encoded = [codes.setdefault(value, len(codes)) for value in values]
+        self.values = list(codes)
+        # Few distinct values fit in bytes, which gives C-speed equality masks via translate
+        return bytes(encoded) if len(codes) <= 256 else array('L', encoded)
+
+    def mask(self, column: Any, value: Any) -> bytes:
+        code = self.codes.get(value)
+        if code is None:
+            return bytes(len(column))
+        if isinstance(column, bytes):
+            table = bytearray(256)
+            table[code] = 1
+            return column.translate(table)
+        return bytes(item == code for item in column)
+
+
+def _and(left: bytes, right: bytes) -> bytes:
+    """Combine two 0/1 byte masks with a single big-integer AND"""
+    return (int.from_bytes(left, 'little') & int.from_bytes(right, 'little')).to_bytes(len(left), 'little')
+
+
+def _select(column: Any, mask: bytes) -> Any:
+    if isinstance(column, (bytes, bytearray)):
+        return bytes(compress(column, mask))
+    return array(column.typecode, compress(column, mask))
+
+
+# Candidate rows, a selector giving a truth value for each of a list of rows,
+# and whether the candidates are in row order
+Predicate = Tuple[Any, Callable[[Any], Iterable[Any]], bool]
+
+
+def _take(column: Any, rows: Any) -> Any:
+    if isinstance(column, (bytes, bytearray)):
+        return bytes(map(column.__getitem__, rows))
+    return array(column.typecode, map(column.__getitem__, rows))
+
+
+def _postings(column: Any) -> Dict[int, array]:
+    postings: Dict[int, array] = {}
+    for row, code in enumerate(column):
+        rows = postings.get(code)
+        if rows is None:
+            rows = postings[code] = array('l')
+        rows.append(row)
+    return postings
+
+
+def _flagged(mask: bytes) -> array:
+    return array('l', compress(range(len(mask)), mask))
+
+
+class LaunchIndex:
+    """Hash and range indexes over a full frame, built once and shared by every query.
+
+    Rocket, launchpad and outcome values map to ascending row lists, and the
+    timestamps are kept sorted with their rows for bisect range lookups. A
+    query starts from the smallest candidate list and narrows it with the
+    remaining filters looked up in the frame's columns, so its cost grows
+    with the most selective filter instead of the number of launches.
+    """
+
+    def __init__(self, frame: "LaunchFrame"):
+        columns = frame._columns
+        self._columns = columns
+        self._codes = frame._codes
+        self._size = len(frame)
+        self._by_code = {name: _postings(columns[name]) for name in ('rocket', 'launchpad')}
+        table = bytearray(256)
+        table[SUCCESS_UNKNOWN] = 1
+        self._unknown = _and(columns['completed'], columns['success'].translate(table))
+        self._by_state = {
+            'succeeded': _flagged(columns['succeeded']),
+            'failed': _flagged(columns['failed']),
+            'unknown': _flagged(self._unknown),
+            'upcoming': _flagged(columns['upcoming']),
+        }
+        timestamps = columns['timestamp']
+        order = sorted(range(self._size), key=timestamps.__getitem__)
+        self._time_rows = array('l', order)
+        self._times = array('q', map(timestamps.__getitem__, order))
+        self._orders = {'date': self._time_rows}
+
+    def order(self, field: str) -> array:
+        """All rows sorted by an ORDER_COLUMNS field, ties in row order; computed once per field"""
+        rows = self._orders.get(field)
+        if rows is None:
+            column = self._columns[ORDER_COLUMNS[field]]
+            rows = self._orders[field] = array('l', sorted(range(self._size), key=column.__getitem__))
+        return rows
+
+    def _code(self, name: str, value: Any) -> Predicate:
+        code = self._codes[name].codes.get(value)
+        column = self._columns[name]
+        # Built from bound methods so the selection loops stay in C
+        return self._by_code[name].get(code, ()), lambda rows: map(code.__eq__, map(column.__getitem__, rows)), True
+
+    def _state(self, state: str) -> Predicate:
+        mask = self._unknown if state == 'unknown' else self._columns[state]
+        return self._by_state[state], lambda rows: map(mask.__getitem__, rows), True
+
+    def _predicates(self, filters: Dict[str, Any]) -> List[Predicate]:
+        predicates = []
+        if 'start_date' in filters and 'end_date' in filters:
+            start, end = unix_bounds(filters['start_date'], filters['end_date'])
+            low, high = bisect_left(self._times, start), bisect_left(self._times, end)
+            timestamps = self._columns['timestamp']
+            # Rows of a date range come in time order, not in their original order
+            within = lambda rows: map(bool.__and__, map(start.__le__, map(timestamps.__getitem__, rows)),
+                                      map(end.__gt__, map(timestamps.__getitem__, rows)))
+            predicates.append((self._time_rows[low:high], within, False))
+        if 'rocket_id' in filters:
+            predicates.append(self._code('rocket', filters['rocket_id']))
+        if 'success' in filters:
+            success = filters['success']
+            if success is None:
+                predicates.append(self._state('unknown'))
+            elif success == True:
+                predicates.append(self._state('succeeded'))
+            elif success == False:
+                predicates.append(self._state('failed'))
+            else:
+                predicates.append(((), lambda rows: (False for _ in rows), True))
+        if 'launchpad_id' in filters:
+            predicates.append(self._code('launchpad', filters['launchpad_id']))
+        if 'upcoming' in filters and filters['upcoming']:
+            predicates.append(self._state('upcoming'))
+        return predicates
+
+    def rows(self, **filters) -> Any:
+        """Rows matching apply_filters keyword arguments, in their original order"""
+        predicates = self._predicates(filters)
+        if not predicates:
+            return range(self._size)
+        predicates.sort(key=lambda predicate: len(predicate[0]))
+        rows, _, ordered = predicates[0]
+        for _, select, _ in predicates[1:]:
+            rows = list(compress(rows, select(rows)))
+        if not ordered:
+            rows = sorted(rows)
+        return array('l', rows)
+
+
+class LaunchFrame(Sequence):
+    """Columnar view over a launch list for vectorized filtering and statistics.
+
+    The hot fields are stored as parallel columns: dictionary-encoded rocket,
+    launchpad and year-month codes, launch timestamps and years, and 0/1
+    byte masks for the success and upcoming states. Filters combine masks
+    and return a frame over the surviving rows; Launch objects are only taken
+    from the source when the frame is iterated.
+    """
+
+    def __init__(self, source: Sequence, rows: Any, columns: Dict[str, Any],
+                 codes: Dict[str, _Codes]):
+        self._source = source
+        self._rows = rows
+        self._columns = columns
+        self._codes = codes
+        self._index: Optional[LaunchIndex] = None
+        # The indexed frame a filter result came from, whose index can also order it
+        self._base: Optional[LaunchFrame] = None
+
+    @classmethod
+    def from_launches(cls, launches: Sequence, indexed: bool = False) -> "LaunchFrame":
+        """Build the columns, and with indexed a LaunchIndex for processes that filter repeatedly"""
+        if isinstance(launches, cls):
+            if indexed:
+                launches.build_index()
+            return launches
+        if hasattr(launches, 'column'):
+            field = launches.column
+        else:
+            field = lambda name: [getattr(launch, name) for launch in launches]
+
+        date_unix, date_utc = field('date_unix'), field('date_utc')
+        days = [launch_day(*values) for values in zip(date_unix, date_utc)]
+        success = [SUCCESS_UNKNOWN if value is None else int(bool(value)) for value in field('success')]
+        upcoming = bytes(int(bool(value)) for value in field('upcoming'))
+        completed = upcoming.translate(bytes([1, 0]) + bytes(254))
+
+        codes = {name: _Codes() for name in ('rocket', 'launchpad', 'month')}
+        columns = {
+            'rocket': codes['rocket'].encode(field('rocket')),
+            'launchpad': codes['launchpad'].encode(field('launchpad')),
+            'month': codes['month'].encode([month for _, month in days]),
+            'timestamp': array('q', [launch_timestamp(*values) for values in zip(date_unix, date_utc)]),
+            'year': array('l', [day.year for day, _ in days]),
+            'flight': array('q', [number or 0 for number in field('flight_number')]),
+            'upcoming': upcoming,
+            'completed': completed,
+            'success': bytes(success),
+        }
+        columns['succeeded'] = _and(completed, bytes(value == SUCCESS_TRUE for value in success))
+        columns['failed'] = _and(completed, bytes(value == SUCCESS_FALSE for value in success))
+        columns['decided'] = _and(completed, bytes(value != SUCCESS_UNKNOWN for value in success))
+        frame = cls(launches, array('l', range(len(launches))), columns, codes)
+        if indexed:
+            frame.build_index()
+        return frame
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._source[row] for row in self._rows[index]]
+        return self._source[self._rows[index]]
+
+    def __iter__(self) -> Iterator[Launch]:
+        if hasattr(self._source, 'take'):
+            # Materialize in batches so iterating never holds a second copy of the launches
+            rows, take, size = self._rows, self._source.take, self._source.BATCH_SIZE
+            return (launch for start in range(0, len(rows), size) for launch in take(rows[start:start + size]))
+        source = self._source
+        return (source[row] for row in self._rows)
+
+    def to_list(self) -> List[Launch]:
+        return list(self)
+
+    def positions(self) -> array:
+        """Positions of the frame's launches in the sequence it was built from"""
+        return array('l', self._rows)
+
+    def build_index(self) -> LaunchIndex:
+        if self._index is None:
+            self._index = LaunchIndex(self)
+        return self._index
+
+    def where(self, mask: bytes) -> "LaunchFrame":
+        """Return the frame restricted to rows whose mask byte is 1"""
+        columns = {name: _select(column, mask) for name, column in self._columns.items()}
+        return LaunchFrame(self._source, _select(self._rows, mask), columns, self._codes)
+
+    def mask(self, **filters) -> bytes:
+        """Compile apply_filters keyword arguments into a single 0/1 row mask"""
+        masks = []
+        if 'start_date' in filters and 'end_date' in filters:
+            start, end = unix_bounds(filters['start_date'], filters['end_date'])
+            masks.append(bytes(start <= timestamp < end for timestamp in self._columns['timestamp']))
+        if 'rocket_id' in filters:
+            masks.append(self._codes['rocket'].mask(self._columns['rocket'], filters['rocket_id']))
+        if 'success' in filters:
+            masks.append(self._success_mask(filters['success']))
+        if 'launchpad_id' in filters:
+            masks.append(self._codes['launchpad'].mask(self._columns['launchpad'], filters['launchpad_id']))
+        if 'upcoming' in filters and filters['upcoming']:
+            masks.append(self._columns['upcoming'])
+
+        combined = b"\x01" * len(self)
+        for mask in masks:
+            combined = _and(combined, mask)
+        return combined
+
+    def _success_mask(self, success: Optional[bool]) -> bytes:
+        if success is None:
+            table = bytearray(256)
+            table[SUCCESS_UNKNOWN] = 1
+            return _and(self._columns['completed'], self._columns['success'].translate(table))
+        if success == True:
+            return self._columns['succeeded']
+        if success == False:
+            return self._columns['failed']
+        return bytes(len(self))
+
+    def subset(self, positions: Any) -> "LaunchFrame":
+        """Return the frame restricted to the given positions, in that order"""
+        columns = {name: _take(column, positions) for name, column in self._columns.items()}
+        return LaunchFrame(self._source, _take(self._rows, positions), columns, self._codes)
+
+    def filter(self, **filters) -> "LaunchFrame":
+        if self._index is not None:
+            result = self.subset(self._index.rows(**filters))
+            result._base = self
+            return result
+        return self.where(self.mask(**filters))
+
+    def _presorted(self, field: str) -> Any:
+        """Positions in ascending field order when they come without a comparison sort, else None"""
+        column = self._columns[ORDER_COLUMNS[field]]
+        if all(map(operator.le, column, column[1:])):
+            return range(len(self))
+        if self._index is not None:
+            return self._index.order(field)
+        base = self._base
+        if base is not None and len(self) * 8 >= len(base):
+            # Walking the index's order over the whole base is linear and stays in C
+            member = bytearray(len(base))
+            for row in self._rows:
+                member[row] = 1
+            order = base._index.order(field)
+            # Filter results list their base rows in ascending order, so a row's position is its rank
+            ranks = {row: position for position, row in enumerate(self._rows)}
+            return list(map(ranks.__getitem__, compress(order, map(member.__getitem__, order))))
+        return None
+
+    def order_by(self, field: str, descending: bool = False, limit: Optional[int] = None) -> "LaunchFrame":
+        """Return the frame ordered by date or flight number, keeping only the first limit launches.
+
+        Ties keep their order, and descending is the exact reverse. Launches
+        usually arrive in date and flight order, which one pass confirms;
+        otherwise an indexed frame (or a filter result of one) reuses the
+        index's order, and a limit selects with a heap instead of sorting.
+        """
+        positions = self._presorted(field)
+        if positions is None:
+            column = self._columns[ORDER_COLUMNS[field]]
+            if limit is not None and limit < len(self):
+                select = heapq.nlargest if descending else heapq.nsmallest
+                # Ties break on position, which keeps descending the exact reverse of ascending
+                return self.subset(select(limit, range(len(self)), key=lambda row: (column[row], row)))
+            positions = sorted(range(len(self)), key=column.__getitem__)
+        if descending:
+            positions = positions[::-1]
+        return self.subset(positions if limit is None else positions[:limit])
+
+    def _count_by(self, name: str, mask: bytes) -> Dict[Any, int]:
+        values = self._codes[name].values
+        counts = Counter(compress(self._columns[name], mask))
+        return {values[code]: count for code, count in counts.items()}
+
+    def aggregate(self) -> LaunchAggregate:
+        """Compute every statistic from the columns without touching Launch objects"""
+        completed = self._columns['completed']
+        return LaunchAggregate(
+            total_launches=completed.count(1),
+            successful_launches=self._columns['succeeded'].count(1),
+            failed_launches=self._columns['failed'].count(1),
+            upcoming_launches=self._columns['upcoming'].count(1),
+            rocket_totals=self._count_by('rocket', self._columns['decided']),
+            rocket_successes=self._count_by('rocket', self._columns['succeeded']),
+            site_counts=self._count_by('launchpad', completed),
+            yearly=dict(Counter(compress(self._columns['year'], completed))),
+            monthly=self._count_by('month', completed),
+        )
@@ -0,0 +1,95 @@
+import os
+import time
+from pathlib import Path
+from typing import IO, Any, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock, but can lock a byte range of the lock file instead
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Advisory, exclusive lock on a file shared by every process using the cache directory.
+
+    Locks are taken on a separate open file each time, so two FileLocks on the
+    same path exclude each other even within one process.
+    """
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: Optional[IO] = None
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Take the lock, waiting up to timeout seconds when blocking; return whether it was taken"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        file = open(self.path, 'a+b')
+        while True:
+            if _try_lock(file):
+                self._file = file
+                return True
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                file.close()
+                return False
+            time.sleep(self.POLL_INTERVAL)
+
+    def release(self) -> None:
+        if self._file is not None:
+            _unlock(self._file)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.release()
+
+
+def _try_lock(file: IO) -> bool:
+    try:
+        if fcntl:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(file: IO) -> None:
+    if fcntl:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def temp_path_for(path: Path) -> Path:
+    """Create an empty, uniquely named file next to path for writing its replacement"""
+    while True:
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+        try:
+            # Unlike mkstemp this keeps the umask permissions, so a shared cache stays readable
+            open(temp_path, 'x').close()
+            return temp_path
+        except FileExistsError:
+            continue
+
+
+def write_atomic(path: Path, data: Any, mode: str = 'w') -> None:
+    """Replace path with data in one step, so readers see either the old or the new file"""
+    temp_path = temp_path_for(path)
+    try:
+        with open(temp_path, mode) as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
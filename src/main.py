@@ -1,41 +1,65 @@
 import argparse
-from datetime import datetime, date
-from typing import List, Dict, Any
-from tabulate import tabulate
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import IO, Iterable, List, Dict, Any, Optional, Sequence
 import json
 
 from .cache_manager import CacheManager
+from .frame import ORDER_COLUMNS, LaunchFrame
 from .models import Launch, Rocket, Launchpad
-from .util import parse_date
-from .statistics import calculate_launch_frequency, calculate_success_rate_by_rocket, get_launch_statistics
+from .aggregate import LaunchAggregate
+from .metrics import METRICS
+from .filters import (
+    apply_filters, build_filters, filter_by_date_range, filter_by_launchpad, filter_by_rocket,
+    filter_by_success, filter_completed, filter_upcoming, page_launches
+)
+from .serializers import SQLiteRecords, SERIALIZERS, get_serializer
+from .statistics import aggregate_launches
+from .table import TABLE_FORMATS, render_table
+from .transport import TransportConfig
 
-cache_manager = CacheManager()
+_cache_manager: Optional[CacheManager] = None
 
-def display_launches(launches: List[Launch], rockets: List[Rocket], launchpads: List[Launchpad]) -> None:
-    """Display launches in a formatted table"""
+def get_cache_manager(**kwargs) -> CacheManager:
+    """Create the shared CacheManager on first use so importing this module has no side effects"""
+    global _cache_manager
+    if _cache_manager is None:
+        _cache_manager = CacheManager(**kwargs)
+    return _cache_manager
+
+def display_launches(launches: Sequence[Launch], rockets: List[Rocket], launchpads: List[Launchpad],
+                     table_format: str = "grid", out: Optional[IO[str]] = None) -> None:
+    """Display launches in a formatted table, writing rows as they are read"""
+    out = out or sys.stdout
     if not launches:
-        print("No launches found matching the criteria.")
+        print("No launches found matching the criteria.", file=out)
         return
     
     # Create mappings for IDs to names
     rocket_id_to_name = {rocket.id: rocket.name for rocket in rockets}
     launchpad_id_to_name = {launchpad.id: launchpad.name for launchpad in launchpads}
     
-    table_data = []
-    for launch in launches:
-        status = "Upcoming" if launch.upcoming else "Success" if launch.success else "Failure"
-        
-        table_data.append([
-            launch.flight_number,
-            launch.name,
-            launch.date_utc[:10],  # Just the date part
-            rocket_id_to_name.get(launch.rocket, launch.rocket),
-            launchpad_id_to_name.get(launch.launchpad, launch.launchpad),
-            status
-        ])
+    def rows() -> Iterable[List[Any]]:
+        for launch in launches:
+            status = "Upcoming" if launch.upcoming else "Success" if launch.success else "Failure"
+            yield [
+                launch.flight_number,
+                launch.name,
+                launch.date_utc[:10],  # Just the date part
+                rocket_id_to_name.get(launch.rocket, launch.rocket),
+                launchpad_id_to_name.get(launch.launchpad, launch.launchpad),
+                status
+            ]
     
     headers = ["Flight #", "Name", "Date", "Rocket", "Launch Site", "Status"]
-    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+    try:
+        out.writelines(line + "\n" for line in render_table(rows(), headers, table_format))
+        out.flush()
+    except BrokenPipeError:
+        # The reader (e.g. head) has all it wants; silence the error Python reports at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
 
 def display_statistics(statistics: Dict[str, Any]) -> None:
     """Display statistics in a formatted way"""
@@ -61,6 +85,7 @@ def display_success_rates(success_rates: Dict[str, Dict[str, Any]]) -> None:
             f"{stats['success_rate']:.2f}%"
         ])
     
+    from tabulate import tabulate
     headers = ["Rocket", "Total Launches", "Successful", "Success Rate"]
     print("\n=== SUCCESS RATES BY ROCKET ===")
     print(tabulate(table_data, headers=headers, tablefmt="grid"))
@@ -84,89 +109,66 @@ def display_launch_frequency(frequency_data: Dict[str, Dict[str, int]]) -> None:
         for month in recent_months:
             print(f"  {month}: {monthly_data[month]} launches")
 
-def export_data(launches: List[Launch], format: str) -> None:
+def export_data(launches: Iterable[Launch], format: str, output: Optional[str] = None,
+                compression: Optional[str] = None) -> None:
+    """Stream launches to output ("-" for stdout), by default a timestamped file in the CWD"""
+    from .exporters import default_path, export
+    path = None if output == "-" else Path(output) if output else default_path(format, compression)
+    try:
+        count = export((launch.to_dict() for launch in launches), format, path, compression, Launch)
+    except RuntimeError as e:
+        raise SystemExit(f"Export failed: {e}")
+    if path is not None:
+        print(f"Exported {count} launches to {path}")
+
+def print_profile(format: str) -> None:
+    """Write the collected metrics to stderr, so they never mix with exported data"""
     if format == "json":
-        data = [launch.__dict__ for launch in launches]
-        filename = f"spacex_launches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-        print(f"Data exported to {filename}")
-    elif format == "csv":
-        import csv
-        filename = f"spacex_launches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            if launches:
-                writer.writerow(launches[0].__dict__.keys())
-                for launch in launches:
-                    writer.writerow([str(value) for value in launch.__dict__.values()])
-        print(f"Data exported to {filename}")
+        print(json.dumps(METRICS.summary(), indent=2), file=sys.stderr)
+    else:
+        print(METRICS.to_prometheus(), end="", file=sys.stderr)
+
+def filter_launches(launches: Sequence, filter_args: Dict[str, Any], cache_manager: CacheManager,
+                    version: Optional[str] = None, reuse_rows: bool = True) -> Sequence:
+    """Apply filters, reusing the rows an identical query found in the same cached data.
+
+    Remembered rows are materialized all at once, so callers that only want
+    a sorted page pass reuse_rows=False and get a frame to order instead.
+    """
+    if isinstance(launches, SQLiteRecords):
+        return apply_filters(launches, **filter_args)
+    reuse_rows = reuse_rows and bool(version) and bool(filter_args)
+    rows = cache_manager.queries.get("rows", version, filter_args) if reuse_rows else None
+    if rows is not None:
+        return launches.take(rows) if hasattr(launches, 'take') else [launches[row] for row in rows]
+    # Build the columnar frame once so filters and statistics run vectorized
+    filtered_launches = apply_filters(LaunchFrame.from_launches(launches), **filter_args)
+    if version and filter_args:
+        cache_manager.queries.put("rows", version, filter_args, filtered_launches.positions())
+    return filtered_launches
 
 def get_launches(force_refresh: bool = False) -> List[Launch]:
-    launches = cache_manager.get_launches(force_refresh)
+    launches = get_cache_manager().get_launches(force_refresh)
     return launches
 
 def get_rockets(force_refresh: bool = False) -> List[Rocket]:
-    rockets = cache_manager.get_rockets(force_refresh)
+    rockets = get_cache_manager().get_rockets(force_refresh)
     return rockets
 
 def get_launchpads(force_refresh: bool = False) -> List[Launchpad]:
-    launchpads = cache_manager.get_launchpads(force_refresh)
+    launchpads = get_cache_manager().get_launchpads(force_refresh)
     return launchpads
 
-def filter_by_date_range(launches: List[Launch], start_date: date, end_date: date) -> List[Launch]:
-    def in_date_range(launch: Launch) -> bool:
-        launch_date = parse_date(launch.date_utc)
-        return start_date <= launch_date <= end_date
-    
-    return list(filter(in_date_range, launches))
-
-
-def filter_by_rocket(launches: List[Launch], rocket_id: str) -> List[Launch]:
-    return [launch for launch in launches if launch.rocket == rocket_id]
-
-
-def filter_by_success(launches: List[Launch], success: bool) -> List[Launch]:
-    return [launch for launch in launches if launch.success == success and not launch.upcoming]
-
-
-def filter_by_launchpad(launches: List[Launch], launchpad_id: str) -> List[Launch]:
-    return [launch for launch in launches if launch.launchpad == launchpad_id]
-
-
-def filter_upcoming(launches: List[Launch]) -> List[Launch]:
-    return [launch for launch in launches if launch.upcoming]
-
-
-def filter_completed(launches: List[Launch]) -> List[Launch]:
-    return [launch for launch in launches if not launch.upcoming]
-
-def apply_filters(launches: List[Launch], **filters) -> List[Launch]:
-    filtered_launches = launches
-    if 'start_date' in filters and 'end_date' in filters:
-        filtered_launches = filter_by_date_range(
-            filtered_launches, filters['start_date'], filters['end_date']
-        )
-    if 'rocket_id' in filters:
-        filtered_launches = filter_by_rocket(
-            filtered_launches, filters['rocket_id']
-        )
-    if 'success' in filters:
-        filtered_launches = filter_by_success(
-            filtered_launches, filters['success']
-        )
-    if 'launchpad_id' in filters:
-        filtered_launches = filter_by_launchpad(
-            filtered_launches, filters['launchpad_id']
-        )
-
-    if 'upcoming' in filters and filters['upcoming']:
-        filtered_launches = filter_upcoming(filtered_launches)
-    return filtered_launches
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="SpaceX Launch Tracker")
     parser.add_argument("--refresh", action="store_true", help="Force refresh of cached data")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Refresh launches by syncing only upcoming and changed launches")
+    parser.add_argument("--cache-format", choices=sorted(SERIALIZERS), default="columnar",
+                        help="On-disk cache format")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for each API response")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Times to retry an API request that failed with a transient error")
     parser.add_argument("--filter-rocket", help="Filter by rocket ID")
     parser.add_argument("--filter-success", choices=["true", "false"], help="Filter by success status")
     parser.add_argument("--filter-launchpad", help="Filter by launchpad ID")
@@ -176,46 +178,114 @@ if __name__ == "__main__":
     parser.add_argument("--stats", action="store_true", help="Show statistics")
     parser.add_argument("--success-rates", action="store_true", help="Show success rates by rocket")
     parser.add_argument("--frequency", action="store_true", help="Show launch frequency")
-    parser.add_argument("--export", choices=["json", "csv"], help="Export data to file")
+    parser.add_argument("--sort", choices=sorted(ORDER_COLUMNS), help="Order listed launches by date or flight number")
+    parser.add_argument("--reverse", action="store_true", help="List launches in descending order")
+    parser.add_argument("--offset", type=int, default=0, help="Skip this many listed launches")
+    parser.add_argument("--limit", type=int, help="List at most this many launches")
+    parser.add_argument("--table-format", choices=TABLE_FORMATS, default="grid",
+                        help="Layout of listed launches; tsv is meant for piping into other programs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes to compute statistics with, over shards of the launches")
+    parser.add_argument("--export", choices=["json", "csv", "ndjson", "parquet"], help="Export data to file")
+    parser.add_argument("--output", help="Export destination, '-' for stdout (default: timestamped file)")
+    parser.add_argument("--compress", choices=["gzip", "zstd"], help="Compress the export")
+    parser.add_argument("--profile", choices=["prometheus", "json"],
+                        help="Print request, cache and timing metrics to stderr when done")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run a local HTTP/JSON service that keeps the data in memory")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind in serve mode")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind in serve mode")
+    parser.add_argument("--refresh-interval", type=float, default=300.0,
+                        help="Seconds between background refreshes in serve mode")
     
     args = parser.parse_args()
+    if args.offset < 0 or (args.limit is not None and args.limit < 0):
+        parser.error("--offset and --limit must not be negative")
+    stdout = sys.stdout
+    if args.export and args.output == "-" or args.table_format == "tsv":
+        # Keep stdout for the exported data or table and send logs and reports to stderr
+        for handler in logging.getLogger("main").handlers:
+            handler.setStream(sys.stderr)
+        sys.stdout = sys.stderr
     print(args)
-    launches = get_launches(force_refresh=args.refresh)
-    rockets = get_rockets(force_refresh=args.refresh)
-    launchpads = get_launchpads(force_refresh=args.refresh)
+    cache_manager = get_cache_manager(
+        serializer=get_serializer(args.cache_format),
+        transport=TransportConfig(timeout=args.timeout, max_retries=args.retries),
+    )
+    
+    if args.serve:
+        from .server import TrackerService, serve
+        service = TrackerService(
+            lambda: cache_manager.get_all(incremental=args.incremental),
+            refresh_interval=args.refresh_interval,
+        )
+        serve(service, host=args.host, port=args.port)
+        raise SystemExit(0)
+    
+    launches, rockets, launchpads = cache_manager.get_all(
+        force_refresh=args.refresh, incremental=args.incremental
+    )
     
     # Apply filters
-    filter_args = {}
-    if args.filter_rocket:
-        filter_args['rocket_id'] = args.filter_rocket
-    if args.filter_success:
-        filter_args['success'] = args.filter_success.lower() == "true"
-    if args.filter_launchpad:
-        filter_args['launchpad_id'] = args.filter_launchpad
-    if args.filter_upcoming:
-        filter_args['upcoming'] = True
-    if args.start_date and args.end_date:
-        filter_args['start_date'] = datetime.strptime(args.start_date, "%Y-%m-%d").date()
-        filter_args['end_date'] = datetime.strptime(args.end_date, "%Y-%m-%d").date()
-    
-    filtered_launches = apply_filters(launches, **filter_args)
-    if not any([args.stats, args.success_rates, args.frequency]):
-        display_launches(filtered_launches, rockets, launchpads)
+    filter_args = build_filters(
+        rocket_id=args.filter_rocket,
+        success=args.filter_success,
+        launchpad_id=args.filter_launchpad,
+        upcoming=args.filter_upcoming,
+        start_date=args.start_date,
+        end_date=args.end_date,
+    )
+    
+    reports = any([args.stats, args.success_rates, args.frequency])
+    version = cache_manager.data_version(launches)
+    aggregate = None
+    if reports and not filter_args:
+        # Kept up to date by every refresh, so unfiltered reports never scan the history
+        aggregate = cache_manager.get_launch_aggregate()
+    if reports and aggregate is None and version:
+        cached = cache_manager.queries.get("aggregate", version, filter_args)
+        aggregate = LaunchAggregate.from_dict(cached) if cached else None
+    computed = reports and aggregate is None
+    
+    if computed and args.workers > 1 and not isinstance(launches, SQLiteRecords):
+        from .parallel import parallel_aggregate
+        # Workers filter and aggregate their own shards, so the whole list is never built here
+        aggregate = parallel_aggregate(launches, args.workers, **filter_args)
+    
+    if not reports or aggregate is None or args.export:
+        if reports or filter_args or args.sort:
+            paged = args.sort or args.offset or args.limit is not None
+            filtered_launches = filter_launches(launches, filter_args, cache_manager, version,
+                                                reuse_rows=bool(reports or args.export or not paged))
+        else:
+            # Listing or exporting everything in stored order reads only the rows written
+            filtered_launches = launches
+    
+    if not reports:
+        listed = page_launches(filtered_launches, args.sort, args.reverse, args.offset, args.limit)
+        # An export to stdout takes precedence, and the table goes to stderr with the reports
+        display_launches(listed, rockets, launchpads, args.table_format,
+                         out=sys.stdout if args.export and args.output == "-" else stdout)
+    
+    if reports and aggregate is None:
+        # One aggregation pass serves every requested report
+        aggregate = aggregate_launches(filtered_launches)
+    if computed and version:
+        cache_manager.queries.put("aggregate", version, filter_args, aggregate.to_dict())
     
     if args.stats:
-        stats = get_launch_statistics(filtered_launches)
-        display_statistics(stats)
+        display_statistics(aggregate.statistics())
     
     if args.success_rates:
-        success_rates = calculate_success_rate_by_rocket(
-            filtered_launches, rockets
-        )
-        display_success_rates(success_rates)
+        display_success_rates(aggregate.success_rate_by_rocket(rockets))
     
     if args.frequency:
-        frequency = calculate_launch_frequency(filtered_launches)
-        display_launch_frequency(frequency)
+        display_launch_frequency(aggregate.launch_frequency())
 
     if args.export:
-        export_data(filtered_launches, args.export)
+        sys.stdout = stdout
+        export_data(filtered_launches, args.export, args.output, args.compress)
+    
+    if args.profile:
+        print_profile(args.profile)
 
@@ -0,0 +1,132 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _Timing:
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+
+class Metrics:
+    """Process-wide counters and timers, exportable as Prometheus text or a JSON summary.
+
+    Metrics are identified by a name and keyword labels, e.g.
+    inc("cache_requests_total", endpoint="launches", result="hit"). Keep label
+    values to a small set, since every combination is kept in memory.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self._counters: Dict[Key, float] = {}
+        self._timings: Dict[Key, _Timing] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Key:
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = _Timing()
+            timing.add(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Time the block, including blocks that raise"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self.clock() - start, **labels)
+
+    def timed(self, name: str, **labels: Any) -> Callable:
+        """Decorator form of timer"""
+        def decorate(fn: Callable) -> Callable:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+    def summary(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Every metric as JSON-friendly dicts, grouped by name"""
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                result.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+            for (name, labels), timing in sorted(self._timings.items()):
+                result.setdefault(name, []).append({
+                    'labels': dict(labels),
+                    'count': timing.count,
+                    'total': timing.total,
+                    'mean': timing.total / timing.count,
+                    'min': timing.min,
+                    'max': timing.max,
+                })
+        return result
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timings = sorted((key, (timing.count, timing.total)) for key, timing in self._timings.items())
+
+        last = None
+        for (name, labels), value in counters:
+            if name != last:
+                lines.append(f"# TYPE {name} counter")
+                last = name
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), (count, total) in timings:
+            if name != last:
+                lines.append(f"# TYPE {name} summary")
+                last = name
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escape = lambda value: value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return "{" + ",".join(f'{label}="{escape(value)}"' for label, value in labels) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# Shared by every module; the CLI prints it with --profile and the service serves it on /metrics
+METRICS = Metrics()
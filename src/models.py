@@ -1,8 +1,85 @@
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+import json
+import sys
+from dataclasses import dataclass, field, fields
+from datetime import date
+from typing import Optional, List, Dict, Any, Iterable
 
+from .util import launch_day
+
+
+class RawJSON:
+    """Undecoded JSON for a lazily decoded model field"""
+    __slots__ = ('data',)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def decode(self) -> Any:
+        return json.loads(self.data)
+
+
+class _LazyField:
+    """Stores a field in a private slot and decodes RawJSON on first access"""
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if type(value) is RawJSON:
+            value = value.decode()
+            setattr(instance, self.slot, value)
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(instance, self.slot, value)
+
+
+class Model:
+    """Base for the API models: slotted instances and an explicit to_dict()"""
+    __slots__ = ()
+    _interned: tuple = ()
+    _lazy: tuple = ()
+
+    def __post_init__(self):
+        # Ids and enums repeat across thousands of launches, so share one string each
+        for name in self._interned:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def compact(interned: Iterable[str] = (), lazy: Iterable[str] = ()):
+    """Rebuild a dataclass with __slots__, the way dataclass(slots=True) does on 3.10+.
+
+    Fields named in lazy accept RawJSON and are only decoded when read.
+    """
+    def wrap(cls: type) -> type:
+        names = [f.name for f in fields(cls)]
+        namespace = dict(cls.__dict__)
+        for name in names:
+            namespace.pop(name, None)
+        namespace.pop('__dict__', None)
+        namespace.pop('__weakref__', None)
+        namespace['__slots__'] = tuple(f"_{name}" if name in lazy else name for name in names)
+        for name in lazy:
+            namespace[name] = _LazyField(f"_{name}")
+        namespace['_interned'] = tuple(interned)
+        namespace['_lazy'] = tuple(lazy)
+
+        slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+        slotted.__qualname__ = cls.__qualname__
+        return slotted
+    return wrap
+
+@compact()
 @dataclass
-class Rocket:
+class Rocket(Model):
     id: str
     name: str
     type: str
@@ -26,8 +103,9 @@ class Rocket:
     wikipedia: str = ""
     description: str = ""
 
+@compact()
 @dataclass
-class Launchpad:
+class Launchpad(Model):
     id: str
     name: str
     full_name: str
@@ -43,8 +121,9 @@ class Launchpad:
     launches: List[str] = field(default_factory=list)
     details: str = ""
     
+@compact(interned=('rocket', 'launchpad', 'date_precision'), lazy=('failures', 'cores', 'links'))
 @dataclass
-class Launch:
+class Launch(Model):
     id: str
     flight_number: int
     name: str
@@ -70,4 +149,16 @@ class Launch:
     launchpad: str = ""
     cores: List[Dict[str, Any]] = field(default_factory=list)
     links: Dict[str, Any] = field(default_factory=dict)
-    auto_update: bool = False
\ No newline at end of file
+    auto_update: bool = False
+
+    @property
+    def utc_date(self) -> date:
+        return launch_day(self.date_unix, self.date_utc)[0]
+
+    @property
+    def year(self) -> int:
+        return self.utc_date.year
+
+    @property
+    def month_key(self) -> str:
+        return launch_day(self.date_unix, self.date_utc)[1]
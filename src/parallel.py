@@ -0,0 +1,104 @@
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .aggregate import LaunchAggregate
+from .frame import LaunchFrame
+from .logger import setup_logger
+from .serializers import ColumnarSerializer, ColumnarTable, LazyRecords
+from .statistics import aggregate_launches
+
+logger = setup_logger("main", level=10)
+
+# The fields statistics read; in-memory launches are spilled to disk with only these
+HOT_FIELDS = ('date_unix', 'date_utc', 'success', 'upcoming', 'rocket', 'launchpad', 'flight_number')
+
+
+class _Shard:
+    """Rows start:stop of a memory-mapped columnar file, decoded one column at a time"""
+
+    def __init__(self, table: ColumnarTable, start: int, stop: int):
+        self.table = table
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def column(self, name: str) -> List[Any]:
+        return self.table.columns[name].take(range(self.start, self.stop))
+
+
+class SnapshotChanged(Exception):
+    """Raised in a worker when the file at the shared path is no longer the one the parent loaded"""
+
+
+def _aggregate_shard(path: str, identity: Optional[Tuple[int, int]], start: int, stop: int,
+                     filters: Dict[str, Any]) -> LaunchAggregate:
+    # Runs in a worker: only the path and row range are sent, the data is mapped from the file
+    table = ColumnarTable(Path(path))
+    if identity is not None and table.identity != tuple(identity):
+        raise SnapshotChanged(path)
+    frame = LaunchFrame.from_launches(_Shard(table, start, stop))
+    return frame.filter(**filters).aggregate()
+
+
+def shards(count: int, workers: int, min_size: int) -> List[Tuple[int, int]]:
+    """Split count rows into at most workers consecutive ranges of at least min_size rows"""
+    number = max(1, min(workers, count // max(min_size, 1)))
+    size, extra = divmod(count, number)
+    ranges, start = [], 0
+    for index in range(number):
+        stop = start + size + (index < extra)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _spill(launches: Sequence, directory: str) -> Path:
+    path = Path(directory) / "launches.col"
+    with ColumnarSerializer().writer(path) as writer:
+        for launch in launches:
+            writer.write({name: getattr(launch, name) for name in HOT_FIELDS})
+    return path
+
+
+def parallel_aggregate(launches: Sequence, workers: int, min_shard_size: int = 50000,
+                       **filters) -> LaunchAggregate:
+    """Filter and aggregate launches in a process pool, one consecutive shard per worker.
+
+    Workers memory-map a columnar file and read only their rows, so no launch
+    is pickled: launches loaded from the columnar cache use the cache file, and
+    other sequences are first written to a temporary one. Shard aggregates are
+    merged in order, which gives exactly the serial result, key order included.
+    A refresh may replace the cache file while the pool starts, so workers
+    check they mapped the same file as launches, and the launches are
+    aggregated serially if any did not.
+    """
+    if isinstance(launches, LaunchFrame):
+        # Already columnar in memory; aggregating it is cheaper than shipping it anywhere
+        return aggregate_launches(launches.filter(**filters))
+    ranges = shards(len(launches), workers, min_shard_size)
+    if workers <= 1 or len(ranges) == 1:
+        return aggregate_launches(LaunchFrame.from_launches(launches).filter(**filters))
+
+    with tempfile.TemporaryDirectory(prefix="spacex-shards-") as directory:
+        if isinstance(launches, LazyRecords):
+            path, identity = launches.table.path, launches.table.identity
+        else:
+            # Private to this call, so nothing else can replace it
+            path, identity = _spill(launches, directory), None
+
+        from concurrent.futures import ProcessPoolExecutor
+        logger.info(f"Aggregating {len(launches)} launches in {len(ranges)} shards")
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+                partials = pool.map(_aggregate_shard, *zip(*[(str(path), identity, start, stop, filters)
+                                                             for start, stop in ranges]))
+                aggregate = LaunchAggregate()
+                for partial in partials:
+                    aggregate = aggregate.merge(partial)
+        except SnapshotChanged:
+            logger.warning(f"{path} was replaced while aggregating, aggregating the loaded launches serially")
+            return aggregate_launches(LaunchFrame.from_launches(launches).filter(**filters))
+    return aggregate
@@ -0,0 +1,117 @@
+import base64
+import json
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .locking import write_atomic
+from .logger import setup_logger
+from .lru import LRUCache
+from .metrics import METRICS
+
+logger = setup_logger("main", level=10)
+
+
+def filter_key(filters: Dict[str, Any]) -> str:
+    """Normalize apply_filters keyword arguments so equivalent filter sets share one key"""
+    normalized = {name: value for name, value in filters.items()
+                  if not (name == 'upcoming' and not value)}
+    return json.dumps(normalized, sort_keys=True, default=str, separators=(',', ':'))
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, array):
+        # Row positions as raw 32-bit integers, far smaller and faster to parse than a JSON list
+        return {'__array__': 'I', 'data': base64.b64encode(array('I', value).tobytes()).decode('ascii')}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and '__array__' in value:
+        return array(value['__array__'], base64.b64decode(value['data']))
+    return value
+
+
+class QueryCache:
+    """Memoizes results derived from one version of the launch data, keyed by kind and filters.
+
+    Entries are kept in an LRU and dropped as soon as a different data version
+    is asked for. With a path, results are also written to disk (they must be
+    JSON values or arrays of row positions) so later processes reuse them
+    while the version still matches. Only the most recently used results
+    fitting in MAX_PERSISTED_BYTES are written, which keeps the file cheap to
+    rewrite and to read; larger results are only memoized in memory.
+    """
+    MAX_PERSISTED_BYTES = 4 << 20
+
+    def __init__(self, maxsize: int = 128, path: Optional[Path] = None):
+        self.path = path
+        self._entries = LRUCache(maxsize)
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _use(self, version: str) -> None:
+        if version == self._version:
+            return
+        self._entries.clear()
+        self._version = version
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            logger.error("Error in decoding cache data")
+            return
+        if data.get('version') == version:
+            self._entries.put_many({tuple(key): _decode(value) for key, value in data['entries']})
+
+    def _key(self, kind: str, filters: Dict[str, Any]) -> Tuple[Hashable, ...]:
+        return kind, filter_key(filters)
+
+    def get(self, kind: str, version: str, filters: Dict[str, Any]) -> Any:
+        with self._lock:
+            self._use(version)
+            value = self._entries.get(self._key(kind, filters))
+        METRICS.inc("query_cache_requests_total", kind=kind, result="miss" if value is None else "hit")
+        return value
+
+    def put(self, kind: str, version: str, filters: Dict[str, Any], value: Any) -> None:
+        key = self._key(kind, filters)
+        with self._lock:
+            self._use(version)
+            self._entries.put(key, value)
+            if self.path is None:
+                return
+            persisted, size = [], 0
+            for entry_key, entry_value in reversed(self._entries.items()):
+                encoded = json.dumps([list(entry_key), _encode(entry_value)])
+                if size + len(encoded) > self.MAX_PERSISTED_BYTES:
+                    if entry_key == key:
+                        # Too large to persist, and the file is up to date without it
+                        return
+                    continue
+                persisted.append(encoded)
+                size += len(encoded)
+            entries = ",".join(reversed(persisted))
+            try:
+                write_atomic(self.path, f'{{"version":{json.dumps(version)},"entries":[{entries}]}}')
+            except IOError:
+                logger.error("Error saving cache data")
+
+    def get_or_compute(self, kind: str, version: str, filters: Dict[str, Any],
+                       compute: Callable[[], Any]) -> Any:
+        value = self.get(kind, version, filters)
+        if value is None:
+            value = compute()
+            self.put(kind, version, filters, value)
+        return value
+
+    def clear(self) -> None:
+        """Forget every result, including the ones persisted to disk"""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+            if self.path is not None and self.path.exists():
+                self.path.unlink()
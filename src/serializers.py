@@ -0,0 +1,782 @@
+import calendar
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, timedelta
+from collections.abc import Sequence
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .locking import temp_path_for
+from .logger import setup_logger
+from .metrics import METRICS
+from .models import RawJSON
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = setup_logger("main", level=10)
+
+
+class CacheSerializer:
+    """Reads and writes the records of one cached collection"""
+    name = ""
+    suffix = ""
+
+    def load_records(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+    def load(self, path: Path, model: type) -> Optional[Sequence]:
+        """Models of the collection at path, as a sequence whose version identifies what was read"""
+        version = self.version(path)
+        records = self.load_records(path)
+        if records is None:
+            return None
+        return LoadedRecords((model(**record) for record in records), version)
+
+    def dump(self, path: Path, records: List[Dict[str, Any]]) -> None:
+        try:
+            with self.writer(path) as writer:
+                for record in records:
+                    writer.write(record)
+        except IOError as e:
+            logger.error("Error saving cache data")
+
+    def writer(self, path: Path) -> "RecordWriter":
+        """Open a writer that replaces the collection at path with records as they arrive"""
+        return _BufferedWriter(self, path)
+
+    def version(self, path: Path) -> Optional[str]:
+        """Identifies the collection stored at path, or None if there is none.
+
+        It changes with every write. File formats are always rewritten to a new
+        file that replaces the old one, while renewing a cache only touches its
+        mtime, so the inode and size are enough.
+        """
+        try:
+            return _file_version(path.stat())
+        except FileNotFoundError:
+            return None
+
+
+class LoadedRecords(list):
+    """Models read from a cache file into memory, along with the version they were read from"""
+
+    def __init__(self, items: Iterable[Any] = (), version: Optional[str] = None):
+        super().__init__(items)
+        self.version = version
+
+
+class RecordWriter:
+    """Writes one collection record by record.
+
+    Used as a context manager: the new collection only replaces the old one
+    once the block completes, and an exception inside the block leaves the
+    previous file untouched.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def commit(self) -> None:
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        pass
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class _BufferedWriter(RecordWriter):
+    """Fallback for serializers that only implement dump() of a complete list"""
+
+    def __init__(self, serializer: CacheSerializer, path: Path):
+        super().__init__(path)
+        self.serializer = serializer
+        self.records: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+        self.count += 1
+
+    def commit(self) -> None:
+        self.serializer.dump(self.path, self.records)
+
+
+class _FileWriter(RecordWriter):
+    """Streams into a temporary file next to path and moves it into place on commit"""
+
+    def __init__(self, path: Path, mode: str):
+        super().__init__(path)
+        # Unique per writer, so concurrent writers never share a temporary file
+        self.temp_path = temp_path_for(path)
+        self.file = open(self.temp_path, mode)
+
+    def commit(self) -> None:
+        try:
+            self.file.close()
+            os.replace(self.temp_path, self.path)
+        except IOError:
+            self.abort()
+            raise
+
+    def abort(self) -> None:
+        self.file.close()
+        if self.temp_path.exists():
+            self.temp_path.unlink()
+
+
+class _JSONWriter(_FileWriter):
+    """Writes the same document as JSONSerializer.dump, one record at a time"""
+
+    def __init__(self, path: Path):
+        super().__init__(path, 'w')
+        self.file.write("[")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.file.write(",\n" if self.count else "\n")
+        self.file.write("  " + json.dumps(record, default=str, indent=2).replace("\n", "\n  "))
+        self.count += 1
+
+    def commit(self) -> None:
+        self.file.write("\n]" if self.count else "]")
+        super().commit()
+
+
+class JSONSerializer(CacheSerializer):
+    """Pretty-printed JSON, the original cache format"""
+    name = "json"
+    suffix = ".json"
+
+    def _read(self, path: Path) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+        try:
+            with open(path, 'r') as f:
+                return json.load(f), _file_version(os.fstat(f.fileno()))
+        except (json.JSONDecodeError, IOError) as e:
+            METRICS.inc("parse_failures_total", kind="cache")
+            logger.error("Error in decoding cache data")
+            return None
+
+    def load_records(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        read = self._read(path)
+        return read[0] if read else None
+
+    def load(self, path: Path, model: type) -> Optional[Sequence]:
+        # Versioned by the file that was opened, in case the path is replaced meanwhile
+        read = self._read(path)
+        if read is None:
+            return None
+        records, version = read
+        return LoadedRecords((model(**record) for record in records), version)
+
+    def writer(self, path: Path) -> RecordWriter:
+        return _JSONWriter(path)
+
+
+class _Column:
+    """Read-only view over one column of a columnar cache file"""
+
+    def __init__(self, kind: str, values: Any = None, offsets: Any = None,
+                 data: Any = None, nulls: Any = None):
+        self.kind = kind
+        self.values = values
+        self.offsets = offsets
+        self.data = data
+        self.nulls = nulls
+
+    def __getitem__(self, index: int) -> Any:
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        if self.kind == "bool":
+            return self.values[index] == 1
+        if self.kind in ("int", "float"):
+            return self.values[index]
+        raw = str(self.data[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+        return raw if self.kind == "str" else json.loads(raw)
+
+    def take(self, indices: List[int], raw: bool = False) -> List[Any]:
+        """Decode many rows at once, parsing nested fields in a single json.loads call.
+
+        With raw, nested fields are returned undecoded as RawJSON for models
+        that decode them lazily.
+        """
+        nulls, values, offsets, data = self.nulls, self.values, self.offsets, self.data
+        if raw and self.kind == "json":
+            return [None if nulls is not None and nulls[index] else
+                    RawJSON(bytes(data[offsets[index]:offsets[index + 1]]))
+                    for index in indices]
+        if self.kind in ("int", "float"):
+            taken = [values[index] for index in indices]
+        elif self.kind == "bool":
+            taken = [values[index] == 1 for index in indices]
+        elif self.kind == "str":
+            taken = [str(data[offsets[index]:offsets[index + 1]], 'utf-8') for index in indices]
+        else:
+            raw = b",".join([
+                b"null" if nulls is not None and nulls[index] else data[offsets[index]:offsets[index + 1]]
+                for index in indices
+            ])
+            return json.loads(b"[" + raw + b"]")
+        if nulls is not None:
+            taken = [None if nulls[index] else value for index, value in zip(indices, taken)]
+        return taken
+
+
+class ColumnarTable:
+    """Memory-mapped columnar cache file.
+
+    Scalar fields are typed arrays read straight out of the mapping. Strings and
+    nested fields live in a shared blob addressed through an offset table, and
+    are only decoded when a row actually reads them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Identifies the mapped file: writers replace the path instead of changing the file in place
+        self.identity = (stat.st_ino, stat.st_size)
+        buffer = memoryview(self._mmap)
+
+        if bytes(buffer[:len(ColumnarSerializer.MAGIC)]) != ColumnarSerializer.MAGIC:
+            raise ValueError(f"{path} is not a columnar cache file")
+        position = len(ColumnarSerializer.MAGIC)
+        header_length, = struct.unpack_from('<I', buffer, position)
+        position += 4
+        header = json.loads(str(buffer[position:position + header_length], 'utf-8'))
+        body = buffer[_align(position + header_length):]
+
+        swap = header['byteorder'] != sys.byteorder
+        self.count: int = header['count']
+        self.columns: Dict[str, _Column] = {}
+        for meta in header['columns']:
+            self.columns[meta['name']] = _Column(
+                meta['kind'],
+                values=_read_array(body, meta.get('values'),
+                                   ColumnarSerializer.TYPECODES.get(meta['kind'], 'b'), swap),
+                offsets=_read_array(body, meta.get('offsets'), 'q', swap),
+                data=_read_bytes(body, meta.get('data')),
+                nulls=_read_array(body, meta.get('nulls'), 'b', swap),
+            )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def rows(self, indices: List[int], raw: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        names = list(self.columns)
+        values = [column.take(indices, name in raw) for name, column in self.columns.items()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+
+class RowView:
+    """Attribute access to one row of a ColumnarTable without building a model"""
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: ColumnarTable, index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            column = self._table.columns[name]
+        except KeyError:
+            raise AttributeError(name)
+        return column[self._index]
+
+
+class LazyRecords(Sequence):
+    """Sequence of models backed by a ColumnarTable, materialized on access"""
+    BATCH_SIZE = 1024
+
+    def __init__(self, model: type, table: ColumnarTable):
+        self.model = model
+        self.table = table
+
+    @property
+    def version(self) -> str:
+        """The version of the mapped file, whatever has replaced it since"""
+        return "-".join(map(str, self.table.identity))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.model(**self.table.row(index))
+
+    def __iter__(self) -> Iterator[Any]:
+        for start in range(0, len(self), self.BATCH_SIZE):
+            yield from self.take(range(start, min(start + self.BATCH_SIZE, len(self))))
+
+    def views(self) -> List[RowView]:
+        return [RowView(self.table, index) for index in range(len(self))]
+
+    def materialize(self, rows: Iterable[RowView]) -> List[Any]:
+        return self.take([row._index for row in rows])
+
+    def take(self, indices: List[int]) -> List[Any]:
+        with _gc_paused():
+            return [self.model(**row) for row in self.table.rows(indices, getattr(self.model, '_lazy', ()))]
+
+    def column(self, name: str) -> List[Any]:
+        """Decode a single field for every row without building models"""
+        column = self.table.columns.get(name)
+        if column is None:
+            # Files only have columns for fields their records had, and an empty file has none
+            return [None] * len(self)
+        return column.take(range(len(self)))
+
+    def by_ids(self, ids: Iterable[str]) -> List[Any]:
+        """Materialize only the records with the given ids"""
+        wanted = set(ids)
+        return self.take([index for index, id in enumerate(self.column('id')) if id in wanted])
+
+
+class _ColumnBuilder:
+    """Accumulates one column in its encoded form while records stream in.
+
+    The column starts out with the kind of its first value and falls back to
+    json as soon as a value of another kind arrives, which gives the same
+    kinds as classifying the complete column at once.
+    """
+
+    def __init__(self, rows: int = 0):
+        self.kind: Optional[str] = None
+        self.nulls = array('b', [1] * rows)
+        self.values: Any = None
+        self.offsets = array('q', [0] * (rows + 1))
+        self.data = bytearray()
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self.nulls.append(1)
+            if self.values is not None:
+                self.values.append(0)
+            else:
+                self.offsets.append(len(self.data))
+            return
+
+        kind = _value_kind(value)
+        if kind != self.kind:
+            if self.kind is None:
+                self._start(kind)
+            elif self.kind != "json":
+                self._to_json()
+
+        self.nulls.append(0)
+        if self.values is not None:
+            self.values.append(value)
+        else:
+            self.data += (value if self.kind == "str" else json.dumps(value, default=str)).encode('utf-8')
+            self.offsets.append(len(self.data))
+
+    def _start(self, kind: str) -> None:
+        self.kind = kind
+        if kind in ColumnarSerializer.TYPECODES:
+            self.values = array(ColumnarSerializer.TYPECODES[kind], bytes(
+                len(self.nulls) * array(ColumnarSerializer.TYPECODES[kind]).itemsize
+            ))
+
+    def _to_json(self) -> None:
+        kind, values, offsets, data = self.kind, self.values, self.offsets, self.data
+        self.kind, self.values, self.offsets, self.data = "json", None, array('q', [0]), bytearray()
+        for index, null in enumerate(self.nulls):
+            if not null:
+                if kind == "str":
+                    value: Any = str(data[offsets[index]:offsets[index + 1]], 'utf-8')
+                else:
+                    value = values[index] == 1 if kind == "bool" else values[index]
+                self.data += json.dumps(value).encode('utf-8')
+            self.offsets.append(len(self.data))
+
+    def section(self, name: str, body: bytearray) -> Dict[str, Any]:
+        meta: Dict[str, Any] = {'name': name, 'kind': self.kind or "json"}
+        if any(self.nulls):
+            meta['nulls'] = _append(body, self.nulls)
+        if self.values is not None:
+            meta['values'] = _append(body, self.values)
+        else:
+            meta['offsets'] = _append(body, self.offsets)
+            meta['data'] = _append(body, self.data)
+        return meta
+
+
+class _ColumnarWriter(_FileWriter):
+    """Builds the columns as records arrive, holding only their encoded form in memory"""
+
+    def __init__(self, path: Path):
+        super().__init__(path, 'wb')
+        self.columns: Dict[str, _ColumnBuilder] = {}
+
+    def write(self, record: Dict[str, Any]) -> None:
+        for name in record:
+            if name not in self.columns:
+                self.columns[name] = _ColumnBuilder(self.count)
+        for name, column in self.columns.items():
+            column.append(record.get(name))
+        self.count += 1
+
+    def commit(self) -> None:
+        body = bytearray()
+        columns = [column.section(name, body) for name, column in self.columns.items()]
+        self.columns = {}
+        header = json.dumps({
+            'count': self.count,
+            'byteorder': sys.byteorder,
+            'columns': columns,
+        }).encode('utf-8')
+        prefix = ColumnarSerializer.MAGIC + struct.pack('<I', len(header)) + header
+        try:
+            self.file.write(prefix)
+            self.file.write(b"\0" * (_align(len(prefix)) - len(prefix)))
+            self.file.write(body)
+        except IOError:
+            self.abort()
+            raise
+        super().commit()
+
+
+class ColumnarSerializer(CacheSerializer):
+    """Compact binary columnar format read through mmap"""
+    name = "columnar"
+    suffix = ".col"
+    MAGIC = b"SXCOL1\n"
+    TYPECODES = {"bool": 'b', "int": 'q', "float": 'd'}
+
+    def load_records(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        table = self._open(path)
+        if table is None:
+            return None
+        return [table.row(index) for index in range(len(table))]
+
+    def load(self, path: Path, model: type) -> Optional[Sequence]:
+        table = self._open(path)
+        if table is None:
+            return None
+        return LazyRecords(model, table)
+
+    def writer(self, path: Path) -> RecordWriter:
+        return _ColumnarWriter(path)
+
+    def _open(self, path: Path) -> Optional[ColumnarTable]:
+        try:
+            return ColumnarTable(path)
+        except (ValueError, IOError, struct.error, KeyError) as e:
+            METRICS.inc("parse_failures_total", kind="cache")
+            logger.error("Error in decoding cache data")
+            return None
+
+
+class SQLiteRecords(Sequence):
+    """Sequence of models stored in a SQLite cache file.
+
+    Filters are compiled into a single indexed query through query(), which
+    apply_filters uses instead of scanning the collection in Python.
+    """
+    BATCH_SIZE = 1024
+    # Stays below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+    MAX_PARAMS = 500
+
+    def __init__(self, model: type, path: Path, version: Optional[str] = None):
+        self.model = model
+        self.path = path
+        # Rows are read live, so this is the version when the store was opened
+        self.version = version
+
+    def _connect(self) -> "sqlite3.Connection":
+        import sqlite3
+        return sqlite3.connect(str(self.path))
+
+    def _select(self, where: str = "", params: tuple = ()) -> Iterator[Any]:
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(
+                f"SELECT payload FROM records {where} ORDER BY source = 'local', position", params
+            )
+            while True:
+                rows = cursor.fetchmany(self.BATCH_SIZE)
+                if not rows:
+                    break
+                yield from (self.model(**json.loads(payload)) for payload, in rows)
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT payload FROM records ORDER BY source = 'local', position LIMIT 1 OFFSET ?",
+                (index,)
+            ).fetchone() if index >= 0 else None
+        if row is None:
+            raise IndexError(index)
+        return self.model(**json.loads(row[0]))
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._select()
+
+    def query(self, **filters) -> List[Any]:
+        """Run the apply_filters keyword arguments as one query"""
+        clauses = []
+        params: List[Any] = []
+        if 'start_date' in filters and 'end_date' in filters:
+            clauses.append("date_unix >= ? AND date_unix < ?")
+            params += [_epoch(filters['start_date']), _epoch(filters['end_date'] + timedelta(days=1))]
+        if 'rocket_id' in filters:
+            clauses.append("rocket = ?")
+            params.append(filters['rocket_id'])
+        if 'success' in filters:
+            clauses.append("success = ? AND upcoming = 0")
+            params.append(int(bool(filters['success'])))
+        if 'launchpad_id' in filters:
+            clauses.append("launchpad = ?")
+            params.append(filters['launchpad_id'])
+        if 'upcoming' in filters and filters['upcoming']:
+            clauses.append("upcoming = 1")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return list(self._select(where, tuple(params)))
+
+    def by_ids(self, ids: Iterable[str]) -> List[Any]:
+        """Load only the records with the given ids"""
+        ids = list(ids)
+        records = []
+        for start in range(0, len(ids), self.MAX_PARAMS):
+            chunk = tuple(ids[start:start + self.MAX_PARAMS])
+            records += self._select(f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        return records
+
+
+class SQLiteSerializer(CacheSerializer):
+    """SQLite cache with indexed launch filter columns.
+
+    Rows written by dump() are the API snapshot and are replaced on every
+    refresh. Rows added through append() are kept across refreshes, so the
+    store can hold synthetic or augmented records next to the API data.
+    """
+    name = "sqlite"
+    suffix = ".sqlite"
+    INDEXED_COLUMNS = ("date_unix", "rocket", "launchpad", "success", "upcoming")
+
+    def _connect(self, path: Path) -> "sqlite3.Connection":
+        import sqlite3
+        connection = sqlite3.connect(str(path))
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "position INTEGER PRIMARY KEY, source TEXT NOT NULL, id TEXT, payload TEXT NOT NULL, "
+            + ", ".join(self.INDEXED_COLUMNS) + ")"
+        )
+        for column in ("id",) + self.INDEXED_COLUMNS:
+            connection.execute(f"CREATE INDEX IF NOT EXISTS records_{column} ON records ({column})")
+        return connection
+
+    def _bump_generation(self, connection: "sqlite3.Connection") -> None:
+        # Rows are changed in place, so every write transaction counts itself in the header
+        generation, = connection.execute("PRAGMA user_version").fetchone()
+        connection.execute(f"PRAGMA user_version = {(generation + 1) & 0x7fffffff}")
+
+    def _insert(self, connection: "sqlite3.Connection", records: List[Dict[str, Any]], source: str) -> None:
+        connection.executemany(
+            f"INSERT INTO records (source, id, payload, {', '.join(self.INDEXED_COLUMNS)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' * len(self.INDEXED_COLUMNS))})",
+            (
+                (source, record.get('id'), json.dumps(record, default=str))
+                + tuple(record.get(column) for column in self.INDEXED_COLUMNS)
+                for record in records
+            )
+        )
+
+    def load_records(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        import sqlite3
+        try:
+            with closing(self._connect(path)) as connection:
+                return [json.loads(payload) for payload, in connection.execute(
+                    "SELECT payload FROM records WHERE source = 'api' ORDER BY position"
+                )]
+        except (sqlite3.Error, ValueError) as e:
+            METRICS.inc("parse_failures_total", kind="cache")
+            logger.error("Error in decoding cache data")
+            return None
+
+    def load(self, path: Path, model: type) -> Optional[Sequence]:
+        import sqlite3
+        try:
+            with closing(self._connect(path)):
+                pass
+        except sqlite3.Error as e:
+            METRICS.inc("parse_failures_total", kind="cache")
+            logger.error("Error in decoding cache data")
+            return None
+        return SQLiteRecords(model, path, self.version(path))
+
+    def dump(self, path: Path, records: List[Dict[str, Any]]) -> None:
+        import sqlite3
+        try:
+            with closing(self._connect(path)) as connection, connection:
+                connection.execute("DELETE FROM records WHERE source = 'api'")
+                self._insert(connection, records, "api")
+                self._bump_generation(connection)
+        except sqlite3.Error as e:
+            logger.error("Error saving cache data")
+
+    def writer(self, path: Path) -> RecordWriter:
+        return _SQLiteWriter(self, path)
+
+    def append(self, path: Path, records: List[Dict[str, Any]]) -> None:
+        """Add records that are kept across refreshes"""
+        with closing(self._connect(path)) as connection, connection:
+            self._insert(connection, records, "local")
+            self._bump_generation(connection)
+
+    def version(self, path: Path) -> Optional[str]:
+        """The file's inode and write generation, as rows are changed in place"""
+        import sqlite3
+        try:
+            inode = path.stat().st_ino
+            with closing(sqlite3.connect(str(path))) as connection:
+                generation, = connection.execute("PRAGMA user_version").fetchone()
+        except (FileNotFoundError, sqlite3.Error):
+            return None
+        return f"{inode}-{generation}"
+
+
+class _SQLiteWriter(RecordWriter):
+    """Replaces the API rows inside one transaction, inserting in batches as records arrive"""
+    BATCH_SIZE = 1024
+
+    def __init__(self, serializer: SQLiteSerializer, path: Path):
+        super().__init__(path)
+        self.serializer = serializer
+        self.connection = serializer._connect(path)
+        self.connection.execute("DELETE FROM records WHERE source = 'api'")
+        self.batch: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.batch.append(record)
+        self.count += 1
+        if len(self.batch) >= self.BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        self.serializer._insert(self.connection, self.batch, "api")
+        self.batch = []
+
+    def commit(self) -> None:
+        try:
+            self._flush()
+            self.serializer._bump_generation(self.connection)
+            self.connection.commit()
+        finally:
+            self.connection.close()
+
+    def abort(self) -> None:
+        self.connection.rollback()
+        self.connection.close()
+
+
+SERIALIZERS = {
+    JSONSerializer.name: JSONSerializer,
+    ColumnarSerializer.name: ColumnarSerializer,
+    SQLiteSerializer.name: SQLiteSerializer,
+}
+
+
+def get_serializer(name: str) -> CacheSerializer:
+    return SERIALIZERS[name]()
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic GC while building many acyclic objects at once.
+
+    Bulk materialization otherwise triggers repeated full collections that
+    cost more than decoding the rows themselves.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _file_version(stat: os.stat_result) -> str:
+    return f"{stat.st_ino}-{stat.st_size}"
+
+
+def _epoch(day: date) -> int:
+    return calendar.timegm(day.timetuple())
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+def _append(body: bytearray, data: Any) -> List[int]:
+    """Append an 8-byte aligned section and return its (offset, length)"""
+    raw = data.tobytes() if isinstance(data, array) else data
+    body.extend(b"\0" * (_align(len(body)) - len(body)))
+    offset = len(body)
+    body.extend(raw)
+    return [offset, len(raw)]
+
+
+def _read_bytes(body: memoryview, section: Optional[List[int]]) -> Optional[memoryview]:
+    if section is None:
+        return None
+    offset, length = section
+    return body[offset:offset + length]
+
+
+def _read_array(body: memoryview, section: Optional[List[int]], typecode: str, swap: bool) -> Any:
+    if section is None:
+        return None
+    offset, length = section
+    raw = body[offset:offset + length]
+    if not swap:
+        return raw.cast(typecode)
+    values = array(typecode, raw.tobytes())
+    values.byteswap()
+    return values
+
+
+def _value_kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if -2 ** 63 <= value < 2 ** 63 else "json"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "json"
@@ -0,0 +1,239 @@
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .filters import apply_filters, build_filters, page_launches
+from .frame import ORDER_COLUMNS, LaunchFrame
+from .logger import setup_logger
+from .metrics import METRICS
+from .query_cache import QueryCache
+from .models import Launch, Rocket, Launchpad
+from .statistics import aggregate_launches
+
+logger = setup_logger("main", level=10)
+
+Loader = Callable[[], Tuple[Sequence[Launch], List[Rocket], List[Launchpad]]]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One immutable, fully built view of the tracker data"""
+    launches: LaunchFrame
+    rockets: List[Rocket]
+    launchpads: List[Launchpad]
+    loaded_at: float
+    version: int
+    # Version of the cached launches the frame was built from, None when unknown
+    data_version: Optional[str] = None
+
+
+class TrackerService:
+    """Keeps the latest snapshot in memory and refreshes it in the background.
+
+    Refreshes build a complete new Snapshot off to the side and then replace
+    the reference in a single assignment, so readers never wait on a refresh
+    and never see a half-built snapshot.
+    """
+
+    def __init__(self, loader: Loader, refresh_interval: float = 300.0, jitter: float = 0.1,
+                 query_cache_size: int = 256):
+        self.loader = loader
+        # Results per route and filters, for the current snapshot only
+        self.queries = QueryCache(query_cache_size)
+        self.refresh_interval = refresh_interval
+        self.jitter = jitter
+        self._snapshot: Optional[Snapshot] = None
+        self._version = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        try:
+            launches, rockets, launchpads = self.loader()
+            # Same as CacheManager.data_version, without importing the cache layer here
+            data_version = getattr(launches, 'version', None)
+            current = self._snapshot
+            if data_version is not None and current is not None and current.data_version == data_version \
+                    and list(rockets) == current.rockets and list(launchpads) == current.launchpads:
+                # Nothing changed, so keep the built frame and the results memoized for it
+                self._snapshot = replace(current, loaded_at=time.time())
+                return True
+            # Every request filters the same snapshot, so index it once up front
+            frame = LaunchFrame.from_launches(launches, indexed=True)
+        except Exception as e:
+            logger.error(f"Refresh failed, keeping the previous snapshot: {e}")
+            return False
+
+        self._version += 1
+        self._snapshot = Snapshot(frame, list(rockets), list(launchpads), time.time(), self._version, data_version)
+        self.queries.clear()
+        logger.info(f"Loaded snapshot {self._version} with {len(frame)} launches")
+        return True
+
+    def next_delay(self) -> float:
+        # Jitter keeps many trackers from refreshing against the API in lockstep
+        return self.refresh_interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.next_delay()):
+            self.refresh()
+
+    def start(self) -> None:
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tracker-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        self.status = status
+        super().__init__(message)
+
+
+def _filters(query: Dict[str, List[str]]) -> Dict[str, Any]:
+    value = lambda name: query.get(name, [None])[-1]
+    try:
+        return build_filters(
+            rocket_id=value('rocket_id'),
+            success=value('success'),
+            launchpad_id=value('launchpad_id'),
+            upcoming=(value('upcoming') or '').lower() == 'true',
+            start_date=value('start_date'),
+            end_date=value('end_date'),
+        )
+    except ValueError as e:
+        raise HTTPError(400, f"Invalid filter: {e}")
+
+
+def _page(query: Dict[str, List[str]]) -> Dict[str, Any]:
+    value = lambda name: query.get(name, [None])[-1]
+    sort, order = value('sort'), value('order') or 'asc'
+    if sort is not None and sort not in ORDER_COLUMNS:
+        raise HTTPError(400, f"Invalid sort: {sort}")
+    if order not in ('asc', 'desc'):
+        raise HTTPError(400, f"Invalid order: {order}")
+    try:
+        offset = int(value('offset') or 0)
+        limit = None if value('limit') is None else int(value('limit'))
+    except ValueError as e:
+        raise HTTPError(400, f"Invalid page: {e}")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPError(400, "Invalid page: offset and limit must not be negative")
+    return {'sort': sort, 'descending': order == 'desc', 'offset': offset, 'limit': limit}
+
+
+def _health(snapshot: Snapshot, query: Dict[str, List[str]]) -> Any:
+    return {'version': snapshot.version, 'loaded_at': snapshot.loaded_at, 'launches': len(snapshot.launches)}
+
+
+def _launches(snapshot: Snapshot, query: Dict[str, List[str]]) -> Any:
+    page = page_launches(apply_filters(snapshot.launches, **_filters(query)), **_page(query))
+    return page.positions()
+
+
+def _render_launches(snapshot: Snapshot, positions: Any) -> Any:
+    return [launch.to_dict() for launch in snapshot.launches.subset(positions)]
+
+
+def _statistics(snapshot: Snapshot, query: Dict[str, List[str]]) -> Any:
+    return aggregate_launches(apply_filters(snapshot.launches, **_filters(query))).statistics()
+
+
+def _success_rates(snapshot: Snapshot, query: Dict[str, List[str]]) -> Any:
+    aggregate = aggregate_launches(apply_filters(snapshot.launches, **_filters(query)))
+    return aggregate.success_rate_by_rocket(snapshot.rockets)
+
+
+def _sites(snapshot: Snapshot, query: Dict[str, List[str]]) -> Any:
+    aggregate = aggregate_launches(apply_filters(snapshot.launches, **_filters(query)))
+    return aggregate.launches_by_site(snapshot.launchpads)
+
+
+def _frequency(snapshot: Snapshot, query: Dict[str, List[str]]) -> Any:
+    return aggregate_launches(apply_filters(snapshot.launches, **_filters(query))).launch_frequency()
+
+
+ROUTES: Dict[str, Callable[[Snapshot, Dict[str, List[str]]], Any]] = {
+    '/health': _health,
+    '/launches': _launches,
+    '/statistics': _statistics,
+    '/success-rates': _success_rates,
+    '/sites': _sites,
+    '/frequency': _frequency,
+}
+
+# A listing can cover the whole history, so /launches memoizes the positions
+# of its rows and renders them for each request instead of keeping the body
+RENDERERS: Dict[str, Callable[[Snapshot, Any], Any]] = {
+    '/launches': _render_launches,
+}
+
+
+def make_handler(service: TrackerService) -> type:
+    class TrackerRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == '/metrics':
+                self._send(200, 'text/plain; version=0.0.4', METRICS.to_prometheus().encode('utf-8'))
+                return
+            # Read the reference once so the whole request sees a single snapshot
+            snapshot = service.snapshot
+            try:
+                route = ROUTES.get(url.path)
+                if route is None:
+                    raise HTTPError(404, f"Unknown path {url.path}")
+                if snapshot is None:
+                    raise HTTPError(503, "No data loaded yet")
+                query = parse_qs(url.query)
+                # Requests still on the previous snapshot use its version, so they never mix results
+                result = service.queries.get_or_compute(
+                    url.path, str(snapshot.version), dict(_filters(query), **_page(query)),
+                    lambda: route(snapshot, query)
+                )
+                render = RENDERERS.get(url.path)
+                status, body = 200, render(snapshot, result) if render else result
+            except HTTPError as e:
+                status, body = e.status, {'error': str(e)}
+
+            self._send(status, 'application/json', json.dumps(body, default=str).encode('utf-8'))
+
+        def _send(self, status: int, content_type: str, payload: bytes) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return TrackerRequestHandler
+
+
+def serve(service: TrackerService, host: str = "127.0.0.1", port: int = 8080) -> None:
+    """Start background refreshes and serve HTTP until interrupted"""
+    service.start()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    logger.info(f"Serving on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
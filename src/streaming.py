@@ -0,0 +1,59 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DELIMITERS = frozenset(' \t\n\r,]')
+_START, _FIRST, _ITEM, _NEXT, _DONE = range(5)
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array while its bytes are still arriving.
+
+    Only the undecoded tail of the input and the item being parsed are held in
+    memory, so peak memory follows the largest item rather than the array.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer, position, state, eof = '', 0, _START, False
+
+    while state != _DONE:
+        position = _WHITESPACE.match(buffer, position).end()
+        progressed = False
+        if position < len(buffer):
+            char = buffer[position]
+            if state == _START:
+                if char != '[':
+                    raise ValueError(f"Expected a JSON array, found {char!r}")
+                position, state, progressed = position + 1, _FIRST, True
+            elif state in (_FIRST, _NEXT) and char == ']':
+                position, state, progressed = position + 1, _DONE, True
+            elif state == _NEXT:
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+                position, state, progressed = position + 1, _ITEM, True
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    # A number (or a value running up to the end of the buffer) may
+                    # continue in the next chunk until a delimiter follows it
+                    if eof or (end < len(buffer) and (buffer[end - 1] in '"}]' or buffer[end] in _DELIMITERS)):
+                        position, state, progressed = end, _NEXT, True
+                        yield item
+
+        if not progressed:
+            if eof:
+                raise ValueError("JSON array ended unexpectedly")
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                text = utf8.decode(b'', final=True)
+            else:
+                text = utf8.decode(chunk)
+            buffer, position = buffer[position:] + text, 0
@@ -0,0 +1,74 @@
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+TABLE_FORMATS = ('grid', 'plain', 'tsv')
+
+# Rows measured for the column widths before the first line is written
+SAMPLE_SIZE = 1000
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _fit(text: str, width: int, right: bool) -> str:
+    if len(text) > width:
+        text = text[:width - 3] + "..." if width > 3 else text[:width]
+    return text.rjust(width) if right else text.ljust(width)
+
+
+def column_widths(headers: Sequence[str], rows: List[Sequence[Any]]) -> List[int]:
+    """Widths fitting the headers and rows, leaving headers the padding tabulate gives them"""
+    widths = [len(header) + 2 for header in headers]
+    for row in rows:
+        widths = [max(width, len(_text(value))) for width, value in zip(widths, row)]
+    return widths
+
+
+def render_table(rows: Iterable[Sequence[Any]], headers: Sequence[str], table_format: str = 'grid',
+                 widths: Optional[Sequence[int]] = None, sample_size: int = SAMPLE_SIZE) -> Iterator[str]:
+    """Yield the lines of a table as its rows are produced, laid out like tabulate's grid or plain.
+
+    Column widths are the given ones or measured on the first sample_size
+    rows, and later cells that do not fit are cut short. Columns whose
+    sampled values are all numbers are right-aligned. tsv has no padding:
+    values are written as they are, with tabs and newlines turned to spaces.
+    """
+    rows = iter(rows)
+    if table_format == 'tsv':
+        clean = lambda value: _text(value).replace("\t", " ").replace("\n", " ")
+        yield "\t".join(headers)
+        for row in rows:
+            yield "\t".join(map(clean, row))
+        return
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format: {table_format}")
+
+    sample = list(islice(rows, sample_size))
+    if widths is None:
+        widths = column_widths(headers, sample)
+    right = []
+    for column in range(len(headers)):
+        values = [row[column] for row in sample if row[column] is not None]
+        right.append(bool(values) and all(map(_is_number, values)))
+
+    def cells(row: Sequence[Any]) -> List[str]:
+        return [_fit(_text(value), width, align) for value, width, align in zip(row, widths, right)]
+
+    if table_format == 'plain':
+        yield "  ".join(cells(headers)).rstrip()
+        for row in chain(sample, rows):
+            yield "  ".join(cells(row)).rstrip()
+        return
+
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    yield border
+    yield "| " + " | ".join(cells(headers)) + " |"
+    yield border.replace("-", "=")
+    for row in chain(sample, rows):
+        yield "| " + " | ".join(cells(row)) + " |"
+        yield border
@@ -0,0 +1,323 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .logger import setup_logger
+
+logger = setup_logger("main", level=10)
+
+# requests (and asyncio and aiohttp for AsyncTransport) are imported inside the transports so
+# that building a TransportConfig (e.g. from CLI flags) stays cheap on runs that never touch the network
+
+
+@dataclass
+class TransportConfig:
+    """Tuning for the HTTP layer shared by every API request"""
+    timeout: float = 10
+    pool_connections: int = 4
+    pool_maxsize: int = 8
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    # Consecutive failed requests before the circuit opens, and how long it stays open
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+    def __init__(self, url: str, retry_in: float):
+        self.url = url
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open, not requesting {url} for another {retry_in:.1f}s")
+
+
+class CircuitBreaker:
+    """Stops sending requests to an upstream that keeps failing.
+
+    After failure_threshold consecutive failures the circuit opens and requests
+    fail fast. Once reset_timeout has passed a single trial request is let
+    through; its outcome closes the circuit again or restarts the timeout.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - self.clock())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.retry_in() == 0:
+                self.state = self.HALF_OPEN
+                return True
+            # Open, or half-open with the trial request still in flight
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Opening circuit after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = self.clock()
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Coalescer:
+    """Lets concurrent callers with the same key share a single in-flight call"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+def retry_after(headers: Any, now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header, given as seconds or an HTTP date"""
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class Transport:
+    """Sends requests through a bounded connection pool with retries and a circuit breaker.
+
+    Transient failures (connection errors, timeouts and retry_statuses) are
+    retried with capped exponential backoff and full jitter, waiting at least
+    as long as the server asks for in Retry-After. Identical concurrent GETs
+    are coalesced into one request.
+    """
+
+    def __init__(self, session: Any, config: Optional[TransportConfig] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        from requests.adapters import HTTPAdapter
+
+        self.session = session
+        self.config = config or TransportConfig()
+        self.sleep = sleep
+        self.breaker = CircuitBreaker(self.config.failure_threshold, self.config.reset_timeout)
+        self._inflight = Coalescer()
+
+        # Retries are handled here, so urllib3 must not retry on its own as well
+        adapter = HTTPAdapter(pool_connections=self.config.pool_connections,
+                              pool_maxsize=self.config.pool_maxsize, pool_block=True, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None,
+            stream: bool = False) -> Any:
+        kwargs: Dict[str, Any] = {'params': params}
+        if headers:
+            kwargs['headers'] = headers
+        if stream:
+            # A streamed body can only be read once, so it cannot be shared
+            return self._send(self.session.get, url, stream=True, **kwargs)
+        key = (url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items())))
+        return self._inflight.run(key, lambda: self._send(self.session.get, url, **kwargs))
+
+    def post(self, url: str, payload: Any) -> Any:
+        return self._send(self.session.post, url, json=payload)
+
+    def _send(self, method: Callable[..., Any], url: str, **kwargs) -> Any:
+        from requests.exceptions import ConnectionError, Timeout
+
+        if not self.breaker.allow():
+            raise CircuitOpenError(url, self.breaker.retry_in())
+
+        attempt = 0
+        while True:
+            try:
+                response = method(url, timeout=self.config.timeout, **kwargs)
+            except (ConnectionError, Timeout) as e:
+                if attempt >= self.config.max_retries:
+                    self.breaker.record_failure()
+                    raise
+                delay, reason = self.backoff(attempt), repr(e)
+            except Exception:
+                # Not worth retrying, but a half-open circuit still needs an outcome
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in self.config.retry_statuses:
+                    self.breaker.record_success()
+                    return response
+                requested = retry_after(response.headers)
+                # A server asking for more than backoff_max gets the failure reported instead
+                if attempt >= self.config.max_retries or (requested or 0) > self.config.backoff_max:
+                    self.breaker.record_failure()
+                    return response
+                delay, reason = max(self.backoff(attempt), requested or 0), f"HTTP {response.status_code}"
+
+                # Hand the connection back to the pool before waiting
+                response.close()
+
+            attempt += 1
+            logger.warning(f"{reason} from {url}, retry {attempt}/{self.config.max_retries} in {delay:.2f}s")
+            self.sleep(delay)
+
+
+@dataclass
+class AsyncResponse:
+    """Status, headers and body of a response whose connection is already back in the pool"""
+    status: int
+    headers: Any
+    content: bytes
+
+
+class AsyncTransport:
+    """asyncio counterpart of Transport, sending requests through one pooled aiohttp session.
+
+    Retries, backoff, Retry-After, the circuit breaker and GET coalescing
+    behave as in Transport. Bodies are read before returning an AsyncResponse,
+    so the connection is back in the pool by the time a caller sees it. The
+    session is created on first use, inside the running loop.
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None, headers: Optional[Dict[str, str]] = None,
+                 sleep: Optional[Callable[[float], Any]] = None):
+        import asyncio
+
+        self.config = config or TransportConfig()
+        self.headers = headers or {}
+        self.sleep = sleep or asyncio.sleep
+        self.breaker = CircuitBreaker(self.config.failure_threshold, self.config.reset_timeout)
+        self._session: Any = None
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    @property
+    def session(self) -> Any:
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise RuntimeError("The async client requires aiohttp (pip install aiohttp)")
+            connector = aiohttp.TCPConnector(limit=self.config.pool_maxsize,
+                                             limit_per_host=self.config.pool_maxsize)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                                  timeout=aiohttp.ClientTimeout(total=self.config.timeout))
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+
+    async def get(self, url: str, params: Optional[Dict] = None,
+                  headers: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        import asyncio
+
+        key = (url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items())))
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(self._send('GET', url, params=params, headers=headers))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller does not cancel the request for everyone sharing it
+        return await asyncio.shield(future)
+
+    async def post(self, url: str, payload: Any) -> AsyncResponse:
+        return await self._send('POST', url, json=payload)
+
+    async def _send(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        import asyncio
+        import aiohttp
+
+        if not self.breaker.allow():
+            raise CircuitOpenError(url, self.breaker.retry_in())
+
+        attempt = 0
+        while True:
+            try:
+                async with self.session.request(method, url, **kwargs) as raw:
+                    response = AsyncResponse(raw.status, raw.headers, await raw.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.config.max_retries:
+                    self.breaker.record_failure()
+                    raise
+                delay, reason = self.backoff(attempt), repr(e)
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status not in self.config.retry_statuses:
+                    self.breaker.record_success()
+                    return response
+                requested = retry_after(response.headers)
+                if attempt >= self.config.max_retries or (requested or 0) > self.config.backoff_max:
+                    self.breaker.record_failure()
+                    return response
+                delay, reason = max(self.backoff(attempt), requested or 0), f"HTTP {response.status}"
+
+            attempt += 1
+            logger.warning(f"{reason} from {url}, retry {attempt}/{self.config.max_retries} in {delay:.2f}s")
+            await self.sleep(delay)
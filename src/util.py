@@ -1,14 +1,58 @@
-from datetime import date, datetime
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
 from .logger import setup_logger
+from .metrics import METRICS
 
 logger = setup_logger("main", level=10)
 
-def parse_date(launch_date):
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+SECONDS_PER_DAY = 86400
+
+@lru_cache(maxsize=65536)
+def _parse_date(launch_date) -> Optional[date]:
     try:
+        # ISO-8601 timestamps start with the calendar date, which fromisoformat reads directly
+        if len(launch_date) >= 10 and launch_date[4] == '-' and launch_date[7] == '-':
+            return date.fromisoformat(launch_date[:10])
         if '.' in launch_date and 'Z' in launch_date:
             return datetime.strptime(launch_date, "%Y-%m-%dT%H:%M:%S.%fZ").date()
         else:
             return  datetime.strptime(launch_date, "%Y-%m-%dT%H:%M:%SZ").date()
     except (ValueError, TypeError):
-        logger.warning("Recived invalid date {}", launch_date)
+        return None
+
+def parse_date(launch_date):
+    parsed = _parse_date(launch_date)
+    if parsed is None:
+        # Outside the cache, so every invalid date is counted, not just the first of each value
+        METRICS.inc("parse_failures_total", kind="date")
+        logger.warning("Received invalid date %r", launch_date)
         return date(1900, 1, 1)
+    return parsed
+
+@lru_cache(maxsize=None)
+def _utc_day(days: int) -> Tuple[date, str]:
+    # Bounded by the number of distinct launch days, so the cache stays small
+    launch_date = date.fromordinal(EPOCH_ORDINAL + days)
+    return launch_date, f"{launch_date.year}-{launch_date.month:02d}"
+
+def to_unix(day: date) -> int:
+    return calendar.timegm(day.timetuple())
+
+def unix_bounds(start_date: date, end_date: date) -> Tuple[int, int]:
+    """Half-open epoch range [start, end) covering both dates in UTC"""
+    return to_unix(start_date), to_unix(end_date + timedelta(days=1))
+
+def launch_timestamp(date_unix: Optional[int], date_utc: Optional[str]) -> int:
+    if isinstance(date_unix, int):
+        return date_unix
+    return to_unix(parse_date(date_utc))
+
+def launch_day(date_unix: Optional[int], date_utc: Optional[str]) -> Tuple[date, str]:
+    """UTC date of a launch and its YYYY-MM key, preferring date_unix over the ISO string"""
+    if isinstance(date_unix, int):
+        return _utc_day(date_unix // SECONDS_PER_DAY)
+    launch_date = parse_date(date_utc)
+    return launch_date, f"{launch_date.year}-{launch_date.month:02d}"
@@ -0,0 +1,111 @@
+import json
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: Any = None
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class StubServer:
+    """Local HTTP server that answers from registered route handlers"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Callable[[StubRequest], StubResponse]] = {}
+        self.requests: List[StubRequest] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, method: str, path: str, handler: Callable[[StubRequest], StubResponse]) -> None:
+        self.routes[(method, path)] = handler
+
+    def requests_for(self, path: str) -> List[StubRequest]:
+        with self._lock:
+            return [request for request in self.requests if request.path == path]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        path = urlsplit(handler.path).path
+        length = int(handler.headers.get('Content-Length') or 0)
+        raw = handler.rfile.read(length) if length else b""
+        request = StubRequest(method, path, dict(handler.headers), json.loads(raw) if raw else None)
+        with self._lock:
+            self.requests.append(request)
+
+        route = self.routes.get((method, path))
+        response = route(request) if route else StubResponse(status=404, body={'error': 'Not Found'})
+
+        payload = b"" if response.body is None or response.status == 304 else (
+            response.body if isinstance(response.body, bytes) else json.dumps(response.body).encode()
+        )
+        handler.send_response(response.status)
+        for name, value in response.headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        if payload:
+            handler.wfile.write(payload)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self, 'GET')
+
+            def do_POST(self):
+                stub._handle(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def respond_in_order(*responses: StubResponse) -> Callable[[StubRequest], StubResponse]:
+    """Route handler that injects faults by replaying responses in order, then repeating the last"""
+    remaining = list(responses)
+    lock = threading.Lock()
+
+    def handler(request: StubRequest) -> StubResponse:
+        with lock:
+            return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return handler
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
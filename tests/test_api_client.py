@@ -15,6 +15,7 @@ def test_make_request_success(mock_get, api_client):
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = {'test': 'data'}
+    mock_response.content = b'{"test": "data"}'
     mock_get.return_value = mock_response
     
     result = api_client._make_request('test')
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.api_client import APIError
+from src.async_cache_manager import AsyncCacheManager
+from src.cache_manager import CacheLoadError, CacheManager
+from src.transport import TransportConfig
+from tests.conftest import StubResponse, respond_in_order
+from tests.test_cache_manager import LAUNCH_DATA, LAUNCHPAD_DATA, ROCKET_DATA, _expire
+
+
+def _manager(stub_server, tmp_path):
+    manager = AsyncCacheManager(cache_dir=str(tmp_path / "cache"),
+                                transport=TransportConfig(backoff_base=0, max_retries=0))
+    manager.api_client.BASE_URL = stub_server.url
+    return manager
+
+
+def _route_collections(stub_server):
+    stub_server.route('GET', '/launches', lambda request: StubResponse(body=[LAUNCH_DATA]))
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(body=[ROCKET_DATA]))
+    stub_server.route('GET', '/launchpads', lambda request: StubResponse(body=[LAUNCHPAD_DATA]))
+
+
+def test_cache_is_shared_with_the_sync_manager(stub_server, tmp_path):
+    _route_collections(stub_server)
+
+    async def load():
+        async with _manager(stub_server, tmp_path) as manager:
+            first = await manager.get_all()
+            second = await manager.get_all()
+            return first, second
+
+    first, second = asyncio.run(load())
+    synced = CacheManager(cache_dir=str(tmp_path / "cache")).get_all()
+
+    assert [list(items) for items in first] == [list(items) for items in second] == [list(items) for items in synced]
+    assert len(stub_server.requests_for('/launches')) == 1
+
+
+def test_concurrent_callers_share_one_refresh(stub_server, tmp_path):
+    _route_collections(stub_server)
+
+    async def load():
+        async with _manager(stub_server, tmp_path) as manager:
+            return await asyncio.gather(*(manager.get_launches() for _ in range(5)))
+
+    results = asyncio.run(load())
+
+    assert all(list(launches) == list(results[0]) for launches in results)
+    assert len(stub_server.requests_for('/launches')) == 1
+
+
+def test_failures_serve_stale_copies_and_are_reported_per_endpoint(stub_server, tmp_path):
+    stub_server.route('GET', '/launches', respond_in_order(
+        StubResponse(body=[LAUNCH_DATA]), StubResponse(status=500),
+    ))
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(status=500))
+    stub_server.route('GET', '/launchpads', lambda request: StubResponse(body=[LAUNCHPAD_DATA]))
+
+    async def load():
+        async with _manager(stub_server, tmp_path) as manager:
+            await manager.get_launches()
+            _expire(manager.cache._get_cache_path("launches"))
+            launches = await manager.get_launches()
+            with pytest.raises(CacheLoadError) as exc_info:
+                await manager.get_all()
+            return launches, exc_info.value
+
+    launches, error = asyncio.run(load())
+
+    assert [launch.id for launch in launches] == ['test1']
+    assert list(error.errors) == ['rockets']
+    assert isinstance(error.errors['rockets'], APIError)
+
+
+def test_lookup_by_ids_reads_the_cache_before_the_api(stub_server, tmp_path):
+    rockets = [dict(ROCKET_DATA, id=f'r{i}', name=f'Rocket {i}') for i in range(3)]
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(body=rockets[:2]))
+    stub_server.route('POST', '/rockets/query', lambda request: StubResponse(body={
+        'docs': [rocket for rocket in rockets if rocket['id'] in request.body['query']['_id']['$in']],
+        'hasNextPage': False,
+    }))
+
+    async def load():
+        async with _manager(stub_server, tmp_path) as manager:
+            await manager.get_rockets()
+            return await manager.get_rockets_by_ids(['r2', 'r0', 'missing'])
+
+    found = asyncio.run(load())
+
+    assert [rocket.name for rocket in found.values()] == ['Rocket 2', 'Rocket 0']
+    queries = stub_server.requests_for('/rockets/query')
+    assert [request.body['query'] for request in queries] == [{'_id': {'$in': ['r2', 'missing']}}]
+
+
+def test_stale_cache_is_revalidated_in_the_background(stub_server, tmp_path):
+    def launches(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return StubResponse(status=304, headers={'ETag': '"v1"'})
+        return StubResponse(body=[LAUNCH_DATA], headers={'ETag': '"v1"'})
+
+    stub_server.route('GET', '/launches', launches)
+
+    async def load():
+        async with _manager(stub_server, tmp_path) as manager:
+            await manager.get_launches()
+            cache_path = manager.cache._get_cache_path("launches")
+            _expire(cache_path, hours=2)
+            stale = await manager.get_launches()
+            await manager.wait_for_revalidation()
+            return stale, manager.cache._is_fresh("launches")
+
+    stale, fresh = asyncio.run(load())
+
+    requests = stub_server.requests_for('/launches')
+    assert [launch.id for launch in stale] == ['test1']
+    assert requests[1].headers['If-None-Match'] == '"v1"'
+    assert fresh
+
+
+def test_cache_files_are_only_touched_off_the_event_loop(stub_server, tmp_path, monkeypatch):
+    _route_collections(stub_server)
+    on_loop = []
+
+    def record(method):
+        def wrapper(self, *args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(method.__name__)
+            except RuntimeError:
+                pass
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    for name in ('_age', '_load_collection', '_load_from_cache', '_save_to_cache'):
+        monkeypatch.setattr(CacheManager, name, record(getattr(CacheManager, name)))
+
+    async def load():
+        async with _manager(stub_server, tmp_path) as manager:
+            await manager.get_all()
+            _expire(manager.cache._get_cache_path("launches"), hours=2)
+            await manager.get_all()
+            await manager.get_rockets_by_ids([ROCKET_DATA['id']])
+
+    asyncio.run(load())
+
+    assert on_loop == []
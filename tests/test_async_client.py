@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.api_client import APIError, SpaceXAPIClient
+from src.async_client import AsyncSpaceXAPIClient
+from src.models import Launch
+from src.transport import TransportConfig
+from tests.conftest import StubResponse, respond_in_order
+from tests.test_cache_manager import LAUNCH_DATA, LAUNCHPAD_DATA, ROCKET_DATA
+
+FAST = TransportConfig(backoff_base=0, max_retries=2)
+
+
+def _client(stub_server, **kwargs):
+    client = AsyncSpaceXAPIClient(FAST, **kwargs)
+    client.BASE_URL = stub_server.url
+    return client
+
+
+def _route_collections(stub_server):
+    stub_server.route('GET', '/launches', lambda request: StubResponse(body=[LAUNCH_DATA]))
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(body=[ROCKET_DATA]))
+    stub_server.route('GET', '/launchpads', lambda request: StubResponse(body=[LAUNCHPAD_DATA]))
+
+
+def test_returns_the_same_models_as_the_sync_client(stub_server):
+    _route_collections(stub_server)
+    sync = SpaceXAPIClient(FAST)
+    sync.BASE_URL = stub_server.url
+
+    async def fetch():
+        async with _client(stub_server) as client:
+            return await client.get_all()
+
+    launches, rockets, launchpads = asyncio.run(fetch())
+
+    assert launches == sync.get_all_launches()
+    assert rockets == sync.get_all_rockets()
+    assert launchpads == sync.get_all_launchpads()
+
+
+def test_retries_transient_failures(stub_server):
+    stub_server.route('GET', '/launches/test1', respond_in_order(
+        StubResponse(status=503), StubResponse(body=LAUNCH_DATA),
+    ))
+
+    async def fetch():
+        async with _client(stub_server) as client:
+            return await client.get_launch_by_id('test1')
+
+    assert asyncio.run(fetch()) == Launch(**LAUNCH_DATA)
+    assert len(stub_server.requests_for('/launches/test1')) == 2
+
+
+def test_failed_fetch_raises_api_error(stub_server):
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(status=500))
+
+    async def fetch():
+        async with _client(stub_server) as client:
+            return await client.get_all_rockets()
+
+    with pytest.raises(APIError):
+        asyncio.run(fetch())
+
+
+def test_concurrent_requests_stay_under_the_limit(stub_server):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow(request):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return StubResponse(body=dict(LAUNCH_DATA, id=request.path.rsplit('/', 1)[-1]))
+
+    for number in range(6):
+        stub_server.route('GET', f'/launches/l{number}', slow)
+
+    async def fetch():
+        async with _client(stub_server, concurrency=2) as client:
+            return await asyncio.gather(*(client.get_launch_by_id(f'l{number}') for number in range(6)))
+
+    launches = asyncio.run(fetch())
+
+    assert [launch.id for launch in launches] == [f'l{number}' for number in range(6)]
+    assert peak[0] == 2
+
+
+def test_by_ids_are_fetched_in_concurrent_batches(stub_server):
+    launches = [dict(LAUNCH_DATA, id=f'l{number}', flight_number=number) for number in range(5)]
+    stub_server.route('POST', '/launches/query', lambda request: StubResponse(body={
+        'docs': [launch for launch in launches if launch['id'] in request.body['query']['_id']['$in']],
+        'hasNextPage': False,
+    }))
+
+    async def fetch():
+        async with _client(stub_server) as client:
+            client.ID_BATCH_SIZE = 2
+            return await client.get_by_ids('launches', Launch, ['l4', 'l0', 'l2', 'l1', 'l3'])
+
+    found = asyncio.run(fetch())
+
+    assert sorted(launch.id for launch in found) == [f'l{number}' for number in range(5)]
+    assert len(stub_server.requests_for('/launches/query')) == 3
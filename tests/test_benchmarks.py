@@ -0,0 +1,37 @@
+from benchmarks.run import compare, run
+from benchmarks.synthetic import generate_dataset
+from src.api_client import _build_all
+from src.models import Launch, Rocket, Launchpad
+
+
+def test_synthetic_dataset_is_deterministic_and_valid():
+    launches, rockets, launchpads = generate_dataset(200, seed=7)
+
+    assert (launches, rockets, launchpads) == generate_dataset(200, seed=7)
+    assert launches != generate_dataset(200, seed=8)[0]
+    built = list(_build_all(Launch, launches))
+    list(_build_all(Rocket, rockets))
+    list(_build_all(Launchpad, launchpads))
+    assert [launch.date_unix for launch in built] == sorted(launch.date_unix for launch in built)
+    assert {launch.rocket for launch in built} <= {rocket['id'] for rocket in rockets}
+    assert any(launch.upcoming for launch in built) and any(launch.success is False for launch in built)
+
+
+def test_run_records_time_and_memory_per_benchmark():
+    results = run([50], repeat=1, only="filter_by")
+
+    assert {result['name'] for result in results['results']} == {
+        'filter_by_rocket', 'filter_by_success', 'filter_by_launchpad', 'filter_by_date_range'
+    }
+    assert all(result['size'] == 50 and result['seconds'] >= 0 and result['peak_bytes'] >= 0
+               for result in results['results'])
+
+
+def test_compare_against_baseline():
+    baseline = {'results': [{'name': 'export/json', 'size': 10, 'seconds': 2.0, 'peak_bytes': 100}]}
+    current = {'results': [{'name': 'export/json', 'size': 10, 'seconds': 3.0, 'peak_bytes': 50},
+                           {'name': 'export/csv', 'size': 10, 'seconds': 1.0, 'peak_bytes': 50}]}
+
+    assert compare(current, baseline) == [
+        {'name': 'export/json', 'size': 10, 'time_ratio': 1.5, 'memory_ratio': 0.5}
+    ]
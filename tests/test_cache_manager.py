@@ -0,0 +1,442 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+from src.aggregate import LaunchAggregate
+from src.cache_manager import CacheManager, CacheLoadError
+from src.models import Launch, Rocket, Launchpad
+from src.locking import FileLock
+from src.metrics import METRICS
+from src.serializers import ColumnarSerializer, JSONSerializer, RecordWriter, SQLiteSerializer
+from src.transport import TransportConfig
+from tests.conftest import StubResponse, respond_in_order
+
+LAUNCH_DATA = {
+    'id': 'test1',
+    'flight_number': 1,
+    'name': 'Test Launch',
+    'date_utc': '2023-01-01T00:00:00.000Z',
+    'date_unix': 1672531200,
+    'date_local': '2023-01-01T00:00:00-05:00',
+    'date_precision': 'hour',
+    'rocket': 'falcon9',
+    'success': True,
+    'upcoming': False,
+    'launchpad': 'ksc_lc_39a',
+}
+
+ROCKET_DATA = {
+    'id': 'falcon9',
+    'name': 'Falcon 9',
+    'type': 'rocket',
+    'active': True,
+    'stages': 2,
+    'boosters': 0,
+    'cost_per_launch': 50000000,
+    'success_rate_pct': 98,
+    'first_flight': '2010-06-04',
+    'country': 'United States',
+    'company': 'SpaceX',
+    'height': {'meters': 70},
+    'diameter': {'meters': 3.7},
+    'mass': {'kg': 549054},
+}
+
+LAUNCHPAD_DATA = {
+    'id': 'ksc_lc_39a',
+    'name': 'KSC LC 39A',
+    'full_name': 'Kennedy Space Center Historic Launch Complex 39A',
+    'status': 'active',
+    'locality': 'Cape Canaveral',
+    'region': 'Florida',
+    'timezone': 'America/New_York',
+    'latitude': 28.6080585,
+    'longitude': -80.6039558,
+    'launch_attempts': 55,
+    'launch_successes': 54,
+}
+
+
+@pytest.fixture
+def cache_manager(tmp_path):
+    return CacheManager(cache_dir=str(tmp_path / "cache"))
+
+
+@patch('src.api_client.SpaceXAPIClient.get_all_launchpads')
+@patch('src.api_client.SpaceXAPIClient.get_all_rockets')
+@patch('src.api_client.SpaceXAPIClient.stream_launches')
+def test_get_all_fetches_concurrently(mock_launches, mock_rockets, mock_launchpads, cache_manager):
+    # Every fetch waits on the barrier, so this only completes if all three run at once
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fetch(result):
+        def wait():
+            barrier.wait()
+            return result
+        return wait
+
+    mock_launches.side_effect = fetch([Launch(**LAUNCH_DATA)])
+    mock_rockets.side_effect = fetch([Rocket(**ROCKET_DATA)])
+    mock_launchpads.side_effect = fetch([Launchpad(**LAUNCHPAD_DATA)])
+
+    launches, rockets, launchpads = cache_manager.get_all(force_refresh=True)
+
+    assert [launch.id for launch in launches] == ['test1']
+    assert [rocket.id for rocket in rockets] == ['falcon9']
+    assert [launchpad.id for launchpad in launchpads] == ['ksc_lc_39a']
+
+
+@patch('src.api_client.SpaceXAPIClient.get_all_launchpads')
+@patch('src.api_client.SpaceXAPIClient.get_all_rockets')
+@patch('src.api_client.SpaceXAPIClient.stream_launches')
+def test_get_all_reports_errors_per_endpoint(mock_launches, mock_rockets, mock_launchpads, cache_manager):
+    mock_launches.return_value = [Launch(**LAUNCH_DATA)]
+    mock_rockets.side_effect = ValueError('rockets down')
+    mock_launchpads.side_effect = ValueError('launchpads down')
+
+    with pytest.raises(CacheLoadError) as exc_info:
+        cache_manager.get_all(force_refresh=True)
+
+    assert set(exc_info.value.errors) == {'rockets', 'launchpads'}
+    assert 'rockets down' in str(exc_info.value)
+
+
+def _expire(cache_path, hours=400 * 24):
+    # By default past every policy's stale window, so the refresh happens in the foreground
+    stale = cache_path.stat().st_mtime - hours * 3600
+    os.utime(cache_path, (stale, stale))
+
+
+def test_revalidation_renews_cache_on_not_modified(stub_server, cache_manager):
+    def launches(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return StubResponse(status=304, headers={'ETag': '"v1"'})
+        return StubResponse(body=[LAUNCH_DATA], headers={
+            'ETag': '"v1"', 'Last-Modified': 'Sun, 01 Jan 2023 00:00:00 GMT'
+        })
+
+    stub_server.route('GET', '/launches', launches)
+    cache_manager.api_client.BASE_URL = stub_server.url
+
+    first = cache_manager.get_launches(force_refresh=False)
+    cache_path = cache_manager._get_cache_path("launches")
+    _expire(cache_path)
+    written = cache_path.stat().st_ino, cache_path.read_bytes()
+
+    second = cache_manager.get_launches(force_refresh=False)
+
+    requests = stub_server.requests_for('/launches')
+    assert len(requests) == 2
+    assert 'If-None-Match' not in requests[0].headers
+    assert requests[1].headers['If-None-Match'] == '"v1"'
+    assert requests[1].headers['If-Modified-Since'] == 'Sun, 01 Jan 2023 00:00:00 GMT'
+    assert list(second) == list(first)
+    assert (cache_path.stat().st_ino, cache_path.read_bytes()) == written
+    # Renewed for the launches policy's full ttl
+    assert cache_manager._is_fresh("launches")
+    assert time.time() - cache_path.stat().st_mtime < cache_manager.policies["launches"].ttl
+
+
+def test_revalidation_replaces_cache_when_modified(stub_server, cache_manager):
+    versions = iter([('"v1"', [LAUNCH_DATA]), ('"v2"', [dict(LAUNCH_DATA, name='Renamed')])])
+
+    def launches(request):
+        etag, body = next(versions)
+        return StubResponse(body=body, headers={'ETag': etag})
+
+    stub_server.route('GET', '/launches', launches)
+    cache_manager.api_client.BASE_URL = stub_server.url
+
+    cache_manager.get_launches(force_refresh=False)
+    _expire(cache_manager._get_cache_path("launches"))
+    launches = cache_manager.get_launches(force_refresh=False)
+
+    assert launches[0].name == 'Renamed'
+    assert cache_manager._load_validators("launches").etag == '"v2"'
+
+
+def test_incremental_sync_merges_delta_pages(stub_server, cache_manager):
+    history = [
+        dict(LAUNCH_DATA, id='old', flight_number=1, date_unix=1000),
+        dict(LAUNCH_DATA, id='flying', flight_number=2, date_unix=2000, success=None, upcoming=True),
+        dict(LAUNCH_DATA, id='scrubbed', flight_number=3, date_unix=3000, success=None, upcoming=True),
+    ]
+    delta = [
+        dict(LAUNCH_DATA, id='flying', flight_number=2, date_unix=2000, success=True, upcoming=False),
+        dict(LAUNCH_DATA, id='new', flight_number=4, date_unix=4000, success=None, upcoming=True),
+    ]
+
+    def query(request):
+        page, limit = request.body['options']['page'], request.body['options']['limit']
+        docs = delta[(page - 1) * limit:page * limit]
+        has_next = page * limit < len(delta)
+        return StubResponse(body={'docs': docs, 'page': page, 'hasNextPage': has_next,
+                                  'nextPage': page + 1 if has_next else None})
+
+    stub_server.route('GET', '/launches', lambda request: StubResponse(body=history))
+    stub_server.route('POST', '/launches/query', query)
+    cache_manager.api_client.BASE_URL = stub_server.url
+    cache_manager.api_client.QUERY_PAGE_SIZE = 1
+
+    cache_manager.get_launches(force_refresh=False, incremental=True)
+    launches = cache_manager.get_launches(force_refresh=True, incremental=True)
+
+    assert len(stub_server.requests_for('/launches')) == 1
+    queries = stub_server.requests_for('/launches/query')
+    assert [request.body['options']['page'] for request in queries] == [1, 2]
+    assert {'date_unix': {'$gte': 1000}} in queries[0].body['query']['$or']
+    assert [launch.id for launch in launches] == ['old', 'flying', 'new']
+    assert launches[1].success is True
+    sync_state = cache_manager._load_from_cache(cache_manager._get_sync_state_path("launches"))
+    assert sync_state['date_unix'] == 2000 and sync_state['flight_number'] == 2
+
+
+def test_incremental_sync_periodically_takes_a_full_snapshot(stub_server, cache_manager):
+    undated = dict(LAUNCH_DATA, id='undated', flight_number=None, date_unix=None, upcoming=False)
+    versions = iter([[LAUNCH_DATA, undated], [dict(LAUNCH_DATA, name='Corrected'), undated]])
+    stub_server.route('GET', '/launches', lambda request: StubResponse(body=next(versions)))
+    stub_server.route('POST', '/launches/query', lambda request: StubResponse(body={
+        'docs': [], 'page': 1, 'hasNextPage': False, 'nextPage': None,
+    }))
+    cache_manager.api_client.BASE_URL = stub_server.url
+    sync_state_path = cache_manager._get_sync_state_path("launches")
+
+    cache_manager.get_launches(force_refresh=False, incremental=True)
+    assert cache_manager._load_from_cache(sync_state_path)['date_unix'] == LAUNCH_DATA['date_unix']
+    cache_manager.get_launches(force_refresh=True, incremental=True)
+    assert len(stub_server.requests_for('/launches')) == 1
+
+    sync_state = cache_manager._load_from_cache(sync_state_path)
+    sync_state['full_sync_at'] -= cache_manager.FULL_SYNC_INTERVAL
+    cache_manager._save_to_cache(sync_state_path, sync_state)
+    launches = cache_manager.get_launches(force_refresh=True, incremental=True)
+
+    assert len(stub_server.requests_for('/launches')) == 2
+    assert launches[0].name == 'Corrected'
+    assert time.time() - cache_manager._load_from_cache(sync_state_path)['full_sync_at'] < 60
+
+
+def test_failed_merge_write_keeps_the_sync_state(stub_server, cache_manager, monkeypatch):
+    new = dict(LAUNCH_DATA, id='new', flight_number=2, date_unix=LAUNCH_DATA['date_unix'] + 1)
+    stub_server.route('GET', '/launches', lambda request: StubResponse(body=[LAUNCH_DATA]))
+    stub_server.route('POST', '/launches/query', lambda request: StubResponse(body={
+        'docs': [new], 'page': 1, 'hasNextPage': False, 'nextPage': None,
+    }))
+    cache_manager.api_client.BASE_URL = stub_server.url
+    cache_manager.get_launches(force_refresh=False, incremental=True)
+    sync_state_path = cache_manager._get_sync_state_path("launches")
+    mark = cache_manager._load_from_cache(sync_state_path)
+
+    class FullDiskWriter(RecordWriter):
+        def write(self, record):
+            raise IOError("No space left on device")
+
+    monkeypatch.setattr(cache_manager.serializer, 'writer', FullDiskWriter)
+    with pytest.raises(IOError):
+        cache_manager.get_launches(force_refresh=True, incremental=True)
+
+    assert cache_manager._load_from_cache(sync_state_path) == mark
+    assert cache_manager.get_launch_aggregate().statistics()['total_launches'] == 1
+
+
+def test_serves_stale_cache_when_api_fails(stub_server, cache_manager):
+    stub_server.route('GET', '/launches', respond_in_order(
+        StubResponse(body=[LAUNCH_DATA]), StubResponse(status=503)
+    ))
+    cache_manager.api_client.BASE_URL = stub_server.url
+    cache_manager.api_client.transport.sleep = lambda delay: None
+
+    first = cache_manager.get_launches(force_refresh=False)
+    _expire(cache_manager._get_cache_path("launches"))
+    second = cache_manager.get_launches(force_refresh=False)
+
+    assert list(second) == list(first)
+    assert len(stub_server.requests_for('/launches')) == 1 + 1 + TransportConfig().max_retries
+
+
+def test_stale_cache_is_served_while_revalidating(stub_server, cache_manager):
+    stub_server.route('GET', '/launches', respond_in_order(
+        StubResponse(body=[LAUNCH_DATA]), StubResponse(body=[dict(LAUNCH_DATA, name='Renamed')])
+    ))
+    cache_manager.api_client.BASE_URL = stub_server.url
+
+    cache_manager.get_launches(force_refresh=False)
+    _expire(cache_manager._get_cache_path("launches"), hours=2)
+    stale = cache_manager.get_launches(force_refresh=False)
+    cache_manager.wait_for_revalidation(timeout=5)
+    fresh = cache_manager.get_launches(force_refresh=False)
+
+    assert stale[0].name == 'Test Launch'
+    assert fresh[0].name == 'Renamed'
+    assert len(stub_server.requests_for('/launches')) == 2
+
+
+def test_failed_fetch_is_not_retried_within_negative_ttl(stub_server, cache_manager):
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(status=404))
+    cache_manager.api_client.BASE_URL = stub_server.url
+
+    from src.api_client import APIError
+    for _ in range(3):
+        with pytest.raises(APIError):
+            cache_manager.get_rockets(force_refresh=False)
+    assert len(stub_server.requests_for('/rockets')) == 1
+
+    with pytest.raises(APIError):
+        cache_manager.get_rockets(force_refresh=True)
+    assert len(stub_server.requests_for('/rockets')) == 2
+
+
+def test_size_cap_evicts_least_recently_refreshed(stub_server, tmp_path):
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(body=[ROCKET_DATA]))
+    stub_server.route('GET', '/launchpads', lambda request: StubResponse(body=[LAUNCHPAD_DATA]))
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"), max_cache_bytes=1)
+    manager.api_client.BASE_URL = stub_server.url
+
+    manager.get_rockets(force_refresh=False)
+    manager.get_launchpads(force_refresh=False)
+
+    assert not manager._get_cache_path("rockets").exists()
+    assert manager._get_cache_path("launchpads").exists()
+    assert manager._get_lock_path("rockets").exists()
+
+
+def test_statistics_follow_cache_updates(stub_server, cache_manager):
+    history = [dict(LAUNCH_DATA, id=f'l{number}', flight_number=number) for number in range(5)]
+    upcoming = dict(LAUNCH_DATA, id='next', flight_number=5, success=None, upcoming=True)
+    stub_server.route('GET', '/launches', respond_in_order(
+        StubResponse(body=history + [upcoming]),
+        StubResponse(body=history[1:] + [dict(upcoming, success=False, upcoming=False)]),
+    ))
+    cache_manager.api_client.BASE_URL = stub_server.url
+
+    cache_manager.get_launches(force_refresh=False)
+    first = cache_manager.get_launch_aggregate()
+    launches = cache_manager.get_launches(force_refresh=True)
+    second = cache_manager._load_aggregate()
+
+    assert first.statistics()['upcoming_launches'] == 1
+    assert second == LaunchAggregate.from_launches(launches)
+    assert second.statistics() == {'total_launches': 5, 'successful_launches': 4, 'failed_launches': 1,
+                                   'upcoming_launches': 0, 'success_rate': 80.0}
+
+
+def test_statistics_follow_local_sqlite_records(stub_server, tmp_path):
+    serializer = SQLiteSerializer()
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"), serializer=serializer)
+    stub_server.route('GET', '/launches', lambda request: StubResponse(body=[LAUNCH_DATA]))
+    manager.api_client.BASE_URL = stub_server.url
+    manager.get_launches(force_refresh=False)
+    assert manager.get_launch_aggregate().statistics()['total_launches'] == 1
+
+    # Written in place, so the file keeps its inode and may keep its size
+    serializer.append(manager._get_cache_path("launches"),
+                      [dict(LAUNCH_DATA, id=f'local{number}') for number in range(10)])
+
+    assert manager.get_launch_aggregate().statistics()['successful_launches'] == 11
+
+
+@pytest.mark.parametrize('serializer', [JSONSerializer(), ColumnarSerializer(), SQLiteSerializer()])
+def test_storing_first_and_empty_launches(tmp_path, serializer):
+    METRICS.reset()
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"), serializer=serializer)
+
+    manager._store_collection("launches", [Launch(**LAUNCH_DATA)], lambda: None)
+    # A cold cache is not a corrupt one
+    assert "parse_failures_total" not in METRICS.summary()
+
+    launches = manager._store_collection("launches", [], lambda: None)
+
+    assert list(launches) == []
+    assert manager.get_launch_aggregate().statistics()['total_launches'] == 0
+
+
+def test_lookup_by_ids_batches_missing_ids(stub_server, cache_manager):
+    rockets = [dict(ROCKET_DATA, id=f'r{i}', name=f'Rocket {i}') for i in range(4)]
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(body=rockets[:2]))
+    stub_server.route('POST', '/rockets/query', lambda request: StubResponse(body={
+        'docs': [rocket for rocket in rockets if rocket['id'] in request.body['query']['_id']['$in']],
+        'hasNextPage': False,
+    }))
+    cache_manager.api_client.BASE_URL = stub_server.url
+    cache_manager.get_rockets(force_refresh=False)
+
+    found = cache_manager.get_rockets_by_ids(['r3', 'r0', 'missing', 'r2', 'r0'])
+    again = cache_manager.get_rockets_by_ids(['r2', 'r3', 'r1'])
+
+    assert [rocket.name for rocket in found.values()] == ['Rocket 3', 'Rocket 0', 'Rocket 2']
+    assert list(again) == ['r2', 'r3', 'r1']
+    queries = stub_server.requests_for('/rockets/query')
+    assert [request.body['query'] for request in queries] == [{'_id': {'$in': ['r3', 'missing', 'r2']}}]
+
+
+def test_interrupted_stream_keeps_previous_cache(stub_server, cache_manager):
+    complete = json.dumps([LAUNCH_DATA, dict(LAUNCH_DATA, id='test2')]).encode()
+    stub_server.route('GET', '/launches', respond_in_order(
+        StubResponse(body=complete), StubResponse(body=complete[:len(complete) // 2 + 10])
+    ))
+    cache_manager.api_client.BASE_URL = stub_server.url
+
+    first = cache_manager.get_launches(force_refresh=False)
+    second = cache_manager.get_launches(force_refresh=True)
+
+    assert [launch.id for launch in second] == [launch.id for launch in first] == ['test1', 'test2']
+    assert cache_manager._load_validators("launches") is None
+
+
+def test_concurrent_refreshes_fetch_once(stub_server, tmp_path):
+    def slow_launches(request):
+        time.sleep(0.3)
+        return StubResponse(body=[LAUNCH_DATA])
+
+    stub_server.route('GET', '/launches', slow_launches)
+    results = []
+
+    def worker():
+        # Separate managers behave like separate processes sharing the cache directory
+        manager = CacheManager(cache_dir=str(tmp_path / "shared"))
+        manager.api_client.BASE_URL = stub_server.url
+        results.append([launch.id for launch in manager.get_launches(force_refresh=False)])
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [['test1']] * 5
+    assert len(stub_server.requests_for('/launches')) == 1
+
+
+def test_serves_previous_copy_while_another_process_refreshes(stub_server, cache_manager):
+    stub_server.route('GET', '/launches', lambda request: StubResponse(body=[LAUNCH_DATA]))
+    cache_manager.api_client.BASE_URL = stub_server.url
+    cache_manager.get_launches(force_refresh=False)
+    _expire(cache_manager._get_cache_path("launches"))
+
+    with FileLock(cache_manager._get_lock_path("launches")):
+        launches = cache_manager.get_launches(force_refresh=False)
+
+    assert [launch.id for launch in launches] == ['test1']
+    assert len(stub_server.requests_for('/launches')) == 1
+
+
+def test_refresh_invalidates_query_results(stub_server, cache_manager):
+    stub_server.route('GET', '/launches', respond_in_order(
+        StubResponse(body=[LAUNCH_DATA]),
+        StubResponse(body=[LAUNCH_DATA, dict(LAUNCH_DATA, id='test2', flight_number=2)]),
+    ))
+    cache_manager.api_client.BASE_URL = stub_server.url
+
+    launches = cache_manager.get_launches(force_refresh=False)
+    version = cache_manager.data_version(launches)
+    cache_manager.queries.put("rows", version, {'success': True}, [0])
+    assert cache_manager.queries.get("rows", version, {'success': True}) == [0]
+
+    refreshed = cache_manager.get_launches(force_refresh=True)
+    assert cache_manager.data_version(refreshed) != version
+    # Still the version that was loaded, not the file that replaced it
+    assert cache_manager.data_version(launches) == version
+    assert cache_manager.queries.get("rows", version, {'success': True}) is None
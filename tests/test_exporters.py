@@ -0,0 +1,98 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from src.exporters import export
+from tests.test_serializers import LAUNCHES
+
+RECORDS = [launch.to_dict() for launch in LAUNCHES]
+
+
+def _records():
+    # A generator, so exporters cannot rely on len() or a second pass
+    return (launch.to_dict() for launch in LAUNCHES)
+
+
+def test_json_matches_previous_export(tmp_path):
+    path = tmp_path / "launches.json"
+
+    assert export(_records(), "json", path) == len(RECORDS)
+    assert path.read_text() == json.dumps(RECORDS, indent=2, default=str)
+
+
+def test_ndjson_writes_one_record_per_line(tmp_path):
+    path = tmp_path / "launches.ndjson"
+    export(_records(), "ndjson", path)
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == RECORDS
+
+
+def test_csv_writes_nested_values_as_json(tmp_path):
+    path = tmp_path / "launches.csv"
+    export(_records(), "csv", path)
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == list(RECORDS[0])
+    assert json.loads(rows[0]['failures']) == RECORDS[0]['failures']
+    assert rows[2]['success'] == ''
+
+
+def test_gzip_to_stdout(capsysbinary):
+    export(_records(), "ndjson", None, "gzip")
+
+    lines = gzip.decompress(capsysbinary.readouterr().out).decode().splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "launches.ndjson.zst"
+    export(_records(), "ndjson", path, "zstd")
+
+    with zstandard.ZstdDecompressor().stream_reader(open(path, 'rb')) as reader:
+        assert [json.loads(line) for line in io.TextIOWrapper(reader)] == RECORDS
+
+
+def test_parquet_row_groups(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from src.exporters import ParquetExporter
+    monkeypatch.setattr(ParquetExporter, 'ROW_GROUP_SIZE', 2)
+    path = tmp_path / "launches.parquet"
+    export(_records(), "parquet", path, "gzip")
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().column('id').to_pylist() == [record['id'] for record in RECORDS]
+
+
+def test_parquet_types_columns_from_the_model(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from src.exporters import ParquetExporter
+    from src.models import Launch
+    monkeypatch.setattr(ParquetExporter, 'ROW_GROUP_SIZE', 2)
+    records = RECORDS[:2] + [dict(RECORDS[2], static_fire_date_unix=1727000000)]
+    path = tmp_path / "launches.parquet"
+
+    export(iter(records), "parquet", path, model=Launch)
+
+    table = pq.read_table(path)
+    assert str(table.schema.field('static_fire_date_unix').type) == 'int64'
+    assert table.column('static_fire_date_unix').to_pylist() == [None, None, 1727000000]
+    assert json.loads(table.column('failures').to_pylist()[0]) == RECORDS[0]['failures']
+
+
+def test_failed_parquet_export_leaves_no_file(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from src.exporters import ParquetExporter
+    monkeypatch.setattr(ParquetExporter, 'ROW_GROUP_SIZE', 2)
+    # Typed as a boolean by the first row group, without a model to say otherwise
+    records = [dict(record, tbd=value) for record, value in zip(RECORDS, [True, False, 1.5])]
+    path = tmp_path / "launches.parquet"
+
+    with pytest.raises(RuntimeError):
+        export(iter(records), "parquet", path)
+
+    assert not path.exists()
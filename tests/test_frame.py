@@ -0,0 +1,107 @@
+import random
+from datetime import date
+
+import pytest
+from src.frame import LaunchFrame
+from src.filters import page_launches
+from src.main import apply_filters
+from src.models import Launch, Rocket, Launchpad
+from src.util import to_unix
+from src.statistics import (
+    calculate_launch_frequency, calculate_success_rate_by_rocket, count_launches_by_site,
+    get_launch_statistics
+)
+
+ROCKETS = [Rocket(id=f'r{i}', name=f'Rocket {i}', type='rocket', active=True, stages=2, boosters=0,
+                  cost_per_launch=0, success_rate_pct=0, first_flight='2010-01-01', country='US',
+                  company='SpaceX', height={}, diameter={}, mass={}) for i in range(3)]
+LAUNCHPADS = [Launchpad(id=f'p{i}', name=f'Pad {i}', full_name='', status='active', locality='',
+                        region='', timezone='UTC', latitude=0.0, longitude=0.0, launch_attempts=0,
+                        launch_successes=0) for i in range(4)]
+
+
+def _launches(count):
+    generator = random.Random(42)
+    launches = []
+    for number in range(count):
+        day = date(2006, 1, 1).toordinal() + generator.randrange(365 * 18)
+        day = date.fromordinal(day)
+        upcoming = generator.random() < 0.1
+        launches.append(Launch(
+            id=f'l{number}', flight_number=number, name=f'Launch {number}',
+            date_utc=f'{day.isoformat()}T12:00:00.000Z',
+            date_unix=to_unix(day) + 12 * 3600, date_local='', date_precision='hour',
+            rocket=f'r{generator.randrange(4)}', launchpad=f'p{generator.randrange(5)}',
+            success=None if upcoming or generator.random() < 0.05 else generator.random() < 0.9,
+            upcoming=upcoming,
+        ))
+    return launches
+
+
+LAUNCHES = _launches(500)
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'rocket_id': 'r1'},
+    {'rocket_id': 'missing'},
+    {'success': True},
+    {'success': False, 'launchpad_id': 'p2'},
+    {'upcoming': True, 'rocket_id': 'r0'},
+    {'start_date': date(2010, 1, 1), 'end_date': date(2015, 12, 31), 'success': True},
+    {'start_date': LAUNCHES[7].utc_date, 'end_date': LAUNCHES[7].utc_date},
+])
+def test_frame_matches_list_functions(filters):
+    expected = apply_filters(LAUNCHES, **filters)
+    frame = apply_filters(LaunchFrame.from_launches(LAUNCHES), **filters)
+
+    assert isinstance(frame, LaunchFrame)
+    assert list(frame) == expected
+    assert get_launch_statistics(frame) == get_launch_statistics(expected)
+    assert calculate_success_rate_by_rocket(frame, ROCKETS) == \
+        calculate_success_rate_by_rocket(expected, ROCKETS)
+    assert list(calculate_success_rate_by_rocket(frame, ROCKETS)) == \
+        list(calculate_success_rate_by_rocket(expected, ROCKETS))
+    assert count_launches_by_site(frame, LAUNCHPADS) == count_launches_by_site(expected, LAUNCHPADS)
+    assert calculate_launch_frequency(frame) == calculate_launch_frequency(expected)
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'rocket_id': 'r1', 'launchpad_id': 'p2', 'success': True},
+    {'rocket_id': 'missing', 'success': False},
+    {'success': None},
+    {'success': False, 'upcoming': True},
+    {'upcoming': True, 'launchpad_id': 'p0'},
+    {'start_date': date(2010, 1, 1), 'end_date': date(2015, 12, 31), 'rocket_id': 'r3'},
+    {'start_date': date(2010, 1, 1), 'end_date': date(2010, 3, 31)},
+    {'start_date': date(2030, 1, 1), 'end_date': date(2031, 1, 1)},
+])
+def test_indexed_frame_matches_list_functions(filters):
+    frame = LaunchFrame.from_launches(LAUNCHES, indexed=True)
+
+    first, second = apply_filters(frame, **filters), apply_filters(frame, **filters)
+
+    assert list(first) == list(second) == apply_filters(LAUNCHES, **filters)
+    assert get_launch_statistics(first) == get_launch_statistics(apply_filters(LAUNCHES, **filters))
+
+
+def test_frame_of_empty_list():
+    frame = LaunchFrame.from_launches([])
+
+    assert len(apply_filters(frame, rocket_id='r1')) == 0
+    assert get_launch_statistics(frame) == get_launch_statistics([])
+
+
+@pytest.mark.parametrize('filters', [{}, {'success': True}, {'rocket_id': 'r1', 'launchpad_id': 'p2'}])
+@pytest.mark.parametrize('indexed', [False, True])
+@pytest.mark.parametrize('sort', ['date', 'flight'])
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('limit', [None, 7])
+def test_frame_pages_match_sorted_list(filters, indexed, sort, descending, limit):
+    frame = LaunchFrame.from_launches(LAUNCHES, indexed=indexed).filter(**filters)
+
+    page = page_launches(frame, sort, descending, offset=3, limit=limit)
+
+    assert isinstance(page, LaunchFrame)
+    assert list(page) == page_launches(list(frame), sort, descending, offset=3, limit=limit)
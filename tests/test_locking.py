@@ -0,0 +1,35 @@
+import pytest
+from src.locking import FileLock, write_atomic
+
+
+def test_lock_excludes_other_holders(tmp_path):
+    path = tmp_path / "launches.lock"
+    first, second = FileLock(path), FileLock(path)
+
+    assert first.acquire(blocking=False)
+    assert not second.acquire(blocking=False)
+    assert not second.acquire(timeout=0.1)
+    first.release()
+    assert second.acquire(blocking=False)
+    second.release()
+
+
+def test_write_atomic_replaces_file(tmp_path):
+    path = tmp_path / "launches.sync.json"
+    path.write_text("old")
+
+    write_atomic(path, "new")
+
+    assert path.read_text() == "new"
+    assert [child.name for child in tmp_path.iterdir()] == [path.name]
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "launches.sync.json"
+    path.write_text("old")
+
+    with pytest.raises(TypeError):
+        write_atomic(path, b"bytes in text mode")
+
+    assert path.read_text() == "old"
+    assert [child.name for child in tmp_path.iterdir()] == [path.name]
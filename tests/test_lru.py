@@ -0,0 +1,23 @@
+from src.lru import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put_many({'a': 1, 'b': 2})
+    cache.get('a')
+
+    cache.put('c', 3)
+
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+
+
+def test_expires_entries_after_ttl():
+    now = [0.0]
+    cache = LRUCache(maxsize=10, ttl=60, clock=lambda: now[0])
+    cache.put('a', 1)
+
+    now[0] = 59
+    assert cache.get('a') == 1
+    now[0] = 60
+    assert cache.get('a') is None
+    assert len(cache) == 0
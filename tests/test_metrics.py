@@ -0,0 +1,82 @@
+import pytest
+from src.metrics import METRICS, Metrics
+from tests.conftest import StubResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_counters_and_timers_summary():
+    clock = FakeClock()
+    metrics = Metrics(clock=clock)
+
+    metrics.inc("cache_requests_total", endpoint="launches", result="hit")
+    metrics.inc("cache_requests_total", 2, endpoint="launches", result="hit")
+    for seconds in (0.5, 1.5):
+        with metrics.timer("filter_seconds"):
+            clock.now += seconds
+
+    summary = metrics.summary()
+
+    assert summary["cache_requests_total"] == [
+        {'labels': {'endpoint': 'launches', 'result': 'hit'}, 'value': 3}
+    ]
+    assert summary["filter_seconds"] == [
+        {'labels': {}, 'count': 2, 'total': 2.0, 'mean': 1.0, 'min': 0.5, 'max': 1.5}
+    ]
+
+
+def test_timer_records_failed_blocks():
+    metrics = Metrics(clock=FakeClock())
+
+    with pytest.raises(ValueError):
+        with metrics.timer("aggregate_seconds"):
+            raise ValueError("boom")
+
+    assert metrics.summary()["aggregate_seconds"][0]['count'] == 1
+
+
+def test_prometheus_text_format():
+    metrics = Metrics(clock=FakeClock())
+    metrics.inc("http_responses_total", endpoint="launches", status=200)
+    metrics.inc("parse_failures_total", kind='da"te')
+    metrics.observe("http_request_seconds", 0.25, endpoint="launches")
+
+    assert metrics.to_prometheus() == (
+        '# TYPE http_responses_total counter\n'
+        'http_responses_total{endpoint="launches",status="200"} 1\n'
+        '# TYPE parse_failures_total counter\n'
+        'parse_failures_total{kind="da\\"te"} 1\n'
+        '# TYPE http_request_seconds summary\n'
+        'http_request_seconds_count{endpoint="launches"} 1\n'
+        'http_request_seconds_sum{endpoint="launches"} 0.25\n'
+    )
+
+
+def test_api_requests_and_cache_reads_are_recorded(stub_server, tmp_path):
+    from src.cache_manager import CacheManager
+    from tests.test_cache_manager import ROCKET_DATA
+
+    METRICS.reset()
+    stub_server.route('GET', '/rockets', lambda request: StubResponse(body=[ROCKET_DATA]))
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"))
+    manager.api_client.BASE_URL = stub_server.url
+
+    manager.get_rockets(force_refresh=False)
+    manager.get_rockets(force_refresh=False)
+
+    summary = METRICS.summary()
+    assert [(entry['labels']['result'], entry['value']) for entry in summary["cache_requests_total"]] == [
+        ('hit', 1), ('miss', 1)
+    ]
+    assert summary["http_responses_total"] == [
+        {'labels': {'endpoint': 'rockets', 'status': '200'}, 'value': 1}
+    ]
+    assert summary["http_response_bytes_total"][0]['value'] > 0
+    assert summary["models_built_total"] == [{'labels': {'model': 'Rocket'}, 'value': 1}]
+    assert summary["http_request_seconds"][0]['count'] == 1
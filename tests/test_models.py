@@ -0,0 +1,65 @@
+import pickle
+
+import pytest
+from src.models import Launch, RawJSON, Rocket
+
+LAUNCH_DATA = {
+    'id': '5eb87cd9ffd86e000604b32a',
+    'flight_number': 1,
+    'name': 'FalconSat',
+    'date_utc': '2006-03-24T22:30:00.000Z',
+    'date_unix': 1143239400,
+    'date_local': '2006-03-25T10:30:00+12:00',
+    'date_precision': 'hour',
+    'rocket': '5e9d0d95eda69955f709d1eb',
+    'success': False,
+    'launchpad': '5e9e4502f5090995de566f86',
+    'failures': [{'time': 33, 'altitude': None, 'reason': 'merlin engine failure'}],
+    'links': {'patch': {'small': 'https://images2.imgbox.com/94/f2/NN6Ph45r_o.png'}},
+}
+
+
+def test_models_are_slotted():
+    launch = Launch(**LAUNCH_DATA)
+
+    assert not hasattr(launch, '__dict__')
+    with pytest.raises(AttributeError):
+        launch.unknown_field = 1
+
+
+def test_to_dict_round_trip():
+    launch = Launch(**LAUNCH_DATA)
+
+    assert Launch(**launch.to_dict()) == launch
+    assert launch.to_dict()['failures'] == LAUNCH_DATA['failures']
+    assert list(launch.to_dict()) == list(Launch.__annotations__)
+
+
+def test_lazy_fields_decode_raw_json_once():
+    raw = dict(LAUNCH_DATA, links=RawJSON(b'{"webcast": "https://youtu.be/0a_00nJ_Y88"}'))
+    launch = Launch(**raw)
+
+    links = launch.links
+
+    assert links == {'webcast': 'https://youtu.be/0a_00nJ_Y88'}
+    assert launch.links is links
+    assert pickle.loads(pickle.dumps(launch)) == launch
+
+
+def test_repeated_ids_are_interned():
+    first = Launch(**dict(LAUNCH_DATA, rocket=''.join(['5e9d0d95eda69955', 'f709d1eb'])))
+    second = Launch(**dict(LAUNCH_DATA, rocket=''.join(['5e9d0d95eda6995', '5f709d1eb'])))
+
+    assert first.rocket is second.rocket
+
+
+def test_defaults_are_not_shared():
+    def rocket():
+        return Rocket(id='falcon1', name='Falcon 1', type='rocket', active=False, stages=2, boosters=0,
+                      cost_per_launch=6700000, success_rate_pct=40, first_flight='2006-03-24',
+                      country='Republic of the Marshall Islands', company='SpaceX', height={},
+                      diameter={}, mass={})
+
+    rocket().flickr_images.append('https://imgur.com/DaCfMsj.jpg')
+
+    assert rocket().flickr_images == []
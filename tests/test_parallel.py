@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+from src.frame import LaunchFrame
+from src.parallel import parallel_aggregate, shards
+from src.serializers import ColumnarSerializer
+from src.models import Launch
+from src.statistics import aggregate_launches
+from tests.test_frame import LAUNCHES, LAUNCHPADS, ROCKETS
+
+
+def _reports(aggregate):
+    # Compared as item lists so key order has to match as well
+    return (
+        list(aggregate.statistics().items()),
+        list(aggregate.success_rate_by_rocket(ROCKETS).items()),
+        list(aggregate.launches_by_site(LAUNCHPADS).items()),
+        [(name, list(counts.items())) for name, counts in aggregate.launch_frequency().items()],
+    )
+
+
+def test_shards_are_consecutive_and_balanced():
+    assert shards(10, 3, 1) == [(0, 4), (4, 7), (7, 10)]
+    assert shards(10, 8, 4) == [(0, 5), (5, 10)]
+    assert shards(3, 4, 10) == [(0, 3)]
+    assert shards(0, 4, 10) == [(0, 0)]
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'rocket_id': 'r1', 'success': True},
+    {'start_date': date(2010, 1, 1), 'end_date': date(2015, 12, 31)},
+])
+def test_parallel_aggregate_matches_serial(tmp_path, filters):
+    path = tmp_path / "launches.col"
+    ColumnarSerializer().dump(path, [launch.to_dict() for launch in LAUNCHES])
+    serial = _reports(aggregate_launches(LaunchFrame.from_launches(LAUNCHES).filter(**filters)))
+
+    from_list = parallel_aggregate(LAUNCHES, 3, min_shard_size=100, **filters)
+    from_cache = parallel_aggregate(ColumnarSerializer().load(path, Launch), 3, min_shard_size=100, **filters)
+
+    assert _reports(from_list) == _reports(from_cache) == serial
+
+
+def test_parallel_aggregate_ignores_a_replaced_cache_file(tmp_path):
+    path = tmp_path / "launches.col"
+    ColumnarSerializer().dump(path, [launch.to_dict() for launch in LAUNCHES])
+    loaded = ColumnarSerializer().load(path, Launch)
+    # A refresh replaces the file after the parent mapped it
+    ColumnarSerializer().dump(path, [launch.to_dict() for launch in LAUNCHES[:10]])
+
+    aggregate = parallel_aggregate(loaded, 3, min_shard_size=100)
+
+    assert _reports(aggregate) == _reports(aggregate_launches(LaunchFrame.from_launches(LAUNCHES)))
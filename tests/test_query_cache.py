@@ -0,0 +1,73 @@
+import json
+from array import array
+from datetime import datetime
+
+from src.query_cache import QueryCache, filter_key
+
+
+def test_filter_key_ignores_order_and_default_upcoming():
+    assert filter_key({'rocket_id': 'f9', 'success': True}) == filter_key({'success': True, 'rocket_id': 'f9'})
+    assert filter_key({'rocket_id': 'f9', 'upcoming': False}) == filter_key({'rocket_id': 'f9'})
+    assert filter_key({'upcoming': True}) != filter_key({})
+    assert filter_key({'start_date': datetime(2020, 1, 1)}) != filter_key({'start_date': datetime(2021, 1, 1)})
+
+
+def test_new_version_drops_results():
+    queries = QueryCache()
+    queries.put("rows", "v1", {'success': True}, [0, 2])
+
+    assert queries.get("rows", "v1", {'success': True}) == [0, 2]
+    assert queries.get("rows", "v1", {'success': False}) is None
+    assert queries.get("rows", "v2", {'success': True}) is None
+    assert queries.get("rows", "v1", {'success': True}) is None
+
+
+def test_results_bounded_by_lru():
+    queries = QueryCache(maxsize=2)
+    for number in range(3):
+        queries.put("rows", "v1", {'rocket_id': str(number)}, [number])
+
+    assert queries.get("rows", "v1", {'rocket_id': '0'}) is None
+    assert queries.get("rows", "v1", {'rocket_id': '2'}) == [2]
+
+
+def test_get_or_compute_runs_once():
+    queries = QueryCache()
+    calls = []
+    compute = lambda: calls.append(1) or {'total': 3}
+
+    assert queries.get_or_compute("stats", "v1", {}, compute) == {'total': 3}
+    assert queries.get_or_compute("stats", "v1", {}, compute) == {'total': 3}
+    assert len(calls) == 1
+
+
+def test_persisted_results_shared_until_cleared(tmp_path):
+    path = tmp_path / "launches.queries.json"
+    QueryCache(path=path).put("aggregate", "v1", {'success': True}, {'total': 4})
+
+    assert QueryCache(path=path).get("aggregate", "v1", {'success': True}) == {'total': 4}
+    assert QueryCache(path=path).get("aggregate", "v2", {'success': True}) is None
+
+    QueryCache(path=path).clear()
+    assert not path.exists()
+
+
+def test_positions_are_persisted_as_packed_integers(tmp_path):
+    path = tmp_path / "launches.queries.json"
+    positions = array('l', range(0, 300000, 3))
+    QueryCache(path=path).put("rows", "v1", {'success': True}, positions)
+
+    assert QueryCache(path=path).get("rows", "v1", {'success': True}) == positions
+    # Base64 of 4-byte integers, where a JSON list would take about 7 bytes per position
+    assert path.stat().st_size < len(positions) * 6
+
+
+def test_oversized_results_are_only_kept_in_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(QueryCache, 'MAX_PERSISTED_BYTES', 1000)
+    path = tmp_path / "launches.queries.json"
+    queries = QueryCache(path=path)
+    queries.put("aggregate", "v1", {'success': True}, {'total': 4})
+    queries.put("rows", "v1", {'success': True}, array('l', range(1000)))
+
+    assert queries.get("rows", "v1", {'success': True}) == array('l', range(1000))
+    assert [key for key, _ in json.loads(path.read_text())['entries']] == [["aggregate", '{"success":true}']]
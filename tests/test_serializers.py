@@ -0,0 +1,184 @@
+import sqlite3
+from datetime import date
+
+import pytest
+from src.main import apply_filters
+from src.frame import LaunchFrame
+from src.models import Launch
+from src.serializers import (
+    ColumnarSerializer, JSONSerializer, LazyRecords, SQLiteRecords, SQLiteSerializer
+)
+
+LAUNCHES = [
+    Launch(id='a', flight_number=1, name='FalconSat', date_utc='2006-03-24T22:30:00.000Z',
+           date_unix=1143239400, date_local='2006-03-25T10:30:00+12:00', date_precision='hour',
+           rocket='falcon1', success=False, launchpad='kwajalein',
+           failures=[{'time': 33, 'altitude': None, 'reason': 'merlin engine failure'}],
+           fairings={'reused': False, 'recovered': False}, links={'patch': {'small': None}}),
+    Launch(id='b', flight_number=2, name='CRS-20', date_utc='2020-03-07T04:50:31.000Z',
+           date_unix=1583556631, date_local='2020-03-06T23:50:31-05:00', date_precision='hour',
+           rocket='falcon9', success=True, launchpad='ccsfs', payloads=['p1', 'p2'],
+           cores=[{'core': 'c1', 'landing_success': True}]),
+    Launch(id='c', flight_number=3, name='Crew-9', date_utc='2024-09-28T17:17:00.000Z',
+           date_unix=1727543820, date_local='2024-09-28T13:17:00-04:00', date_precision='hour',
+           rocket='falcon9', upcoming=True, launchpad='ccsfs', window=0),
+]
+
+
+@pytest.mark.parametrize('serializer', [JSONSerializer(), ColumnarSerializer(), SQLiteSerializer()])
+def test_serializer_round_trip(tmp_path, serializer):
+    path = tmp_path / f"launches{serializer.suffix}"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+
+    assert list(serializer.load(path, Launch)) == LAUNCHES
+    assert serializer.load_records(path) == [launch.to_dict() for launch in LAUNCHES]
+
+
+@pytest.mark.parametrize('serializer', [JSONSerializer(), ColumnarSerializer(), SQLiteSerializer()])
+def test_writer_matches_dump(tmp_path, serializer):
+    dumped, written = tmp_path / f"dumped{serializer.suffix}", tmp_path / f"written{serializer.suffix}"
+    serializer.dump(dumped, [launch.to_dict() for launch in LAUNCHES])
+
+    with serializer.writer(written) as writer:
+        for launch in LAUNCHES:
+            writer.write(launch.to_dict())
+
+    assert serializer.load_records(written) == serializer.load_records(dumped)
+    if not isinstance(serializer, SQLiteSerializer):
+        assert written.read_bytes() == dumped.read_bytes()
+
+
+@pytest.mark.parametrize('serializer', [JSONSerializer(), ColumnarSerializer(), SQLiteSerializer()])
+def test_interrupted_writer_keeps_previous_file(tmp_path, serializer):
+    path = tmp_path / f"launches{serializer.suffix}"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+
+    with pytest.raises(ConnectionError):
+        with serializer.writer(path) as writer:
+            writer.write(LAUNCHES[0].to_dict())
+            raise ConnectionError('stream interrupted')
+
+    assert list(serializer.load(path, Launch)) == LAUNCHES
+    assert [child.name for child in tmp_path.iterdir()] == [path.name]
+
+
+def test_columnar_load_is_lazy(tmp_path):
+    serializer = ColumnarSerializer()
+    path = tmp_path / "launches.col"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+
+    launches = serializer.load(path, Launch)
+
+    assert isinstance(launches, LazyRecords)
+    assert len(launches) == 3
+    assert launches[-1] == LAUNCHES[-1]
+    assert apply_filters(launches, rocket_id='falcon9', success=True) == [LAUNCHES[1]]
+
+
+@pytest.mark.parametrize('serializer', [ColumnarSerializer(), SQLiteSerializer()])
+def test_lookup_by_ids(tmp_path, serializer):
+    path = tmp_path / f"launches{serializer.suffix}"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+
+    assert serializer.load(path, Launch).by_ids(['c', 'missing', 'a']) == [LAUNCHES[0], LAUNCHES[2]]
+
+
+def test_columnar_rejects_corrupt_file(tmp_path):
+    path = tmp_path / "launches.col"
+    path.write_bytes(b'{"not": "columnar"}')
+
+    assert ColumnarSerializer().load(path, Launch) is None
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'rocket_id': 'falcon9'},
+    {'success': False},
+    {'success': True, 'launchpad_id': 'ccsfs'},
+    {'upcoming': True},
+    {'start_date': date(2020, 3, 7), 'end_date': date(2024, 9, 27)},
+])
+def test_sqlite_query_matches_apply_filters(tmp_path, filters):
+    serializer = SQLiteSerializer()
+    path = tmp_path / "launches.sqlite"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+
+    launches = serializer.load(path, Launch)
+
+    assert isinstance(launches, SQLiteRecords)
+    assert apply_filters(launches, **filters) == apply_filters(LAUNCHES, **filters)
+
+
+def test_sqlite_filters_use_indexes(tmp_path):
+    serializer = SQLiteSerializer()
+    path = tmp_path / "launches.sqlite"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+
+    with sqlite3.connect(str(path)) as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT payload FROM records WHERE rocket = ?", ('falcon9',)
+        ).fetchall()
+
+    assert any('records_rocket' in row[-1] for row in plan)
+
+
+def test_sqlite_keeps_local_records_across_refresh(tmp_path):
+    serializer = SQLiteSerializer()
+    path = tmp_path / "launches.sqlite"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+    synthetic = dict(LAUNCHES[0].to_dict(), id='synthetic', flight_number=1000)
+    serializer.append(path, [synthetic])
+
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES[1:]])
+
+    assert [launch.id for launch in serializer.load(path, Launch)] == ['b', 'c', 'synthetic']
+    assert [record['id'] for record in serializer.load_records(path)] == ['b', 'c']
+
+
+@pytest.mark.parametrize('serializer', [JSONSerializer(), ColumnarSerializer(), SQLiteSerializer()])
+def test_version_changes_with_every_write(tmp_path, serializer):
+    path = tmp_path / f"launches{serializer.suffix}"
+    assert serializer.version(path) is None
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+    first = serializer.version(path)
+
+    with pytest.raises(RuntimeError):
+        with serializer.writer(path) as writer:
+            writer.write(LAUNCHES[0].to_dict())
+            raise RuntimeError("interrupted")
+    assert serializer.version(path) == first
+
+    serializer.dump(path, [launch.to_dict() for launch in reversed(LAUNCHES)])
+    assert serializer.version(path) not in (None, first)
+
+
+def test_sqlite_version_changes_on_append(tmp_path):
+    serializer = SQLiteSerializer()
+    path = tmp_path / "launches.sqlite"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+    version = serializer.version(path)
+
+    serializer.append(path, [dict(LAUNCHES[0].to_dict(), id='synthetic', flight_number=1000)])
+
+    assert serializer.version(path) != version
+
+
+@pytest.mark.parametrize('serializer', [JSONSerializer(), ColumnarSerializer(), SQLiteSerializer()])
+def test_loaded_records_keep_the_version_they_were_read_from(tmp_path, serializer):
+    path = tmp_path / f"launches{serializer.suffix}"
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES])
+    launches = serializer.load(path, Launch)
+    assert launches.version == serializer.version(path)
+
+    serializer.dump(path, [launch.to_dict() for launch in LAUNCHES[1:]])
+
+    assert launches.version != serializer.version(path)
+
+
+def test_columnar_columns_of_an_empty_file(tmp_path):
+    path = tmp_path / "launches.col"
+    ColumnarSerializer().dump(path, [])
+    launches = ColumnarSerializer().load(path, Launch)
+
+    assert launches.column('upcoming') == []
+    assert len(LaunchFrame.from_launches(launches)) == 0
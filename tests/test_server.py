@@ -0,0 +1,132 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from src.serializers import LoadedRecords
+from src.server import TrackerService, make_handler
+from tests.test_frame import LAUNCHES, LAUNCHPADS, ROCKETS
+from tests.test_statistics import SAMPLE
+
+
+@pytest.fixture
+def service():
+    datasets = iter([LAUNCHES, SAMPLE])
+    return TrackerService(lambda: (next(datasets), ROCKETS, LAUNCHPADS), refresh_interval=60)
+
+
+@pytest.fixture
+def base_url(service):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url):
+    with urlopen(url) as response:
+        return json.loads(response.read())
+
+
+def test_unavailable_before_first_load(base_url):
+    with pytest.raises(HTTPError) as exc_info:
+        _get(f"{base_url}/statistics")
+
+    assert exc_info.value.code == 503
+
+
+def test_serves_filters_and_statistics(service, base_url):
+    service.refresh()
+
+    launches = _get(f"{base_url}/launches?rocket_id=r1&success=true")
+    statistics = _get(f"{base_url}/statistics?launchpad_id=p2")
+
+    assert [launch['id'] for launch in launches] == [
+        launch.id for launch in LAUNCHES if launch.rocket == 'r1' and launch.success and not launch.upcoming
+    ]
+    assert statistics['total_launches'] == len(
+        [launch for launch in LAUNCHES if launch.launchpad == 'p2' and not launch.upcoming]
+    )
+    assert _get(f"{base_url}/health")['version'] == 1
+
+
+def test_pages_sorted_launches(service, base_url):
+    service.refresh()
+
+    page = _get(f"{base_url}/launches?success=true&sort=date&order=desc&offset=5&limit=10")
+    latest = sorted((launch for launch in LAUNCHES if launch.success and not launch.upcoming),
+                    key=lambda launch: launch.date_unix)[::-1]
+
+    assert [launch['id'] for launch in page] == [launch.id for launch in latest[5:15]]
+    with pytest.raises(HTTPError) as exc_info:
+        _get(f"{base_url}/launches?sort=name")
+    assert exc_info.value.code == 400
+
+
+def test_refresh_swaps_snapshot(service, base_url):
+    service.refresh()
+    before = service.snapshot
+
+    service.refresh()
+
+    assert service.snapshot is not before
+    assert _get(f"{base_url}/health") == {
+        'version': 2, 'loaded_at': service.snapshot.loaded_at, 'launches': len(SAMPLE)
+    }
+    assert len(before.launches) == len(LAUNCHES)
+
+
+def test_refresh_keeps_snapshot_of_unchanged_data(base_url, service):
+    datasets = iter([LoadedRecords(LAUNCHES, 'v1'), LoadedRecords(LAUNCHES, 'v1'), LoadedRecords(SAMPLE, 'v2')])
+    service.loader = lambda: (next(datasets), ROCKETS, LAUNCHPADS)
+    service.refresh()
+    before = service.snapshot
+    _get(f"{base_url}/launches")
+
+    service.refresh()
+
+    assert service.snapshot.launches is before.launches and service.snapshot.version == 1
+    assert len(service.queries._entries) == 1
+    service.refresh()
+    assert service.snapshot.version == 2 and len(service.snapshot.launches) == len(SAMPLE)
+    assert not service.queries._entries
+
+
+def test_failed_refresh_keeps_snapshot(service):
+    service.refresh()
+    snapshot = service.snapshot
+    service.loader = lambda: (_ for _ in ()).throw(ConnectionError('API down'))
+
+    assert service.refresh() is False
+    assert service.snapshot is snapshot
+
+
+def test_bad_filter_is_rejected(service, base_url):
+    service.refresh()
+
+    with pytest.raises(HTTPError) as exc_info:
+        _get(f"{base_url}/launches?start_date=yesterday&end_date=today")
+
+    assert exc_info.value.code == 400
+
+
+def test_refresh_delay_has_jitter(service):
+    delays = {service.next_delay() for _ in range(20)}
+
+    assert len(delays) > 1
+    assert all(54 <= delay <= 66 for delay in delays)
+
+
+def test_launch_listings_memoize_positions_only(service, base_url):
+    service.refresh()
+
+    first = _get(f"{base_url}/launches")
+    second = _get(f"{base_url}/launches")
+
+    assert first == second == [launch.to_dict() for launch in LAUNCHES]
+    [(key, value)] = service.queries._entries.items()
+    assert key[0] == '/launches' and list(value) == list(range(len(LAUNCHES)))
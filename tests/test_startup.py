@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Only needed once a command actually talks to the API or renders a table
+DEFERRED = ('requests', 'urllib3', 'tabulate', 'sqlite3', 'concurrent.futures')
+# Generous ceiling so slow CI machines pass while real regressions still fail
+IMPORT_BUDGET_US = 250_000
+
+
+def _import_times(cwd):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import src.main'],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        times[name.strip()] = int(cumulative)
+    return result.stdout, times
+
+
+def test_import_has_no_side_effects(tmp_path):
+    stdout, _ = _import_times(tmp_path)
+
+    assert stdout == ''
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_import_defers_heavy_dependencies(tmp_path):
+    _, times = _import_times(tmp_path)
+
+    assert 'src.main' in times
+    assert [name for name in DEFERRED if name in times] == []
+    assert times['src.main'] < IMPORT_BUDGET_US
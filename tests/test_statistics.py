@@ -0,0 +1,96 @@
+import calendar
+import json
+from datetime import datetime
+from functools import reduce
+
+from src.aggregate import LaunchAggregate, contributions
+from src.models import Launch, Rocket, Launchpad
+from src.statistics import (
+    aggregate_launches, calculate_launch_frequency, calculate_success_rate_by_rocket,
+    count_launches_by_site, get_launch_statistics
+)
+from tests.test_frame import LAUNCHES
+
+
+def _launch(id, date_utc, rocket, launchpad, success, upcoming=False):
+    date_unix = calendar.timegm(datetime.strptime(date_utc, "%Y-%m-%dT%H:%M:%S.%fZ").timetuple())
+    return Launch(id=id, flight_number=0, name=id, date_utc=date_utc, date_unix=date_unix, date_local='',
+                  date_precision='hour', rocket=rocket, launchpad=launchpad, success=success,
+                  upcoming=upcoming)
+
+
+SAMPLE = [
+    _launch('a', '2006-03-24T22:30:00.000Z', 'falcon1', 'kwajalein', False),
+    _launch('b', '2008-09-28T23:15:00.000Z', 'falcon1', 'kwajalein', True),
+    _launch('c', '2020-03-07T04:50:31.000Z', 'falcon9', 'ccsfs', True),
+    _launch('d', '2020-03-18T12:16:39.000Z', 'falcon9', 'ccsfs', None),
+    _launch('e', '2022-12-01T00:00:00.000Z', 'falcon9', 'ksc', None, upcoming=True),
+]
+FALCON1 = Rocket(id='falcon1', name='Falcon 1', type='rocket', active=False, stages=2, boosters=0,
+                 cost_per_launch=6700000, success_rate_pct=40, first_flight='2006-03-24',
+                 country='Republic of the Marshall Islands', company='SpaceX', height={},
+                 diameter={}, mass={})
+KWAJALEIN = Launchpad(id='kwajalein', name='Kwajalein Atoll', full_name='', status='retired',
+                      locality='Omelek Island', region='Marshall Islands', timezone='Pacific/Kwajalein',
+                      latitude=9.0477206, longitude=167.7431292, launch_attempts=5, launch_successes=2)
+
+
+def test_launch_statistics():
+    assert get_launch_statistics(SAMPLE) == {
+        'total_launches': 4,
+        'successful_launches': 2,
+        'failed_launches': 1,
+        'upcoming_launches': 1,
+        'success_rate': 50.0
+    }
+
+
+def test_success_rate_by_rocket():
+    assert calculate_success_rate_by_rocket(SAMPLE, [FALCON1]) == {
+        'Falcon 1': {'success_rate': 50.0, 'total_launches': 2, 'successful_launches': 1},
+        'falcon9': {'success_rate': 100.0, 'total_launches': 1, 'successful_launches': 1},
+    }
+
+
+def test_count_launches_by_site():
+    assert count_launches_by_site(SAMPLE, [KWAJALEIN]) == {'Kwajalein Atoll': 2, 'ccsfs': 2}
+
+
+def test_launch_frequency():
+    assert calculate_launch_frequency(SAMPLE) == {
+        'monthly': {'2006-03': 1, '2008-09': 1, '2020-03': 2},
+        'yearly': {2006: 1, 2008: 1, 2020: 2}
+    }
+
+
+def test_merged_chunks_match_single_pass():
+    chunks = [LAUNCHES[start:start + 37] for start in range(0, len(LAUNCHES), 37)]
+
+    merged = reduce(LaunchAggregate.merge, (aggregate_launches(chunk) for chunk in chunks))
+    whole = aggregate_launches(LAUNCHES)
+
+    assert merged == whole
+    assert list(merged.monthly) == list(whole.monthly)
+    assert list(merged.rocket_totals) == list(whole.rocket_totals)
+
+
+def test_update_applies_only_the_difference():
+    before, after = LAUNCHES[:400], LAUNCHES[100:]
+    # Some launches change between the two snapshots
+    after = [Launch(**dict(launch.to_dict(), success=not launch.success, upcoming=False))
+             if index % 50 == 0 else launch for index, launch in enumerate(after)]
+
+    aggregate = LaunchAggregate()
+    aggregate.update({}, contributions(before))
+    aggregate.update(contributions(before), contributions(after))
+
+    assert aggregate == LaunchAggregate.from_launches(after)
+
+
+def test_aggregate_round_trips_through_json():
+    aggregate = LaunchAggregate.from_launches(LAUNCHES)
+
+    restored = LaunchAggregate.from_dict(json.loads(json.dumps(aggregate.to_dict())))
+
+    assert restored == aggregate
+    assert list(restored.yearly) == list(aggregate.yearly)
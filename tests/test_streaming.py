@@ -0,0 +1,40 @@
+import json
+
+import pytest
+from src.streaming import iter_json_array
+
+ITEMS = [{'id': 'a', 'name': 'Ünïcode ✓', 'cores': [{'flight': 1}]}, 12345, -1.5e3, "str]ing", None, [], {}]
+
+
+def _chunks(data, size):
+    return (data[start:start + size] for start in range(0, len(data), size))
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 1 << 20])
+def test_items_match_json_loads(size):
+    data = json.dumps(ITEMS, indent=2, ensure_ascii=False).encode('utf-8')
+
+    assert list(iter_json_array(_chunks(data, size))) == ITEMS
+
+
+def test_number_split_across_chunks():
+    assert list(iter_json_array([b'[12', b'34, 5', b'6]'])) == [1234, 56]
+
+
+def test_items_are_yielded_before_the_array_ends():
+    items = iter_json_array(iter([b' [ {"id": 1},', b' {"id": 2}']))
+
+    assert next(items) == {'id': 1}
+    assert next(items) == {'id': 2}
+    with pytest.raises(ValueError):
+        next(items)
+
+
+@pytest.mark.parametrize('data', [b'', b'{"docs": []}', b'[1 2]', b'[1,', b'[{"id": '])
+def test_rejects_invalid_arrays(data):
+    with pytest.raises(ValueError):
+        list(iter_json_array([data]))
+
+
+def test_empty_array():
+    assert list(iter_json_array([b' [ ] '])) == []
@@ -0,0 +1,39 @@
+from tabulate import tabulate
+
+from src.table import render_table
+
+HEADERS = ["Flight #", "Name", "Status"]
+ROWS = [[1, "FalconSat", "Failure"], [12, "COTS 1", None], [105, "Starlink-4", "Success"]]
+
+
+def test_grid_and_plain_match_tabulate():
+    for table_format in ('grid', 'plain'):
+        lines = list(render_table(ROWS, HEADERS, table_format))
+        expected = tabulate(ROWS, headers=HEADERS, tablefmt=table_format).splitlines()
+
+        assert [line.rstrip() for line in lines] == [line.rstrip() for line in expected]
+
+
+def test_rows_after_the_sample_are_cut_to_its_widths():
+    rows = iter(ROWS + [[7, "A much longer mission name", "Success"]])
+
+    lines = list(render_table(rows, HEADERS, sample_size=3))
+
+    assert lines[-2] == "|          7 | A much ... | Success  |"
+    assert len({len(line) for line in lines}) == 1
+
+
+def test_rows_are_rendered_as_they_arrive():
+    def rows():
+        yield [1, "FalconSat", "Failure"]
+        raise AssertionError("read past the sample")
+
+    lines = render_table(rows(), HEADERS, sample_size=1)
+
+    assert [next(lines) for _ in range(4)][-1].startswith("|          1 | FalconSat")
+
+
+def test_tsv_keeps_values_whole():
+    lines = list(render_table([[1, "Crew\tDragon\n2", None]], HEADERS, 'tsv'))
+
+    assert lines == ["Flight #\tName\tStatus", "1\tCrew Dragon 2\t"]
@@ -0,0 +1,113 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from src.api_client import APIError, SpaceXAPIClient
+from src.transport import CircuitBreaker, Coalescer, TransportConfig, retry_after
+from tests.conftest import StubResponse, respond_in_order
+
+ROCKETS = [{'id': 'falcon9', 'name': 'Falcon 9'}]
+
+
+@pytest.fixture
+def client(stub_server):
+    client = SpaceXAPIClient(TransportConfig(max_retries=3, backoff_base=0.01, failure_threshold=2,
+                                             reset_timeout=60))
+    client.BASE_URL = stub_server.url
+    client.sleeps = []
+    client.transport.sleep = client.sleeps.append
+    return client
+
+
+def test_retries_transient_failures(stub_server, client):
+    stub_server.route('GET', '/rockets', respond_in_order(
+        StubResponse(status=503), StubResponse(status=502), StubResponse(body=ROCKETS)
+    ))
+
+    assert client._make_request('rockets') == ROCKETS
+    assert len(stub_server.requests_for('/rockets')) == 3
+    assert len(client.sleeps) == 2
+    assert all(0 <= delay <= 0.01 * 2 ** attempt for attempt, delay in enumerate(client.sleeps))
+
+
+def test_honors_retry_after(stub_server, client):
+    stub_server.route('GET', '/rockets', respond_in_order(
+        StubResponse(status=429, headers={'Retry-After': '2'}), StubResponse(body=ROCKETS)
+    ))
+
+    assert client._make_request('rockets') == ROCKETS
+    assert client.sleeps == [2.0]
+
+
+def test_does_not_retry_client_errors(stub_server, client):
+    stub_server.route('GET', '/rockets', respond_in_order(StubResponse(status=404)))
+
+    with pytest.raises(APIError):
+        client.get_all_rockets()
+    assert len(stub_server.requests_for('/rockets')) == 1
+
+
+def test_circuit_opens_after_repeated_failures(stub_server, client):
+    stub_server.route('GET', '/rockets', respond_in_order(StubResponse(status=500)))
+
+    for _ in range(3):
+        assert client._make_request('rockets') is None
+
+    # Two requests of four attempts each, then the open circuit fails fast
+    assert len(stub_server.requests_for('/rockets')) == 8
+    assert client.transport.breaker.state == CircuitBreaker.OPEN
+
+
+def test_concurrent_requests_are_coalesced(stub_server, client):
+    release = threading.Event()
+
+    def slow(request):
+        release.wait(5)
+        return StubResponse(body=ROCKETS)
+
+    stub_server.route('GET', '/rockets', slow)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client._make_request('rockets')))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while not stub_server.requests_for('/rockets'):
+        time.sleep(0.01)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [ROCKETS] * 5
+    assert len(stub_server.requests_for('/rockets')) == 1
+
+
+def test_breaker_half_opens_after_timeout():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+
+    assert not breaker.allow()
+    now[0] = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_coalescer_shares_errors():
+    coalescer = Coalescer()
+
+    with pytest.raises(ValueError):
+        coalescer.run('key', lambda: (_ for _ in ()).throw(ValueError('boom')))
+    assert coalescer.run('key', lambda: 1) == 1
+
+
+def test_retry_after_accepts_http_dates():
+    now = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    later = (now + timedelta(seconds=30)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+    assert retry_after({'Retry-After': later}, now=now) == 30
+    assert retry_after({'Retry-After': '1.5'}) == 1.5
+    assert retry_after({}) is None
@@ -0,0 +1,51 @@
+from datetime import date
+
+from src.main import filter_by_date_range
+from src.metrics import METRICS
+from src.models import Launch
+from src.util import launch_day, launch_timestamp, parse_date, unix_bounds
+
+
+def test_parse_date_formats():
+    assert parse_date('2006-03-24T22:30:00.000Z') == date(2006, 3, 24)
+    assert parse_date('2020-03-07T04:50:31Z') == date(2020, 3, 7)
+    assert parse_date('2020-03-06T23:50:31-05:00') == date(2020, 3, 6)
+
+
+def test_parse_date_invalid_falls_back():
+    assert parse_date('not a date') == date(1900, 1, 1)
+    assert parse_date(None) == date(1900, 1, 1)
+
+
+def test_every_invalid_date_is_counted():
+    METRICS.reset()
+
+    for _ in range(3):
+        parse_date('not a date')
+
+    assert METRICS.summary()["parse_failures_total"] == [{'labels': {'kind': 'date'}, 'value': 3}]
+
+
+def test_launch_day_prefers_date_unix():
+    # 2022-12-31T23:59:59Z
+    assert launch_day(1672531199, 'ignored') == (date(2022, 12, 31), '2022-12')
+    assert launch_day(None, '2023-01-01T00:00:00.000Z') == (date(2023, 1, 1), '2023-01')
+    assert launch_timestamp(None, '2023-01-01T00:00:00.000Z') == 1672531200
+
+
+def test_unix_bounds_cover_whole_days():
+    assert unix_bounds(date(2023, 1, 1), date(2023, 1, 1)) == (1672531200, 1672617600)
+
+
+def test_filter_by_date_range_is_inclusive():
+    def launch(date_unix):
+        return Launch(id=str(date_unix), flight_number=0, name='', date_utc='', date_unix=date_unix,
+                      date_local='', date_precision='hour')
+
+    launches = [launch(1672531199), launch(1672531200), launch(1672617599), launch(1672617600)]
+
+    filtered = filter_by_date_range(launches, date(2023, 1, 1), date(2023, 1, 1))
+
+    assert [l.date_unix for l in filtered] == [1672531200, 1672617599]
+    assert filtered[0].utc_date == date(2023, 1, 1)
+    assert filtered[0].month_key == '2023-01'